@@ -7,9 +7,14 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / '.env')
 
 SECRET_KEY = os.getenv('SECRET_KEY')
-DEBUG = True
+
+# ✅ Environment profile: DJANGO_ENV=production turns off DEBUG and enables the cached template loader
+DJANGO_ENV = os.getenv('DJANGO_ENV', 'development')
+IS_PRODUCTION = DJANGO_ENV == 'production'
+DEBUG = os.getenv('DEBUG', str(not IS_PRODUCTION)) == 'True'
 
 ALLOWED_HOSTS = ['*']
+SITE_DOMAIN = os.getenv('SITE_DOMAIN', '127.0.0.1:9999')  # Used for links in emails sent outside a request
 
 CSRF_TRUSTED_ORIGINS = [
     'http://127.0.0.1:9999',
@@ -30,11 +35,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'quizzes.middleware.RequestTimingMiddleware',  # first, so it times everything below it
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'quizzes.middleware.ProfilingMiddleware',  # staff-only ?_profile=1
 
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -42,22 +49,88 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'quizsite.urls'
 
+TEMPLATE_OPTIONS = {
+    'context_processors': [
+        'django.template.context_processors.debug',
+        'django.template.context_processors.request',
+        'django.contrib.auth.context_processors.auth',
+        'django.contrib.messages.context_processors.messages',
+    ],
+}
+if IS_PRODUCTION:
+    # Parse each template once per process instead of re-reading it from disk
+    TEMPLATE_OPTIONS['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Stock DjangoTemplates plus per-template render timings (see quizzes.metrics)
+        'BACKEND': 'quizzes.template_backends.InstrumentedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
+        'APP_DIRS': not IS_PRODUCTION,  # loaders are listed explicitly in production
+        'OPTIONS': TEMPLATE_OPTIONS,
     },
 ]
 
+# Compile all quizzes templates when a worker boots (wsgi.py)
+TEMPLATE_WARMUP = os.getenv('TEMPLATE_WARMUP', str(IS_PRODUCTION)) == 'True'
+
+# ✅ Request timing (quizzes.middleware.RequestTimingMiddleware)
+SERVER_TIMING_PUBLIC = os.getenv('SERVER_TIMING_PUBLIC', str(not IS_PRODUCTION)) == 'True'  # else staff only
+REQUEST_SLOW_MS = float(os.getenv('REQUEST_SLOW_MS', 500))  # Always kept in the staff ring buffer
+REQUEST_TIMING_SAMPLE_RATE = float(os.getenv('REQUEST_TIMING_SAMPLE_RATE', 0.01))  # Share of other requests kept
+REQUEST_TIMING_BUFFER_SIZE = int(os.getenv('REQUEST_TIMING_BUFFER_SIZE', 200))
+
+# ✅ Logging: JSON lines written by a background thread (quizzes.log), never blocking a request.
+# LOG_LEVELS / LOG_SAMPLE_RATES take "logger=value" pairs, e.g. "quizzes.requests=0.1,quizzes.outbox=0.05"
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+# runserver already prints each request in development, so per-request timing lines are production-only by default
+LOG_LEVELS = dict(
+    item.split('=', 1)
+    for item in os.getenv('LOG_LEVELS', 'django.db.backends=WARNING' if IS_PRODUCTION else 'django.db.backends=WARNING,quizzes.requests=WARNING').split(',') if item
+)
+LOG_SAMPLE_RATES = {
+    name: float(rate) for name, rate in (
+        item.split('=', 1)
+        for item in os.getenv('LOG_SAMPLE_RATES', 'quizzes.requests=0.1,quizzes.outbox=0.1' if IS_PRODUCTION else '').split(',') if item
+    )
+}
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))  # Records beyond this are dropped, not waited on
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'quizzes.log.JsonFormatter'},
+    },
+    'filters': {
+        'sampling': {'()': 'quizzes.log.SamplingFilter', 'rates': LOG_SAMPLE_RATES},
+    },
+    'handlers': {
+        'queue': {
+            'class': 'quizzes.log.QueueListenerHandler',
+            'maxsize': LOG_QUEUE_SIZE,
+            'formatter': 'json',
+            'filters': ['sampling'],
+        },
+    },
+    'root': {'handlers': ['queue'], 'level': 'WARNING'},
+    'loggers': {
+        'django': {'level': 'INFO'},
+        'quizzes': {'level': LOG_LEVEL},
+        **{name: {'level': level} for name, level in LOG_LEVELS.items()},
+    },
+}
+
+# ✅ On-demand profiles (quizzes.middleware.ProfilingMiddleware), browsable at /ops/profiles/
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))
+PROFILE_KEEP_PER_URL = int(os.getenv('PROFILE_KEEP_PER_URL', 10))
+
 WSGI_APPLICATION = 'quizsite.wsgi.application'
 
 # ✅ MySQL configuration
@@ -73,6 +146,35 @@ DATABASES = {
     }
 }
 
+# ✅ Cache (per-process by default; set CACHE_BACKEND/CACHE_LOCATION for Redis/Memcached in prod)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv('CACHE_LOCATION', 'recgetup-default'),
+    }
+}
+# Caches every gunicorn worker must agree on (entitlements, anonymous pages, per-user fragments) are only used
+# when the backend is shared. LocMem is per process, so it only counts in development, where runserver is one process.
+PER_PROCESS_CACHES = ('django.core.cache.backends.locmem.LocMemCache', 'django.core.cache.backends.dummy.DummyCache')
+CACHE_SHARED = os.getenv('CACHE_SHARED', str(not IS_PRODUCTION or CACHE_BACKEND not in PER_PROCESS_CACHES)) == 'True'
+
+# Seconds a user's package/class access record stays cached
+ENTITLEMENT_CACHE_TIMEOUT = int(os.getenv('ENTITLEMENT_CACHE_TIMEOUT', 300))
+
+# Full-page cache for anonymous marketing pages (home, packages, categories)
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'True') == 'True'
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', 600))
+PAGE_CACHE_MAX_AGE = int(os.getenv('PAGE_CACHE_MAX_AGE', 60))  # Browser/CDN Cache-Control max-age
+# Query params that change a cached page (part of the key); params starting with an ignored
+# prefix are dropped from the key, and any other param bypasses the page cache
+PAGE_CACHE_QUERY_PARAMS = ()
+PAGE_CACHE_IGNORED_PARAMS = ('utm_', 'gclid', 'gbraid', 'wbraid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga')
+
+# Template fragment cache ({% fragment_cache %}); set FRAGMENT_CACHE_VERSION per release, e.g. the git sha
+FRAGMENT_CACHE_VERSION = os.getenv('FRAGMENT_CACHE_VERSION', '1')
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv('FRAGMENT_CACHE_TIMEOUT', 3600))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -87,6 +189,20 @@ USE_TZ = False
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'quizzes' / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+if IS_PRODUCTION:
+    # Serves hashed, precompressed statics with far-future Cache-Control headers
+    MIDDLEWARE.insert(2, 'whitenoise.middleware.WhiteNoiseMiddleware')
+    # collectstatic writes content-hashed names plus .gz/.br siblings; WhiteNoise serves them as immutable
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+    }
+
+# ✅ CSS build (manage.py build_css). Pages fall back to the Tailwind CDN until the bundle exists.
+TAILWIND_CLI = os.getenv('TAILWIND_CLI', 'npx --yes tailwindcss@3')
+TAILWIND_CSS = 'quizzes/css/app.css'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -106,6 +222,32 @@ EMAIL_USE_TLS = True
 EMAIL_USE_SSL = False
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', 20))
+MAIL_RATE_LIMIT = float(os.getenv('MAIL_RATE_LIMIT', 10))  # Messages per second per process (0 = unlimited)
+MAIL_MESSAGES_PER_CONNECTION = int(os.getenv('MAIL_MESSAGES_PER_CONNECTION', 100))  # Recycle the SMTP session after this many
+
+# ✅ Notification Outbox (drained by `manage.py run_outbox_worker`)
+OUTBOX_WORKER_THREADS = int(os.getenv('OUTBOX_WORKER_THREADS', 4))
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 100))  # Messages claimed per round
+OUTBOX_CHANNEL_BATCH = int(os.getenv('OUTBOX_CHANNEL_BATCH', 20))  # Messages per SMTP session / sender call
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 6))  # Then the message is dead-lettered
+OUTBOX_RETRY_BASE_SECONDS = int(os.getenv('OUTBOX_RETRY_BASE_SECONDS', 30))
+OUTBOX_RETRY_MAX_SECONDS = int(os.getenv('OUTBOX_RETRY_MAX_SECONDS', 3600))
+OUTBOX_LEASE_SECONDS = int(os.getenv('OUTBOX_LEASE_SECONDS', 300))  # Claimed rows return after this if a worker dies
+OUTBOX_POLL_INTERVAL = float(os.getenv('OUTBOX_POLL_INTERVAL', 2))
+CLASS_REMINDER_WINDOW = int(os.getenv('CLASS_REMINDER_WINDOW', 60))  # Minutes ahead `send_class_reminders` looks
+CLASS_CHANGE_COALESCE_SECONDS = int(os.getenv('CLASS_CHANGE_COALESCE_SECONDS', 120))  # Quiet period before a class change is announced
+
+# ✅ WhatsApp Delivery (console | file | locmem | http backends in quizzes/whatsapp.py)
+WHATSAPP_BACKEND = os.getenv('WHATSAPP_BACKEND', 'quizzes.whatsapp.ConsoleBackend')
+WHATSAPP_FILE_PATH = os.getenv('WHATSAPP_FILE_PATH', os.path.join(BASE_DIR, 'whatsapp-messages.log'))
+WHATSAPP_API_URL = os.getenv('WHATSAPP_API_URL')  # e.g. https://graph.facebook.com/v19.0/<phone-number-id>/messages
+WHATSAPP_API_TOKEN = os.getenv('WHATSAPP_API_TOKEN')
+WHATSAPP_CONCURRENCY = int(os.getenv('WHATSAPP_CONCURRENCY', 10))  # Requests in flight (and pooled connections)
+WHATSAPP_TIMEOUT = float(os.getenv('WHATSAPP_TIMEOUT', 10))
+WHATSAPP_MAX_RETRIES = int(os.getenv('WHATSAPP_MAX_RETRIES', 3))  # On 429 / 5xx / connection errors
+WHATSAPP_RETRY_BASE_DELAY = float(os.getenv('WHATSAPP_RETRY_BASE_DELAY', 0.5))
+WHATSAPP_MAX_RETRY_WAIT = int(os.getenv('WHATSAPP_MAX_RETRY_WAIT', 60))  # Longest Retry-After we sleep through
 
 # ✅ OpenAI Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -113,5 +255,25 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 # Razorpay Settings
 RAZORPAY_KEY_ID = os.getenv('RAZORPAY_KEY_ID')
 RAZORPAY_KEY_SECRET = os.getenv('RAZORPAY_KEY_SECRET')
+RAZORPAY_WEBHOOK_SECRET = os.getenv('RAZORPAY_WEBHOOK_SECRET')  # Dashboard > Webhooks; endpoint is /webhooks/razorpay/
+RAZORPAY_BASE_URL = os.getenv('RAZORPAY_BASE_URL')  # Override to point at a local fake gateway
+RAZORPAY_CONNECT_TIMEOUT = float(os.getenv('RAZORPAY_CONNECT_TIMEOUT', 3.05))
+RAZORPAY_READ_TIMEOUT = float(os.getenv('RAZORPAY_READ_TIMEOUT', 10))
+RAZORPAY_POOL_SIZE = int(os.getenv('RAZORPAY_POOL_SIZE', 10))
+RAZORPAY_MAX_RETRIES = int(os.getenv('RAZORPAY_MAX_RETRIES', 2))  # Idempotent calls only
+RAZORPAY_RETRY_BASE_DELAY = float(os.getenv('RAZORPAY_RETRY_BASE_DELAY', 0.2))
+RAZORPAY_BREAKER_THRESHOLD = float(os.getenv('RAZORPAY_BREAKER_THRESHOLD', 0.5))  # Failure ratio that opens the circuit
+RAZORPAY_BREAKER_WINDOW = int(os.getenv('RAZORPAY_BREAKER_WINDOW', 20))
+RAZORPAY_BREAKER_MIN_CALLS = int(os.getenv('RAZORPAY_BREAKER_MIN_CALLS', 5))
+RAZORPAY_BREAKER_RESET_SECONDS = float(os.getenv('RAZORPAY_BREAKER_RESET_SECONDS', 30))
+
+# Checkout: reuse pending orders and cap how often new ones are created
+PAYMENT_ORDER_REUSE_SECONDS = int(os.getenv('PAYMENT_ORDER_REUSE_SECONDS', 30 * 60))
+PAYMENT_ORDER_RATE_LIMIT = int(os.getenv('PAYMENT_ORDER_RATE_LIMIT', 5))  # New orders per user per window
+PAYMENT_ORDER_RATE_WINDOW = int(os.getenv('PAYMENT_ORDER_RATE_WINDOW', 10 * 60))
+PAYMENT_ORDER_LOCK_WAIT = 3  # Seconds a second checkout waits for the first one's order
+# Checkout lease; outlasts one create_order call (connect + read timeout) so a crashed worker frees it
+PAYMENT_ORDER_LOCK_LEASE = int(os.getenv('PAYMENT_ORDER_LOCK_LEASE', 30))
+WEBHOOK_BATCH_SIZE = int(os.getenv('WEBHOOK_BATCH_SIZE', 500))  # Events applied per `process_webhooks` round
 
 # Server forced reload for OpenAI restoration
\ No newline at end of file
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Profile, ClassPackage, ScheduledClass, UserSubscription, PaymentHistory
+from django.utils import timezone
+from .models import Profile, ClassPackage, ScheduledClass, UserSubscription, PaymentHistory, CourseCategory, CurriculumItem, OutboxMessage, WebhookEvent, ClassChangeEvent
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
@@ -21,6 +22,18 @@ class ScheduledClassAdmin(admin.ModelAdmin):
         return ", ".join([p.name for p in obj.packages.all()])
     get_packages.short_description = 'Packages'
 
+class CurriculumItemInline(admin.TabularInline):
+    model = CurriculumItem
+    extra = 1
+    fields = ('order', 'title', 'description')
+
+@admin.register(CourseCategory)
+class CourseCategoryAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug', 'color', 'mentor', 'is_active')
+    list_filter = ('is_active', 'color')
+    prepopulated_fields = {'slug': ('title',)}
+    inlines = (CurriculumItemInline,)
+
 @admin.register(UserSubscription)
 class UserSubscriptionAdmin(admin.ModelAdmin):
     list_display = ('user', 'package', 'end_date', 'is_active')
@@ -32,6 +45,31 @@ class PaymentHistoryAdmin(admin.ModelAdmin):
     list_filter = ('status', 'payment_date')
     readonly_fields = ('payment_date',)
 
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('id', 'channel', 'status', 'attempts', 'available_at', 'created_at', 'sent_at')
+    list_filter = ('status', 'channel')
+    readonly_fields = ('channel', 'payload', 'attempts', 'last_error', 'created_at', 'sent_at')
+    actions = ('requeue',)
+
+    @admin.action(description="Requeue selected messages")
+    def requeue(self, request, queryset):
+        count = queryset.exclude(status='SENT').update(status='PENDING', attempts=0, available_at=timezone.now())
+        self.message_user(request, f"{count} message(s) requeued.")
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ('event_id', 'event', 'status', 'received_at', 'processed_at')
+    list_filter = ('status', 'event')
+    search_fields = ('event_id',)
+    readonly_fields = ('event_id', 'event', 'payload', 'received_at', 'processed_at')
+
+@admin.register(ClassChangeEvent)
+class ClassChangeEventAdmin(admin.ModelAdmin):
+    list_display = ('scheduled_class', 'created_at', 'dispatch_after', 'dispatched_at')
+    list_filter = ('dispatched_at',)
+    readonly_fields = ('scheduled_class', 'changes', 'created_at', 'dispatch_after', 'dispatched_at')
+
 # -------------------------------------------------------------------
 #  👤 User Admin Extension (To show Phone Number)
 # -------------------------------------------------------------------
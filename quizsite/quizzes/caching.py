@@ -0,0 +1,139 @@
+import functools
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+# Bumped by signals whenever content shown on cached pages changes
+PAGE_VERSION_KEY = 'pagecache:version'
+# Bumped on deploy (`manage.py bump_fragment_version`) to drop every template fragment
+FRAGMENT_VERSION_KEY = 'fragment:version'
+
+
+# -------------------------------------------------------------------
+#  🔑 Version Stamp
+# -------------------------------------------------------------------
+# Random tokens rather than counters: if a key is culled or the cache
+# restarts, a counter would start again at 1 and revive old entries.
+def _get_stamp(key):
+    version = cache.get(key)
+    if version is None:
+        fresh = uuid.uuid4().hex
+        cache.add(key, fresh, None)
+        version = cache.get(key, fresh)
+    return version
+
+
+def _bump_stamp(key):
+    cache.set(key, uuid.uuid4().hex, None)
+
+
+def get_page_version():
+    return _get_stamp(PAGE_VERSION_KEY)
+
+
+def purge_page_cache():
+    _bump_stamp(PAGE_VERSION_KEY)
+
+
+def bump_fragment_version():
+    _bump_stamp(FRAGMENT_VERSION_KEY)
+
+
+def bump_user_fragments(user_id):
+    _bump_stamp(f'fragment:user:{user_id}')
+
+
+def _page_params(request):
+    """
+    Query params that change the page, sorted; None if there is one we do not
+    know (the page is then not cached). Ad click ids and utm_* are dropped, or
+    every ad click would be a miss and a new entry.
+    """
+    params = []
+    for name in sorted(request.GET):
+        if name.startswith(settings.PAGE_CACHE_IGNORED_PARAMS):
+            continue
+        if name not in settings.PAGE_CACHE_QUERY_PARAMS:
+            return None
+        params.extend((name, value) for value in request.GET.getlist(name))
+    return params
+
+
+def _page_key(request, params):
+    url = hashlib.md5(f'{request.path}?{params}'.encode()).hexdigest()
+    return f'pagecache:{get_page_version()}:{translation.get_language()}:{url}'
+
+
+# -------------------------------------------------------------------
+#  📄 Anonymous Full-Page Cache
+# -------------------------------------------------------------------
+def _is_cacheable_request(request):
+    return (
+        settings.PAGE_CACHE_ENABLED
+        # Purges only reach the worker that made them unless the cache is shared
+        and settings.CACHE_SHARED
+        and request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+        # Flash messages are one-off and must not be frozen into the page
+        and not len(messages.get_messages(request))
+    )
+
+
+def anonymous_page_cache(view_func):
+    """
+    Caches the full response of a view for anonymous visitors, keyed by path,
+    PAGE_CACHE_QUERY_PARAMS and language. Signed-in users always get a fresh,
+    private response.
+    """
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        params = _page_params(request)
+        cacheable = params is not None and _is_cacheable_request(request)
+        key = _page_key(request, params) if cacheable else None
+
+        cached = cache.get(key) if cacheable else None
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        else:
+            response = view_func(request, *args, **kwargs)
+            # Redirects, errors and anything setting cookies stay uncached
+            if cacheable and response.status_code == 200 and not response.streaming and not response.cookies:
+                cache.set(key, (response.content, response['Content-Type']), settings.PAGE_CACHE_TIMEOUT)
+
+        patch_vary_headers(response, ('Cookie', 'Accept-Language'))
+        if cacheable and response.status_code == 200:
+            patch_cache_control(response, public=True, max_age=settings.PAGE_CACHE_MAX_AGE)
+        else:
+            patch_cache_control(response, private=True)
+        return response
+    return wrapper
+
+
+# -------------------------------------------------------------------
+#  🧩 Template Fragment Keys
+# -------------------------------------------------------------------
+def user_state(user):
+    if user is None or not user.is_authenticated:
+        return 'anon'
+    return 'staff' if user.is_staff else 'auth'
+
+
+def fragment_cache_key(name, user, per_user=False):
+    """
+    Cache key for a template fragment. Every key carries the deploy version
+    (settings + runtime bump), language and user state; `per_user` fragments
+    also carry the user's id and personal stamp, bumped when their User or
+    Profile is saved.
+    """
+    state = user_state(user)
+    if per_user and state != 'anon':
+        state += f':{user.pk}:{_get_stamp(f"fragment:user:{user.pk}")}'
+    version = f'{settings.FRAGMENT_CACHE_VERSION}.{_get_stamp(FRAGMENT_VERSION_KEY)}'
+    return f'fragment:{version}:{name}:{translation.get_language()}:{state}'
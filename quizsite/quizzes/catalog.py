@@ -0,0 +1,93 @@
+import functools
+import logging
+import uuid
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.templatetags.static import static
+
+from .models import CourseCategory
+
+logger = logging.getLogger(__name__)
+
+# Shared across processes; each process keeps its own LRU keyed by this stamp
+CATALOG_VERSION_KEY = 'catalog:version'
+# Hero image for categories whose own image is missing from the static manifest
+FALLBACK_IMAGE = 'quizzes/images/indian_classical_banner.png'
+
+
+# -------------------------------------------------------------------
+#  🔑 Version Stamp
+# -------------------------------------------------------------------
+# A random token rather than a counter: if the key is culled or the cache
+# restarts, a counter would start again at 1 and revive old LRU entries.
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        fresh = uuid.uuid4().hex
+        cache.add(CATALOG_VERSION_KEY, fresh, None)
+        version = cache.get(CATALOG_VERSION_KEY, fresh)
+    return version
+
+
+def bump_catalog_version():
+    cache.set(CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+# -------------------------------------------------------------------
+#  🧩 Prerendered Curriculum Fragment
+# -------------------------------------------------------------------
+def render_curriculum_html(category):
+    return render_to_string('quizzes/partials/curriculum.html', {
+        'items': category.curriculum_items.all(),
+        'color': category.color,
+    }).strip()
+
+
+def refresh_curriculum_html(category_id):
+    category = CourseCategory.objects.filter(pk=category_id).first()
+    if category:
+        # update() rather than save() so the post_save signal does not loop
+        CourseCategory.objects.filter(pk=category_id).update(curriculum_html=render_curriculum_html(category))
+
+
+def image_url(path):
+    """
+    URL of a category image. The path is free text edited in the admin, and
+    the manifest storage raises for files it does not know.
+    """
+    try:
+        return static(path)
+    except ValueError:
+        logger.warning("Category image %r is not in the static manifest; using the fallback", path)
+        return static(FALLBACK_IMAGE)
+
+
+# -------------------------------------------------------------------
+#  📚 Lookups (in-process LRU)
+# -------------------------------------------------------------------
+@functools.lru_cache(maxsize=128)
+def _load_category(slug, version):
+    # `version` is part of the LRU key only: a bump makes every old entry unreachable
+    category = CourseCategory.objects.filter(slug=slug, is_active=True).first()
+    if category is None:
+        return None
+    return {
+        'title': category.title,
+        'subtitle': category.subtitle,
+        'description': category.description,
+        'image_url': image_url(category.image),
+        'color': category.color,
+        'icon': category.icon,
+        'mentor': category.mentor,
+        'quote': category.quote,
+        'curriculum_html': category.curriculum_html or render_curriculum_html(category),
+    }
+
+
+def get_category(slug):
+    """
+    Returns the template context for a category page, or None if there is no such active category.
+    """
+    context = _load_category(slug, get_catalog_version())
+    return dict(context) if context else None
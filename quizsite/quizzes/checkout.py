@@ -0,0 +1,156 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import gateway, locks
+from .entitlements import invalidate_users
+from .models import PaymentHistory, UserSubscription
+from .notifications import send_payment_success_notification
+
+CURRENCY = 'INR'
+
+
+class OrderRateLimited(Exception):
+    """
+    Raised when a user has created too many new orders in the rate window.
+    """
+
+
+def _order_payload(payment):
+    # The shape payment_confirm.html reads from a Razorpay order
+    return {'id': payment.transaction_id, 'amount': int(payment.amount * 100), 'currency': CURRENCY}
+
+
+def find_reusable_order(user, package):
+    """
+    Latest PENDING order for the same (user, package, amount) that is still
+    young enough to be paid.
+    """
+    cutoff = timezone.now() - timezone.timedelta(seconds=settings.PAYMENT_ORDER_REUSE_SECONDS)
+    return (
+        PaymentHistory.objects
+        .filter(user=user, package=package, amount=package.price, status='PENDING', payment_date__gte=cutoff)
+        .order_by('-payment_date')
+        .first()
+    )
+
+
+def _check_rate(user):
+    window_start = timezone.now() - timezone.timedelta(seconds=settings.PAYMENT_ORDER_RATE_WINDOW)
+    recent = PaymentHistory.objects.filter(user=user, payment_date__gte=window_start).count()
+    if recent >= settings.PAYMENT_ORDER_RATE_LIMIT:
+        raise OrderRateLimited("Too many checkout attempts. Please wait a few minutes and try again.")
+
+
+def _checkout_lock_name(user):
+    return f'checkout:{user.pk}'
+
+
+def _lock_checkout(user):
+    """
+    Takes the user's checkout lease (a JobLock row, committed at once, so no
+    transaction stays open while the gateway is called). Waits up to
+    PAYMENT_ORDER_LOCK_WAIT seconds for another checkout to finish and returns
+    the token to release.
+    """
+    deadline = time.monotonic() + settings.PAYMENT_ORDER_LOCK_WAIT
+    while True:
+        token = locks.acquire(_checkout_lock_name(user), settings.PAYMENT_ORDER_LOCK_LEASE)
+        if token:
+            return token
+        if time.monotonic() >= deadline:
+            raise OrderRateLimited("Your checkout is already being prepared. Please refresh in a moment.")
+        time.sleep(0.1)
+
+
+def get_or_create_order(user, package):
+    """
+    Returns the order dict to hand to Razorpay Checkout.
+
+    Refreshes and double-clicks reuse the pending order instead of creating a
+    new one. Creation holds the user's checkout lease, so two requests on
+    different workers cannot both miss it and call the gateway twice.
+    """
+    payment = find_reusable_order(user, package)
+    if payment:
+        return _order_payload(payment)
+
+    token = _lock_checkout(user)
+    try:
+        # The request we waited for has saved its order by now
+        payment = find_reusable_order(user, package)
+        if payment:
+            return _order_payload(payment)
+
+        _check_rate(user)
+        order = gateway.create_order({
+            'amount': int(package.price * 100),  # Amount in paise
+            'currency': CURRENCY,
+            'payment_capture': '1',  # Auto capture
+            'notes': {
+                'package_id': package.id,
+                'user_id': user.id
+            }
+        })
+        PaymentHistory.objects.create(
+            user=user,
+            package=package,
+            amount=package.price,
+            transaction_id=order['id'],  # Save Order ID here
+            status='PENDING'
+        )
+        return order
+    finally:
+        locks.release(_checkout_lock_name(user), token)
+
+
+# -------------------------------------------------------------------
+#  ✅ Activation (shared by payment_verify and the webhook processor)
+# -------------------------------------------------------------------
+def activate_payments(payments):
+    """
+    Marks payments SUCCESS and grants their packages with set-based writes.
+
+    Call inside transaction.atomic() with the rows locked (select_for_update)
+    and already filtered to those not yet SUCCESS, so the browser callback and
+    the webhook never both activate the same payment.
+    """
+    payments = [payment for payment in payments if payment.package_id]
+    if not payments:
+        return []
+
+    now = timezone.now()
+    PaymentHistory.objects.filter(id__in=[payment.id for payment in payments]).update(status='SUCCESS')
+
+    # One grant per user; the latest payment wins, as with sequential callbacks
+    grants = {}
+    for payment in sorted(payments, key=lambda payment: payment.payment_date):
+        grants[payment.user_id] = (payment.package, now + timezone.timedelta(days=payment.package.duration_months * 30))
+
+    existing = {sub.user_id: sub for sub in UserSubscription.objects.filter(user_id__in=grants)}
+    to_update, to_create = [], []
+    for user_id, (package, end_date) in grants.items():
+        sub = existing.get(user_id)
+        if sub:
+            sub.package, sub.end_date, sub.is_active = package, end_date, True
+            to_update.append(sub)
+        else:
+            to_create.append(UserSubscription(user_id=user_id, package=package, end_date=end_date, is_active=True))
+    UserSubscription.objects.bulk_update(to_update, ['package', 'end_date', 'is_active'])
+    UserSubscription.objects.bulk_create(to_create)
+
+    # Bulk writes skip the post_save signals, so drop cached entitlements here
+    user_ids = list(grants)
+    transaction.on_commit(lambda: invalidate_users(user_ids))
+
+    for payment in payments:
+        payment.status = 'SUCCESS'
+        send_payment_success_notification(
+            user=payment.user,
+            package_name=payment.package.name,
+            amount=payment.amount,
+            transaction_id=payment.transaction_id
+        )
+    return payments
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Warns when production runs on a per-process cache: the caches that must
+    agree across workers are then switched off and every request pays for them.
+    """
+    if settings.CACHE_SHARED:
+        return []
+    return [Warning(
+        f"CACHE_BACKEND {settings.CACHE_BACKEND} is per process, so shared caches are disabled.",
+        hint="Point CACHE_BACKEND/CACHE_LOCATION at Redis or Memcached (or set CACHE_SHARED=True if it already is).",
+        id='quizzes.W001',
+    )]
@@ -0,0 +1,161 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils import dateformat, timezone
+from django.utils.dateparse import parse_datetime
+
+from .email_render import get_skeleton
+from .models import ClassChangeEvent, OutboxMessage, ScheduledClass, UserSubscription
+from .outbox import build_email, build_whatsapp
+
+TEMPLATE = 'quizzes/emails/class_changes'
+
+
+# -------------------------------------------------------------------
+#  📝 Capture
+# -------------------------------------------------------------------
+def _json_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def diff_tracked_fields(instance):
+    """
+    {field: [old, new]} for ScheduledClass.TRACKED_FIELDS changed since load.
+    """
+    loaded = getattr(instance, '_loaded_values', {})
+    changes = {}
+    for name, old in loaded.items():
+        new = getattr(instance, name)
+        if old != new:
+            changes[name] = [_json_value(old), _json_value(new)]
+    return changes
+
+
+def record_change(class_id, changes):
+    """
+    Folds `changes` into the class's undispatched event (keeping the oldest
+    "old" value) and pushes its dispatch time back, so a burst of edits
+    becomes one notification. Edits that end up reverted cancel out.
+    """
+    if not changes:
+        return
+    dispatch_after = timezone.now() + timezone.timedelta(seconds=settings.CLASS_CHANGE_COALESCE_SECONDS)
+    with transaction.atomic():
+        event = (
+            ClassChangeEvent.objects
+            .select_for_update()
+            .filter(scheduled_class_id=class_id, dispatched_at__isnull=True)
+            .first()
+        )
+        if event is None:
+            event = ClassChangeEvent(scheduled_class_id=class_id)
+        for field, (old, new) in changes.items():
+            old = event.changes.get(field, [old])[0]
+            event.changes[field] = [old, new]
+            if old == new:
+                del event.changes[field]
+
+        if not event.changes:
+            if event.pk:
+                event.delete()
+            return
+        event.dispatch_after = dispatch_after
+        event.save()
+
+
+def class_package_ids(class_ids):
+    """
+    {class_id: sorted package ids} in one query.
+    """
+    links = defaultdict(list)
+    rows = ScheduledClass.packages.through.objects.filter(scheduledclass_id__in=class_ids).order_by('classpackage_id')
+    for class_id, package_id in rows.values_list('scheduledclass_id', 'classpackage_id'):
+        links[class_id].append(package_id)
+    return {class_id: links.get(class_id, []) for class_id in class_ids}
+
+
+# -------------------------------------------------------------------
+#  📤 Dispatch
+# -------------------------------------------------------------------
+def _affected_packages(event, class_packages):
+    """
+    Package ids whose subscribers care about this event, or None when every
+    active subscriber does (the class is, or was, open to all).
+    """
+    before, after = event.changes.get('packages', [None, None])
+    current = class_packages.get(event.scheduled_class_id, [])
+    sets = [current] + [ids for ids in (before, after) if ids is not None]
+    if any(not ids for ids in sets):
+        return None
+    return set().union(*sets)
+
+
+def _describe(event, cls):
+    lines = []
+    for field, (old, new) in event.changes.items():
+        if field == 'start_time':
+            old_dt, new_dt = parse_datetime(old), parse_datetime(new)
+            lines.append(f"New time: {dateformat.format(new_dt, 'D, jS M, P')} (was {dateformat.format(old_dt, 'D, jS M, P')})")
+        elif field == 'meeting_link':
+            lines.append("The meeting link was updated" if new else "The meeting link was removed")
+        elif field == 'packages':
+            lines.append("Package access for this class changed")
+    return {'title': cls.title, 'lines': lines, 'join_path': reverse('join_class', args=[cls.id])}
+
+
+def dispatch_due(now=None):
+    """
+    Sends every event whose coalescing window has passed. Subscribers of all
+    due events are resolved in one query and each user gets a single message
+    covering every changed class they can see, however many were edited.
+    Returns (events, messages).
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        events = list(
+            ClassChangeEvent.objects
+            .select_for_update(skip_locked=True)
+            .filter(dispatched_at__isnull=True, dispatch_after__lte=now)
+            .select_related('scheduled_class')
+        )
+        if not events:
+            return 0, 0
+
+        class_packages = class_package_ids([event.scheduled_class_id for event in events])
+        affected = {event.id: _affected_packages(event, class_packages) for event in events}
+
+        subscriptions = UserSubscription.objects.filter(is_active=True, end_date__gt=now).select_related('user__profile')
+        if all(packages is not None for packages in affected.values()):
+            subscriptions = subscriptions.filter(package_id__in=set().union(*affected.values()))
+
+        # Group users by the exact set of events they should hear about
+        groups = defaultdict(list)
+        for sub in subscriptions.only('package_id', 'user__first_name', 'user__email', 'user__profile__phone_number'):
+            event_ids = tuple(
+                event.id for event in events
+                if affected[event.id] is None or sub.package_id in affected[event.id]
+            )
+            if event_ids:
+                groups[event_ids].append(sub.user)
+
+        by_id = {event.id: event for event in events}
+        messages = []
+        for event_ids, users in groups.items():
+            classes = [_describe(by_id[event_id], by_id[event_id].scheduled_class) for event_id in event_ids]
+            # Rendered once per group; only the first name differs between its users
+            skeleton = get_skeleton(TEMPLATE, {'domain': settings.SITE_DOMAIN, 'classes': classes}, ('user.first_name',), cache=False)
+            subject = f"📅 Class update: {classes[0]['title']}" if len(classes) == 1 else f"📅 {len(classes)} of your classes changed"
+            whatsapp_text = subject + "\n" + "\n".join(f"• {c['title']}: {'; '.join(c['lines'])}" for c in classes)
+            for user in users:
+                if user.email:
+                    text, html = skeleton.render([user.first_name])
+                    messages.append(build_email(subject, text, [user.email], html=html))
+                phone = getattr(getattr(user, 'profile', None), 'phone_number', None)
+                if phone:
+                    messages.append(build_whatsapp(phone, whatsapp_text))
+
+        OutboxMessage.objects.bulk_create(messages)
+        ClassChangeEvent.objects.filter(id__in=by_id).update(dispatched_at=now)
+    return len(events), len(messages)
@@ -0,0 +1,94 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils.html import escape, strip_tags
+
+FIELD_MARKER = '__EMAILFIELD{}__'  # Survives autoescaping and URL reversing untouched
+_MARKER_RE = re.compile(r'__EMAILFIELD(\d+)__')
+
+
+# -------------------------------------------------------------------
+#  🦴 Email Skeletons
+# -------------------------------------------------------------------
+class EmailSkeleton:
+    """
+    An email rendered once with marker strings in place of per-recipient
+    fields, split into literal chunks. Rendering for a recipient is a join.
+    """
+    def __init__(self, html, text):
+        self.html_parts = self._split(html)
+        self.text_parts = self._split(text)
+
+    @staticmethod
+    def _split(output):
+        # re.split with a group yields [literal, index, literal, index, ...]
+        parts = _MARKER_RE.split(output)
+        return [int(part) if i % 2 else part for i, part in enumerate(parts)]
+
+    @staticmethod
+    def _join(parts, values):
+        return ''.join(values[part] if i % 2 else part for i, part in enumerate(parts))
+
+    def render(self, values):
+        """
+        `values` is a list in field order. Returns (text, html).
+        """
+        values = ['' if value is None else str(value) for value in values]
+        return self._join(self.text_parts, values), self._join(self.html_parts, [escape(value) for value in values])
+
+
+def _nest(markers):
+    # {'user.first_name': m} -> {'user': {'first_name': m}} so templates keep using dotted lookups
+    context = {}
+    for path, marker in markers.items():
+        node = context
+        *parents, leaf = path.split('.')
+        for name in parents:
+            node = node.setdefault(name, {})
+        node[leaf] = marker
+    return context
+
+
+def _build_skeleton(template_base, shared_items, fields):
+    markers = {field: FIELD_MARKER.format(i) for i, field in enumerate(fields)}
+    context = {**dict(shared_items), **_nest(markers)}
+    html = get_template(f'{template_base}.html').render(context)
+    try:
+        text = get_template(f'{template_base}.txt').render(context)
+    except TemplateDoesNotExist:
+        # Fallback for layouts without a text twin; paid once per skeleton, not per recipient
+        text = strip_tags(html)
+    return EmailSkeleton(html, text)
+
+
+_cached_skeleton = lru_cache(maxsize=128)(_build_skeleton)
+
+
+def get_skeleton(template_base, shared=None, fields=(), cache=True):
+    """
+    Compiled skeleton for `<template_base>.html` / `.txt`. `shared` values
+    are baked in; `fields` (dotted names) are filled per recipient and may
+    only be printed with plain {{ field }} tags (no filters or {% if %}).
+    Cached per process, except under DEBUG so template edits show up; pass
+    cache=False for one-off layouts or unhashable shared values.
+    """
+    shared_items = tuple(sorted((shared or {}).items()))
+    if settings.DEBUG or not cache:
+        return _build_skeleton(template_base, shared_items, tuple(fields))
+    return _cached_skeleton(template_base, shared_items, tuple(fields))
+
+
+def clear_cache():
+    _cached_skeleton.cache_clear()
+
+
+def render_email(template_base, shared=None, values=None):
+    """
+    Renders one email. Returns (text, html).
+    """
+    values = values or {}
+    fields = tuple(sorted(values))
+    return get_skeleton(template_base, shared, fields).render([values[field] for field in fields])
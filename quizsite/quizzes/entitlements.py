@@ -0,0 +1,131 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ScheduledClass, UserSubscription
+
+# Global stamp baked into every per-user key. Bumping it (class or package
+# links changed) orphans all cached records at once; the old keys just expire.
+# A random token rather than a counter, so a lost key never revives old records.
+VERSION_KEY = 'entitlements:version'
+
+
+# -------------------------------------------------------------------
+#  🎟️ Entitlement Record
+# -------------------------------------------------------------------
+class Entitlement:
+    """
+    Compact, cache-friendly view of what a user is allowed to attend.
+    """
+    def __init__(self, package_id=None, package_name='', end_date=None, class_ids=()):
+        self.package_id = package_id
+        self.package_name = package_name
+        self.end_date = end_date
+        self.class_ids = frozenset(class_ids)
+
+    @property
+    def is_active(self):
+        return self.package_id is not None and self.end_date is not None and self.end_date > timezone.now()
+
+    def access_filter(self):
+        """
+        Q object for ScheduledClass rows visible to this user.
+        """
+        access_filter = Q(is_universal=True)
+        if self.is_active:
+            # Semi-join on the link table: no row fan-out, so no DISTINCT needed
+            package_links = ScheduledClass.packages.through.objects.filter(classpackage_id=self.package_id)
+            access_filter |= Q(id__in=package_links.values('scheduledclass_id'))
+        return access_filter
+
+    def can_join(self, scheduled_class):
+        return scheduled_class.id in self.class_ids
+
+    def to_dict(self):
+        return {
+            'package_id': self.package_id,
+            'package_name': self.package_name,
+            'end_date': self.end_date,
+            'class_ids': self.class_ids,
+        }
+
+
+# -------------------------------------------------------------------
+#  🔑 Cache Keys & Invalidation
+# -------------------------------------------------------------------
+def get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        fresh = uuid.uuid4().hex
+        cache.add(VERSION_KEY, fresh, None)
+        version = cache.get(VERSION_KEY, fresh)
+    return version
+
+
+def _user_key(user_id, version):
+    return f'entitlements:{version}:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    cache.delete(_user_key(user_id, get_version()))
+
+
+def invalidate_users(user_ids):
+    version = get_version()
+    cache.delete_many([_user_key(user_id, version) for user_id in user_ids])
+
+
+def invalidate_all():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+# -------------------------------------------------------------------
+#  📥 Loading
+# -------------------------------------------------------------------
+def _load(user):
+    sub = (
+        UserSubscription.objects
+        .filter(user=user, is_active=True)
+        .select_related('package')
+        .first()
+    )
+    entitlement = Entitlement()
+    if sub and sub.package:
+        entitlement = Entitlement(package_id=sub.package_id, package_name=sub.package.name, end_date=sub.end_date)
+
+    # Only classes that can still be joined are worth remembering
+    class_ids = (
+        ScheduledClass.objects
+        .filter(entitlement.access_filter(), end_time__gte=timezone.now())
+        .values_list('id', flat=True)
+    )
+    entitlement.class_ids = frozenset(class_ids)
+    return entitlement
+
+
+def get_entitlement(user):
+    """
+    Returns the user's Entitlement, served from the cache when possible.
+    """
+    if not user.is_authenticated:
+        return Entitlement()
+    if not settings.CACHE_SHARED:
+        # A per-worker cache would keep a paying student locked out on every worker but one
+        return _load(user)
+
+    key = _user_key(user.pk, get_version())
+    data = cache.get(key)
+    if data is not None:
+        return Entitlement(**data)
+
+    entitlement = _load(user)
+    timeout = settings.ENTITLEMENT_CACHE_TIMEOUT
+    if entitlement.is_active:
+        # Never outlive the subscription, or expired users keep package classes
+        remaining = (entitlement.end_date - timezone.now()).total_seconds()
+        timeout = max(1, min(timeout, int(remaining)))
+    cache.set(key, entitlement.to_dict(), timeout)
+    return entitlement
@@ -0,0 +1,203 @@
+import random
+import threading
+import time
+from collections import deque
+
+import razorpay
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+from .metrics import timed
+
+
+class GatewayUnavailable(Exception):
+    """
+    Raised without calling Razorpay while the circuit breaker is open.
+    """
+
+
+# Errors worth retrying (idempotent calls only) and counted by the breaker.
+# BadRequestError / SignatureVerificationError are caller mistakes, not outages.
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    razorpay.errors.ServerError,
+    razorpay.errors.GatewayError,
+)
+
+
+# -------------------------------------------------------------------
+#  🔌 Circuit Breaker
+# -------------------------------------------------------------------
+class CircuitBreaker:
+    """
+    Opens when the failure rate over the last `window` calls reaches
+    `threshold` (after at least `min_calls`). While open every call fails
+    fast; after `reset_timeout` seconds one trial call is let through and
+    its outcome closes or re-opens the circuit.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, threshold, window, min_calls, reset_timeout):
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.outcomes = deque(maxlen=window)
+        self.state = self.CLOSED
+        self.opened_at = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return self.state == self.CLOSED
+
+    def record(self, success):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                if success:
+                    self._close()
+                else:
+                    self._open()
+                return
+            self.outcomes.append(success)
+            failures = self.outcomes.count(False)
+            if len(self.outcomes) >= self.min_calls and failures / len(self.outcomes) >= self.threshold:
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+    def _close(self):
+        self.state = self.CLOSED
+        self.outcomes.clear()
+
+
+# -------------------------------------------------------------------
+#  🌐 Pooled Client (one per process)
+# -------------------------------------------------------------------
+class TimeoutSession(requests.Session):
+    """
+    requests.Session that applies default connect/read timeouts; the
+    Razorpay SDK never passes one.
+    """
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, *args, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(*args, **kwargs)
+
+
+_client = None
+_breaker = None
+_client_lock = threading.Lock()
+
+
+def _build_client():
+    session = TimeoutSession((settings.RAZORPAY_CONNECT_TIMEOUT, settings.RAZORPAY_READ_TIMEOUT))
+    # Keep-alive pool shared by all threads of this worker; retries are ours, not urllib3's
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.RAZORPAY_POOL_SIZE, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    options = {}
+    if settings.RAZORPAY_BASE_URL:
+        options['base_url'] = settings.RAZORPAY_BASE_URL
+    return razorpay.Client(session=session, auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET), **options)
+
+
+def get_client():
+    global _client, _breaker
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _breaker = CircuitBreaker(
+                    threshold=settings.RAZORPAY_BREAKER_THRESHOLD,
+                    window=settings.RAZORPAY_BREAKER_WINDOW,
+                    min_calls=settings.RAZORPAY_BREAKER_MIN_CALLS,
+                    reset_timeout=settings.RAZORPAY_BREAKER_RESET_SECONDS,
+                )
+                _client = _build_client()
+    return _client
+
+
+def get_breaker():
+    get_client()
+    return _breaker
+
+
+def reset_client():
+    """
+    Drops the process-wide client and breaker (settings changes, tests).
+    """
+    global _client, _breaker
+    with _client_lock:
+        if _client is not None:
+            _client.session.close()
+        _client = None
+        _breaker = None
+
+
+def _call(func, *args, idempotent=False, **kwargs):
+    breaker = get_breaker()
+    attempts = 1 + (settings.RAZORPAY_MAX_RETRIES if idempotent else 0)
+
+    for attempt in range(attempts):
+        if not breaker.allow():
+            raise GatewayUnavailable("Payment gateway is temporarily unavailable. Please try again shortly.")
+        # Every call that was let through must be recorded, or a half-open
+        # trial that ends in e.g. a 400 would leave the breaker stuck
+        healthy = True  # A 4xx still means Razorpay answered
+        try:
+            with timed('razorpay', getattr(func, '__qualname__', 'call')):
+                result = func(*args, **kwargs)
+        except TRANSIENT_ERRORS:
+            healthy = False
+            if attempt == attempts - 1:
+                raise
+        else:
+            return result
+        finally:
+            breaker.record(healthy)
+        # Exponential backoff with full jitter
+        cap = settings.RAZORPAY_RETRY_BASE_DELAY * (2 ** attempt)
+        time.sleep(random.uniform(0, cap))
+
+
+# -------------------------------------------------------------------
+#  💳 Gateway API
+# -------------------------------------------------------------------
+def create_order(data):
+    # Not idempotent: a retry after a lost response could create a second order
+    return _call(get_client().order.create, data=data)
+
+
+def fetch_order(order_id):
+    return _call(get_client().order.fetch, order_id, idempotent=True)
+
+
+def fetch_order_payments(order_id):
+    return _call(get_client().order.payments, order_id, idempotent=True)
+
+
+def verify_payment_signature(params):
+    """
+    Local HMAC check; raises razorpay.errors.SignatureVerificationError.
+    """
+    return get_client().utility.verify_payment_signature(params)
+
+
+def verify_webhook_signature(body, signature):
+    """
+    HMAC check of a webhook body against RAZORPAY_WEBHOOK_SECRET; raises
+    razorpay.errors.SignatureVerificationError.
+    """
+    if not settings.RAZORPAY_WEBHOOK_SECRET:
+        raise razorpay.errors.SignatureVerificationError("RAZORPAY_WEBHOOK_SECRET is not configured")
+    return get_client().utility.verify_webhook_signature(body, signature, settings.RAZORPAY_WEBHOOK_SECRET)
@@ -0,0 +1,112 @@
+import datetime
+import hashlib
+
+from django.core import signing
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from .models import ScheduledClass
+
+FEED_SALT = 'quizzes.ical.feed'
+
+
+# -------------------------------------------------------------------
+#  🔑 Feed Tokens
+# -------------------------------------------------------------------
+def make_feed_token(user):
+    return signing.Signer(salt=FEED_SALT).sign(str(user.pk))
+
+
+def read_feed_token(token):
+    """
+    Returns the user id carried by a feed token, or None if it was tampered with.
+    """
+    try:
+        return int(signing.Signer(salt=FEED_SALT).unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def feed_etag(user_id, entitlement, now):
+    """
+    Built from database state, so every worker gives the same feed the same
+    ETag and no per-process cache can pin a stale one: a single aggregate
+    over the classes in the feed, plus the user's subscription. Cheap next
+    to rendering the feed.
+    """
+    state = (
+        ScheduledClass.objects
+        .filter(entitlement.access_filter(), start_time__gte=now)
+        .aggregate(count=Count('id'), ids=Sum('id'), changed=Max('updated_at'))
+    )
+    raw = (
+        f"{user_id}:{state['count']}:{state['ids']}:{state['changed']}:"
+        f"{entitlement.package_id}:{entitlement.end_date}:{entitlement.is_active}"
+    )
+    return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+
+# -------------------------------------------------------------------
+#  📅 iCalendar Rendering (RFC 5545)
+# -------------------------------------------------------------------
+def _escape(text):
+    return (
+        text.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    # Content lines are limited to 75 octets; continuations start with a space
+    data = line.encode('utf-8')
+    if len(data) <= 75:
+        return line + '\r\n'
+    parts = []
+    while data:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(data))
+        # Never split a multi-byte character
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode('utf-8'))
+        data = data[cut:]
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _utc(value):
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value.astimezone(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def iter_calendar(classes, domain, join_url):
+    """
+    Yields the calendar line by line so large schedules stream without being
+    held in memory. `join_url(cls)` returns the absolute join link for a class.
+    """
+    stamp = _utc(timezone.now())
+    yield _fold('BEGIN:VCALENDAR')
+    yield _fold('VERSION:2.0')
+    yield _fold('PRODID:-//Recgetup Music//Class Schedule//EN')
+    yield _fold('CALSCALE:GREGORIAN')
+    yield _fold('X-WR-CALNAME:Recgetup Music Classes')
+
+    for cls in classes:
+        yield _fold('BEGIN:VEVENT')
+        yield _fold(f'UID:class-{cls.id}@{domain}')
+        yield _fold(f'DTSTAMP:{stamp}')
+        yield _fold(f'DTSTART:{_utc(cls.start_time)}')
+        yield _fold(f'DTEND:{_utc(cls.end_time)}')
+        yield _fold(f'SUMMARY:{_escape(cls.title)}')
+        description = f'Instructor: {cls.instructor}'
+        if cls.description:
+            description += f'\n\n{cls.description}'
+        yield _fold(f'DESCRIPTION:{_escape(description)}')
+        if cls.meeting_link:
+            yield _fold(f'URL:{join_url(cls)}')
+        yield _fold('END:VEVENT')
+
+    yield _fold('END:VCALENDAR')
@@ -0,0 +1,35 @@
+import uuid
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import JobLock
+
+
+# -------------------------------------------------------------------
+#  🔒 Cross-Process Job Locks
+# -------------------------------------------------------------------
+# The cache is per process (LocMemCache), so locks that must hold across
+# cron runs and gunicorn workers live in the database instead.
+
+def acquire(name, timeout):
+    """
+    Takes the `name` lock for up to `timeout` seconds. Returns a token to
+    pass to release(), or None while another run holds it.
+    """
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    until = now + timezone.timedelta(seconds=timeout)
+    if JobLock.objects.filter(name=name, locked_until__lte=now).update(owner=token, locked_until=until):
+        return token
+    try:
+        with transaction.atomic():
+            JobLock.objects.create(name=name, owner=token, locked_until=until)
+    except IntegrityError:
+        return None  # Held, and the lease has not run out
+    return token
+
+
+def release(name, token):
+    # Only the holder releases: a run that outlived its lease must not free a newer one
+    JobLock.objects.filter(name=name, owner=token).update(locked_until=timezone.now())
@@ -0,0 +1,120 @@
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else came from `extra=` and is logged as a field
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+# -------------------------------------------------------------------
+#  🧾 JSON Lines Formatter
+# -------------------------------------------------------------------
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, message, plus `extra=` fields.
+    """
+    def format(self, record):
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+# -------------------------------------------------------------------
+#  🎲 Sampling (high-volume INFO/DEBUG events)
+# -------------------------------------------------------------------
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a `rates[logger prefix]` share of records below WARNING, e.g.
+    {'quizzes.requests': 0.1}. The longest matching prefix wins; warnings
+    and errors always pass.
+    """
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + '.'):
+                return random.random() < rate
+        return True
+
+
+# -------------------------------------------------------------------
+#  📨 Non-Blocking Queue Handler
+# -------------------------------------------------------------------
+class QueueListenerHandler(QueueHandler):
+    """
+    Request threads only put records on a bounded in-memory queue. A
+    background QueueListener thread formats and writes them to `stream`,
+    so a backed-up log pipe never blocks a gunicorn worker. When the queue
+    is full, records are dropped and counted instead of waiting.
+    """
+    def __init__(self, stream='stderr', maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self.target = logging.StreamHandler(getattr(sys, stream))
+        self.listener = None
+        self._start()
+        atexit.register(self.close)
+        # Forked workers inherit the handler but not its thread
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # The parent's queue lock may have been held mid-put at fork time
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._start()
+
+    def _start(self):
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=False)
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread, not the caller's
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Resolve the message and traceback now: args and exc_info may not survive the hand-off
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self.listener is not None:
+            try:
+                self.listener.stop()
+            except Exception:
+                pass  # Already stopped (atexit after an explicit close)
+            self.listener = None
+        if self.dropped:
+            sys.stderr.write(f"{self.dropped} log records dropped: log queue was full\n")
+            self.dropped = 0
+        super().close()
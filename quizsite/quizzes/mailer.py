@@ -0,0 +1,132 @@
+import smtplib
+import threading
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from .email_render import get_skeleton
+from .metrics import timed
+from .ratelimit import RateLimiter
+
+# Errors that mean the SMTP session is gone, not that one message was bad
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def _get_limiter():
+    # One limiter per process: the provider's quota is shared by every thread
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(settings.MAIL_RATE_LIMIT)
+        return _limiter
+
+
+def reset_limiter():
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
+
+
+# -------------------------------------------------------------------
+#  📬 Pooled SMTP Dispatch
+# -------------------------------------------------------------------
+class MailDispatcher:
+    """
+    Holds one SMTP session open across many messages.
+
+        with MailDispatcher() as dispatcher:
+            errors = dispatcher.send(messages)
+
+    The session is recycled every MAIL_MESSAGES_PER_CONNECTION messages
+    (providers drop long sessions) and re-opened once if it dies mid-batch.
+    Not thread-safe: use one dispatcher per thread.
+    """
+    def __init__(self, connection=None):
+        self.connection = connection or get_connection(fail_silently=False)
+        self.sent_on_connection = 0
+
+    def __enter__(self):
+        with timed('smtp', 'connect'):
+            self.connection.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.connection.close()
+
+    def _reconnect(self):
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+        self.connection.open()
+        self.sent_on_connection = 0
+
+    def _send_one(self, message):
+        _get_limiter().wait()
+        if self.sent_on_connection >= settings.MAIL_MESSAGES_PER_CONNECTION:
+            self._reconnect()
+        with timed('smtp', 'send'):
+            try:
+                self.connection.send_messages([message])
+            except CONNECTION_ERRORS:
+                self._reconnect()
+                self.connection.send_messages([message])
+        self.sent_on_connection += 1
+
+    def send(self, messages):
+        """
+        Sends every message over the open session. Returns a list with one
+        entry per message: None when sent, otherwise the error repr.
+        """
+        results = []
+        for message in messages:
+            message.connection = self.connection
+            try:
+                self._send_one(message)
+                results.append(None)
+            except Exception as e:
+                results.append(repr(e))
+        return results
+
+
+# -------------------------------------------------------------------
+#  📣 Bulk Sending (broadcasts)
+# -------------------------------------------------------------------
+def build_message(subject, text, to, html=None, from_email=None):
+    message = EmailMultiAlternatives(subject, text, from_email or settings.EMAIL_HOST_USER, to)
+    if html:
+        message.attach_alternative(html, 'text/html')
+    return message
+
+
+# Per-recipient fields a broadcast template may print with plain {{ }} tags
+RECIPIENT_FIELDS = ('user.first_name', 'user.last_name', 'user.username', 'user.email')
+
+
+def send_bulk(recipients, subject, template_name, context=None, from_email=None):
+    """
+    Sends `<template_name>.html` (+ `.txt` text part) to every recipient over
+    a single pooled SMTP session. The layout is rendered once with `context`;
+    each recipient only fills RECIPIENT_FIELDS. `recipients` are Users or
+    plain email addresses.
+
+    Returns (sent, failed) counts.
+    """
+    skeleton = get_skeleton(template_name, context, RECIPIENT_FIELDS)
+    messages = []
+    for recipient in recipients:
+        user = recipient if hasattr(recipient, 'email') else None
+        email = user.email if user else recipient
+        if not email:
+            continue
+        values = [getattr(user, field.split('.')[1], '') for field in RECIPIENT_FIELDS] if user else ['', '', '', email]
+        text, html = skeleton.render(values)
+        messages.append(build_message(subject, text, [email], html=html, from_email=from_email))
+
+    with MailDispatcher() as dispatcher:
+        results = dispatcher.send(messages)
+    failed = sum(1 for error in results if error)
+    return len(results) - failed, failed
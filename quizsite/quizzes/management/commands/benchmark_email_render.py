@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test.utils import override_settings
+from django.utils.html import strip_tags
+
+from quizzes.email_render import clear_cache, render_email
+
+TEMPLATE = 'quizzes/emails/payment_email'
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares per-recipient render_to_string + strip_tags against compiled email skeletons. "
+        "Run with DJANGO_ENV=production so both sides use the cached template loaders."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=10000, help="Emails rendered per strategy")
+        parser.add_argument('--skip-naive', action='store_true', help="Only time the skeleton renderer")
+
+    def _recipients(self, count):
+        for i in range(count):
+            user = User(username=f'singer{i}', first_name=f'Singer {i}', email=f'singer{i}@example.com')
+            yield user, {
+                'user.first_name': user.first_name,
+                'package_name': 'Gold Vocalist',
+                'amount': '4999.00',
+                'transaction_id': f'order_{i:010d}',
+                'payment_date': '1st January 2026',
+            }
+
+    def _report(self, label, count, elapsed):
+        rate = count / elapsed if elapsed else float('inf')
+        self.stdout.write(f"{label:<28} {elapsed:8.2f}s  {rate:10.0f} emails/s  {elapsed / count * 1e6:8.1f} µs/email")
+
+    def handle(self, *args, **options):
+        count = options['recipients']
+        shared = {'domain': 'recgetupmusic.com'}
+
+        if settings.DEBUG:
+            self.stderr.write(self.style.WARNING("DEBUG is on: template loaders are not cached, naive numbers are pessimistic."))
+
+        if not options['skip_naive']:
+            started = time.perf_counter()
+            for user, values in self._recipients(count):
+                html = render_to_string(f'{TEMPLATE}.html', {
+                    **shared, 'user': user, **{k: v for k, v in values.items() if '.' not in k},
+                })
+                strip_tags(html)
+            self._report("render_to_string+strip_tags", count, time.perf_counter() - started)
+
+        clear_cache()
+        with override_settings(DEBUG=False):  # Skeletons are only cached outside DEBUG
+            started = time.perf_counter()
+            for user, values in self._recipients(count):
+                render_email(TEMPLATE, shared, values)
+            self._report("compiled skeleton", count, time.perf_counter() - started)
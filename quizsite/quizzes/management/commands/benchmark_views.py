@@ -0,0 +1,171 @@
+import json
+import queue
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+# (label, url name, needs a signed-in user)
+TARGETS = {
+    'home': ('home', True),
+    'home_anonymous': ('home', False),
+    'schedule': ('schedule', True),
+    'schedule_api': ('schedule_api', True),
+    'packages': ('packages', False),
+    'payment_history': ('payment_history', True),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives the main pages through the WSGI request handler (full middleware stack) from "
+        "concurrent clients and reports latency percentiles, throughput and queries per request "
+        "as JSON. Seed data first with `seed_perf_data`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--targets', default=','.join(TARGETS), help=f"Comma-separated subset of: {', '.join(TARGETS)}")
+        parser.add_argument('--requests', type=int, default=500, help="Measured requests per target")
+        parser.add_argument('--concurrency', type=int, default=8, help="Concurrent clients")
+        parser.add_argument('--warmup', type=int, default=20, help="Unmeasured requests per target, to fill caches")
+        parser.add_argument('--prefix', default='perf', help="Seeded usernames to sign in as")
+        parser.add_argument('--output', help="Also write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['targets'].split(',') if name.strip()]
+        unknown = set(names) - set(TARGETS)
+        if unknown:
+            raise CommandError(f"Unknown targets: {', '.join(sorted(unknown))}")
+
+        user_ids = list(
+            User.objects.filter(username__startswith=f"{options['prefix']}_", is_active=True)
+            .order_by('id').values_list('id', flat=True)[:max(options['concurrency'] * 4, 1)]
+        )
+        if not user_ids and any(TARGETS[name][1] for name in names):
+            raise CommandError(f"No '{options['prefix']}_*' users found; run seed_perf_data first.")
+        if settings.DEBUG:
+            self.stderr.write(self.style.WARNING("DEBUG is on: numbers will not match production. Use DJANGO_ENV=production."))
+
+        self.local = threading.local()
+        self.workers = queue.SimpleQueue()
+        for index in range(options['concurrency']):
+            self.workers.put(self._worker_clients(user_ids, index))
+        report = {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'debug': settings.DEBUG,
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+            },
+            'results': {},
+        }
+        with ThreadPoolExecutor(options['concurrency'], thread_name_prefix='bench') as pool:
+            try:
+                for name in names:
+                    self._run(pool, name, options['warmup'])
+                    report['results'][name] = self._run(pool, name, options['requests'])
+                    self.stderr.write(self._summary(name, report['results'][name]))
+            finally:
+                self._close_connections(pool, options['concurrency'])
+
+        output = json.dumps(report, indent=2)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(output + '\n')
+
+    # -------------------------------------------------------------------
+    #  🏃 Workers (one Client and DB connection per thread)
+    # -------------------------------------------------------------------
+    def _worker_clients(self, user_ids, index):
+        """
+        {signed in: Client} for one worker thread. Logging in writes to the
+        database, so it happens up front on the main thread and the workers
+        only ever read.
+        """
+        clients = {False: Client()}
+        if user_ids:
+            # Spread workers over different users so per-user caches behave realistically
+            clients[True] = Client()
+            clients[True].force_login(User.objects.get(pk=user_ids[index % len(user_ids)]))
+        return clients
+
+    def _client(self, signed_in):
+        clients = getattr(self.local, 'clients', None)
+        if clients is None:
+            clients = self.local.clients = self.workers.get_nowait()
+        return clients[signed_in]
+
+    def _request(self, url, signed_in):
+        client = self._client(signed_in)
+        queries = [0]
+
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = time.perf_counter() - started
+        return elapsed, queries[0], response.status_code
+
+    def _close_connections(self, pool, workers):
+        # Each task waits at the barrier until all of them are running, so every
+        # worker thread gets exactly one and closes its own connection
+        barrier = threading.Barrier(workers)
+
+        def close():
+            barrier.wait(timeout=60)
+            connection.close()
+
+        for future in [pool.submit(close) for _ in range(workers)]:
+            future.result()
+
+    def _run(self, pool, name, count):
+        url_name, signed_in = TARGETS[name]
+        url = reverse(url_name)
+        started = time.perf_counter()
+        samples = list(pool.map(lambda _: self._request(url, signed_in), range(count)))
+        wall = time.perf_counter() - started
+        if not samples:
+            return {}
+
+        latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+        queries = [query_count for _, query_count, _ in samples]
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+        return {
+            'url': url,
+            'requests': len(samples),
+            'errors': sum(1 for _, _, status in samples if status >= 400),
+            'rps': round(len(samples) / wall, 1),
+            'latency_ms': {
+                'p50': round(cuts[49], 2),
+                'p95': round(cuts[94], 2),
+                'p99': round(cuts[98], 2),
+                'mean': round(statistics.fmean(latencies), 2),
+                'max': round(latencies[-1], 2),
+            },
+            'queries_per_request': {
+                'mean': round(statistics.fmean(queries), 2),
+                'max': max(queries),
+            },
+        }
+
+    def _summary(self, name, result):
+        latency = result['latency_ms']
+        return (
+            f"{name:<16} {result['rps']:8.1f} req/s  p50 {latency['p50']:7.2f}ms  p95 {latency['p95']:7.2f}ms  "
+            f"p99 {latency['p99']:7.2f}ms  {result['queries_per_request']['mean']:5.1f} queries  {result['errors']} errors"
+        )
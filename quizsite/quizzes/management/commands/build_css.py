@@ -0,0 +1,42 @@
+import shlex
+import subprocess
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Compiles a purged, minified Tailwind bundle from the classes used in our templates "
+        "into quizzes/static/quizzes/css/app.css. Run before collectstatic on every deploy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cli', default=settings.TAILWIND_CLI, help="Tailwind CLI command (default: settings.TAILWIND_CLI)")
+
+    def handle(self, *args, **options):
+        base_dir = Path(settings.BASE_DIR)
+        output = base_dir / 'quizzes' / 'static' / settings.TAILWIND_CSS
+        command = shlex.split(options['cli']) + [
+            '--config', str(base_dir / 'tailwind.config.js'),
+            '--input', str(base_dir / 'quizzes' / 'assets' / 'tailwind.css'),
+            '--output', str(output),
+            '--minify',
+        ]
+
+        started = time.monotonic()
+        try:
+            result = subprocess.run(command, cwd=base_dir, capture_output=True, text=True)
+        except FileNotFoundError:
+            raise CommandError(
+                f"Tailwind CLI not found ({options['cli']!r}). Install the standalone binary or Node.js, "
+                "or point TAILWIND_CLI at it."
+            )
+        if result.returncode != 0:
+            raise CommandError(f"Tailwind build failed:\n{result.stderr}")
+
+        size_kb = output.stat().st_size / 1024
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Built {settings.TAILWIND_CSS} ({size_kb:.1f} KB) in {elapsed:.1f}s."))
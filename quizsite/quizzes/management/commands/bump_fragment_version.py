@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from quizzes.caching import bump_fragment_version
+
+
+class Command(BaseCommand):
+    help = "Invalidates every cached template fragment. Run once per deploy."
+
+    def handle(self, *args, **options):
+        bump_fragment_version()
+        self.stdout.write(self.style.SUCCESS("Template fragment cache version bumped."))
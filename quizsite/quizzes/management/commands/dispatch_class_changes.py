@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from quizzes.class_changes import dispatch_due
+
+
+class Command(BaseCommand):
+    help = "Queues notifications for rescheduled classes once their coalescing window has passed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=15.0, help="Seconds to sleep between checks")
+        parser.add_argument('--once', action='store_true', help="Dispatch what is due now, then exit")
+
+    def handle(self, *args, **options):
+        total = 0
+        try:
+            while True:
+                events, messages = dispatch_due()
+                total += messages
+                if events:
+                    self.stdout.write(f"Dispatched {events} class changes as {messages} messages.")
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"Class change dispatcher stopped: {total} messages queued."))
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from quizzes.models import UserSubscription
+from quizzes.entitlements import invalidate_users
+
+
+class Command(BaseCommand):
+    help = "Deactivates every lapsed UserSubscription using chunked bulk UPDATEs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Rows updated per UPDATE statement")
+        parser.add_argument('--dry-run', action='store_true', help="Only count lapsed subscriptions")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        started = time.monotonic()
+        now = timezone.now()
+
+        lapsed = UserSubscription.objects.filter(is_active=True, end_date__lt=now)
+
+        if options['dry_run']:
+            self.stdout.write(f"{lapsed.count()} subscriptions would be expired.")
+            return
+
+        expired = 0
+        chunks = 0
+        last_id = 0
+        while True:
+            # Walk the primary key so each UPDATE touches a bounded, indexed range
+            rows = list(
+                lapsed.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'user_id')[:chunk_size]
+            )
+            if not rows:
+                break
+
+            ids = [row_id for row_id, _ in rows]
+            expired += UserSubscription.objects.filter(id__in=ids, is_active=True).update(is_active=False)
+            invalidate_users([user_id for _, user_id in rows])
+            chunks += 1
+            last_id = ids[-1]
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {expired} subscriptions in {chunks} chunks ({elapsed:.2f}s)."
+        ))
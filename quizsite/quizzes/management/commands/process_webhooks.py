@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from quizzes.webhooks import process_pending
+
+
+class Command(BaseCommand):
+    help = "Applies stored Razorpay webhook events to payments and subscriptions in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.WEBHOOK_BATCH_SIZE, help="Events applied per transaction")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds to sleep when idle")
+        parser.add_argument('--once', action='store_true', help="Apply what is pending now, then exit")
+
+    def handle(self, *args, **options):
+        total = 0
+        try:
+            while True:
+                started = time.monotonic()
+                handled = process_pending(options['batch_size'])
+                total += handled
+                if handled:
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(f"Applied {handled} events ({elapsed:.2f}s).")
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"Webhook processor stopped: {total} events applied."))
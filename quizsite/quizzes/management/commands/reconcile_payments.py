@@ -0,0 +1,103 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from quizzes import gateway
+from quizzes.checkout import activate_payments
+from quizzes.models import PaymentHistory
+from quizzes.ratelimit import RateLimiter
+
+
+class Command(BaseCommand):
+    help = "Reconciles stale PENDING payments against Razorpay order status."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=30, help="Only rows PENDING for at least this many minutes")
+        parser.add_argument('--fail-after', type=int, default=24 * 60, help="Mark unpaid orders FAILED after this many minutes")
+        parser.add_argument('--workers', type=int, default=8, help="Concurrent gateway lookups")
+        parser.add_argument('--rate', type=float, default=10, help="Max gateway lookups per second (0 = unlimited)")
+        parser.add_argument('--chunk-size', type=int, default=200, help="Rows fetched and written per transaction")
+        parser.add_argument('--after-id', type=int, default=0, help="Resume cursor: skip rows with id <= this")
+        parser.add_argument('--dry-run', action='store_true', help="Look up statuses but write nothing")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        now = timezone.now()
+        stale_before = now - timezone.timedelta(minutes=options['older_than'])
+        fail_before = now - timezone.timedelta(minutes=options['fail_after'])
+        limiter = RateLimiter(options['rate'])
+
+        def lookup(order_id):
+            limiter.wait()
+            try:
+                return gateway.fetch_order(order_id)['status'], None
+            except gateway.GatewayUnavailable:
+                raise
+            except Exception as e:
+                return None, repr(e)
+
+        stale = PaymentHistory.objects.filter(status='PENDING', payment_date__lt=stale_before)
+        summary = {'scanned': 0, 'paid': 0, 'failed': 0, 'pending': 0, 'errors': 0}
+        cursor = options['after_id']
+
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='reconcile') as executor:
+            while True:
+                rows = list(
+                    stale.filter(id__gt=cursor)
+                    .order_by('id')
+                    .values_list('id', 'transaction_id', 'payment_date')[:options['chunk_size']]
+                )
+                if not rows:
+                    break
+
+                try:
+                    results = list(executor.map(lookup, [order_id for _, order_id, _ in rows]))
+                except gateway.GatewayUnavailable as e:
+                    self.stderr.write(self.style.ERROR(f"{e} Stopped; resume with --after-id {cursor}"))
+                    break
+
+                paid_ids, failed_ids = [], []
+                for (row_id, order_id, created), (status, error) in zip(rows, results):
+                    summary['scanned'] += 1
+                    if error:
+                        summary['errors'] += 1
+                        self.stderr.write(f"  {order_id}: {error}")
+                    elif status == 'paid':
+                        paid_ids.append(row_id)
+                    elif created < fail_before:
+                        failed_ids.append(row_id)
+                    else:
+                        summary['pending'] += 1
+
+                if not options['dry_run']:
+                    paid_count, failed_count = self._apply(paid_ids, failed_ids)
+                else:
+                    paid_count, failed_count = len(paid_ids), len(failed_ids)
+                summary['paid'] += paid_count
+                summary['failed'] += failed_count
+
+                cursor = rows[-1][0]
+                self.stdout.write(f"Reconciled through id {cursor} ({summary['scanned']} scanned).")
+
+        elapsed = time.monotonic() - started
+        prefix = "[dry run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Scanned {summary['scanned']}: {summary['paid']} paid, {summary['failed']} failed, "
+            f"{summary['pending']} still pending, {summary['errors']} errors ({elapsed:.2f}s). Last id: {cursor}"
+        ))
+
+    def _apply(self, paid_ids, failed_ids):
+        # Rows may have been settled by payment_verify or a webhook meanwhile
+        with transaction.atomic():
+            payments = list(
+                PaymentHistory.objects
+                .select_for_update(of=('self',))
+                .filter(id__in=paid_ids, status='PENDING')
+                .select_related('user', 'package')
+            )
+            activated = activate_payments(payments)
+            failed = PaymentHistory.objects.filter(id__in=failed_ids, status='PENDING').update(status='FAILED')
+        return len(activated), failed
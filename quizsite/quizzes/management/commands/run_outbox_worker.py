@@ -0,0 +1,39 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from quizzes.outbox import process_batch
+
+
+class Command(BaseCommand):
+    help = "Delivers queued email/WhatsApp notifications from the outbox table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=settings.OUTBOX_WORKER_THREADS, help="Sender threads")
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE, help="Messages claimed per round")
+        parser.add_argument('--poll-interval', type=float, default=settings.OUTBOX_POLL_INTERVAL, help="Seconds to sleep when idle")
+        parser.add_argument('--once', action='store_true', help="Drain what is due now, then exit")
+
+    def handle(self, *args, **options):
+        totals = [0, 0, 0]
+        with ThreadPoolExecutor(max_workers=options['threads'], thread_name_prefix='outbox') as executor:
+            try:
+                while True:
+                    counts = process_batch(executor, options['batch_size'])
+                    totals = [total + count for total, count in zip(totals, counts)]
+                    if any(counts):
+                        sent, dead, retrying = counts
+                        self.stdout.write(f"Sent {sent}, dead-lettered {dead}, retrying {retrying}.")
+                        continue
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+            except KeyboardInterrupt:
+                pass
+
+        sent, dead, retrying = totals
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox worker stopped: {sent} sent, {dead} dead-lettered, {retrying} scheduled for retry."
+        ))
@@ -0,0 +1,200 @@
+import random
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from quizzes import entitlements
+from quizzes.caching import purge_page_cache
+from quizzes.models import ClassPackage, PaymentHistory, Profile, ScheduledClass, UserSubscription
+
+PACKAGES = [
+    ('Starter Vocals', 1499, 1, 4),
+    ('Monthly Beginner', 2499, 1, 8),
+    ('Pro Vocalist', 4999, 3, 24),
+    ('Gold Vocalist', 8999, 6, 48),
+    ('Classical Intensive', 11999, 6, 60),
+    ('Annual All-Access', 19999, 12, 120),
+]
+INSTRUCTORS = ['Head Coach', 'Asha Rao', 'Daniel Reyes', 'Meera Iyer', 'Tom Whitfield']
+TOPICS = ['Vocal Warmups', 'Breath Control', 'Pitch Training', 'Raga Basics', 'Pop Belting', 'Harmony Lab', 'Stage Presence']
+
+
+@contextmanager
+def explicit_dates(*fields):
+    """
+    Lets bulk_create keep the dates we set on auto_now_add fields.
+    """
+    previous = [field.auto_now_add for field in fields]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, value in zip(fields, previous):
+            field.auto_now_add = value
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-creates realistic volumes of users, profiles, subscriptions, payments and classes "
+        "for load testing. Never run against production data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50000)
+        parser.add_argument('--payments', type=int, default=500000)
+        parser.add_argument('--classes', type=int, default=10000)
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per bulk_create")
+        parser.add_argument('--prefix', default='perf', help="Username / order id / class title prefix of seeded rows")
+        parser.add_argument('--seed', type=int, default=42, help="Random seed, so runs are reproducible")
+        parser.add_argument('--clear', action='store_true', help="Delete rows from a previous run with the same prefix first")
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        self.random = random.Random(options['seed'])
+        self.now = timezone.now()
+
+        if options['clear']:
+            self._clear()
+        elif User.objects.filter(username__startswith=f'{self.prefix}_').exists():
+            raise CommandError(f"Seeded '{self.prefix}' rows already exist; pass --clear to replace them.")
+
+        started = time.monotonic()
+        packages = self._packages()
+        user_ids = self._users(options['users'])
+        self._subscriptions(user_ids, packages)
+        self._payments(options['payments'], user_ids, packages)
+        self._classes(options['classes'], packages)
+
+        # Bulk inserts skip the signals that normally keep these caches honest
+        entitlements.invalidate_all()
+        purge_page_cache()
+        self.stdout.write(self.style.SUCCESS(f"Seeding finished in {time.monotonic() - started:.1f}s."))
+
+    # -------------------------------------------------------------------
+    #  🧹 Helpers
+    # -------------------------------------------------------------------
+    def _bulk(self, model, rows, label):
+        """
+        bulk_create in batches, one transaction per batch, reporting progress.
+        """
+        batch, total = [], 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                total += self._flush(model, batch)
+                self.stdout.write(f"  {label}: {total}", ending='\r')
+        if batch:
+            total += self._flush(model, batch)
+        self.stdout.write(f"  {label}: {total}")
+        return total
+
+    def _flush(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+        count = len(batch)
+        batch.clear()
+        return count
+
+    def _clear(self):
+        users = User.objects.filter(username__startswith=f'{self.prefix}_')
+        PaymentHistory.objects.filter(transaction_id__startswith=f'{self.prefix}_').delete()
+        UserSubscription.objects.filter(user__in=users).delete()
+        Profile.objects.filter(user__in=users).delete()
+        users.delete()
+        ScheduledClass.objects.filter(title__startswith=f'[{self.prefix}]').delete()
+        ClassPackage.objects.filter(name__startswith=f'[{self.prefix}]').delete()
+        self.stdout.write("Removed previously seeded rows.")
+
+    def _random_past(self, days):
+        return self.now - timezone.timedelta(seconds=self.random.randint(0, days * 86400))
+
+    # -------------------------------------------------------------------
+    #  🌱 Generators
+    # -------------------------------------------------------------------
+    def _packages(self):
+        packages = [
+            ClassPackage.objects.create(
+                name=f'[{self.prefix}] {name}', price=price, duration_months=months, max_classes=classes,
+                description=f"{classes} live classes over {months} month(s).",
+            )
+            for name, price, months, classes in PACKAGES
+        ]
+        self.stdout.write(f"  packages: {len(packages)}")
+        return packages
+
+    def _users(self, count):
+        password = make_password('perf-password')  # Hash once; hashing 50k passwords would dominate the run
+        width = len(str(count))
+        users = (
+            User(
+                username=f'{self.prefix}_{i:0{width}d}', email=f'{self.prefix}_{i}@example.com',
+                first_name=self.random.choice(['Aarav', 'Diya', 'Kabir', 'Maya', 'Rohan', 'Sara', 'Vihaan', 'Zoya']),
+                password=password, date_joined=self._random_past(730),
+            )
+            for i in range(count)
+        )
+        self._bulk(User, users, 'users')
+
+        # MySQL does not return primary keys from bulk_create, so read them back
+        user_ids = list(User.objects.filter(username__startswith=f'{self.prefix}_').order_by('id').values_list('id', flat=True))
+        profiles = (
+            Profile(
+                user_id=user_id, gender=self.random.choice('MFO'),
+                phone_number=f'9{self.random.randint(100000000, 999999999)}' if self.random.random() < 0.7 else None,
+            )
+            for user_id in user_ids
+        )
+        self._bulk(Profile, profiles, 'profiles')
+        return user_ids
+
+    def _subscriptions(self, user_ids, packages):
+        # Roughly 60% of students have bought a package; a third of those have lapsed
+        subscribers = self.random.sample(user_ids, int(len(user_ids) * 0.6))
+        subscriptions = (
+            UserSubscription(
+                user_id=user_id, package=self.random.choice(packages), is_active=active,
+                end_date=self.now + timezone.timedelta(days=self.random.randint(1, 365) * (1 if active else -1)),
+            )
+            for user_id, active in ((user_id, self.random.random() < 0.66) for user_id in subscribers)
+        )
+        self._bulk(UserSubscription, subscriptions, 'subscriptions')
+
+    def _payments(self, count, user_ids, packages):
+        statuses = ['SUCCESS'] * 8 + ['FAILED'] + ['PENDING']
+        payments = (
+            PaymentHistory(
+                user_id=self.random.choice(user_ids), package=package, amount=package.price,
+                transaction_id=f'{self.prefix}_order_{i:09d}', status=self.random.choice(statuses),
+                payment_date=self._random_past(730),
+            )
+            for i, package in ((i, self.random.choice(packages)) for i in range(count))
+        )
+        with explicit_dates(PaymentHistory._meta.get_field('payment_date')):
+            self._bulk(PaymentHistory, payments, 'payments')
+
+    def _classes(self, count, packages):
+        def make_class(i):
+            start = self.now + timezone.timedelta(hours=self.random.randint(-90 * 24, 90 * 24))
+            return ScheduledClass(
+                title=f'[{self.prefix}] {self.random.choice(TOPICS)} #{i}', instructor=self.random.choice(INSTRUCTORS),
+                start_time=start, end_time=start + timezone.timedelta(minutes=self.random.choice([45, 60, 90])),
+                meeting_link=f'https://meet.example.com/{self.prefix}-{i}', is_universal=self.random.random() < 0.3,
+            )
+
+        self._bulk(ScheduledClass, (make_class(i) for i in range(count)), 'classes')
+
+        gated = ScheduledClass.objects.filter(title__startswith=f'[{self.prefix}]', is_universal=False).values_list('id', flat=True)
+        links = ScheduledClass.packages.through
+        rows = (
+            links(scheduledclass_id=class_id, classpackage_id=package.id)
+            for class_id in list(gated)
+            for package in self.random.sample(packages, self.random.randint(1, 2))
+        )
+        self._bulk(links, rows, 'class package links')
@@ -0,0 +1,149 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Exists, IntegerField, OuterRef, Value
+from django.urls import reverse
+from django.utils import dateformat, timezone
+
+from quizzes import locks
+from quizzes.email_render import get_skeleton
+from quizzes.models import ClassReminder, OutboxMessage, ScheduledClass, UserSubscription
+from quizzes.outbox import build_email, build_whatsapp, process_batch
+
+TEMPLATE = 'quizzes/emails/class_reminder'
+
+
+def pending_reminders(classes, window, now):
+    """
+    (class_id, user_id) for every active subscriber entitled to one of
+    `classes` who has not been reminded in this window yet, as a single
+    UNION query: package-linked classes via the link table, universal
+    classes crossed with every active subscription.
+    """
+    active = {'is_active': True, 'end_date__gt': now}
+    link = ScheduledClass.packages.through
+
+    linked = (
+        link.objects
+        .filter(
+            scheduledclass__in=[cls.id for cls in classes if not cls.is_universal],
+            **{f'classpackage__usersubscription__{key}': value for key, value in active.items()}
+        )
+        .alias(sent=Exists(ClassReminder.objects.filter(
+            window=window, scheduled_class_id=OuterRef('scheduledclass_id'),
+            user_id=OuterRef('classpackage__usersubscription__user_id'),
+        )))
+        .filter(sent=False)
+        .values_list('scheduledclass_id', 'classpackage__usersubscription__user_id')
+    )
+
+    universal = [
+        UserSubscription.objects
+        .filter(**active)
+        .annotate(class_id=Value(cls.id, output_field=IntegerField()))
+        .alias(sent=Exists(ClassReminder.objects.filter(window=window, scheduled_class_id=cls.id, user_id=OuterRef('user_id'))))
+        .filter(sent=False)
+        .values_list('class_id', 'user_id')
+        for cls in classes if cls.is_universal
+    ]
+    return sorted(linked.union(*universal)) if universal else sorted(linked)
+
+
+class Command(BaseCommand):
+    help = "Queues email/WhatsApp reminders for classes starting within the next window."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=settings.CLASS_REMINDER_WINDOW, help="Minutes ahead to look for classes")
+        parser.add_argument('--chunk-size', type=int, default=500, help="Reminders written per transaction")
+        parser.add_argument('--deliver', action='store_true', help="Drain the outbox right away instead of waiting for run_outbox_worker")
+        parser.add_argument('--workers', type=int, default=settings.OUTBOX_WORKER_THREADS, help="Sender threads for --deliver")
+        parser.add_argument('--dry-run', action='store_true', help="Only count reminders that would be queued")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        now = timezone.now()
+        window = f"{options['window']}m"
+
+        # Reruns skip already-reminded users; the lock stops two overlapping runs racing on the same rows
+        lock_name = f'reminders:{window}'
+        lock = None
+        if not options['dry_run']:
+            lock = locks.acquire(lock_name, 15 * 60)
+            if lock is None:
+                raise CommandError(f"Another send_class_reminders run for window {window} is in progress.")
+
+        try:
+            classes = list(ScheduledClass.objects.filter(
+                start_time__gt=now, start_time__lte=now + timezone.timedelta(minutes=options['window'])
+            ))
+            pairs = pending_reminders(classes, window, now) if classes else []
+
+            if options['dry_run']:
+                self.stdout.write(f"{len(pairs)} reminders would be queued for {len(classes)} classes.")
+                return
+
+            by_id = {cls.id: cls for cls in classes}
+            queued = 0
+            for start in range(0, len(pairs), options['chunk_size']):
+                queued += self._queue_chunk(pairs[start:start + options['chunk_size']], by_id, window)
+        finally:
+            if lock:
+                locks.release(lock_name, lock)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Queued {queued} messages for {len(pairs)} reminders across {len(classes)} classes ({elapsed:.2f}s)."
+        ))
+
+        if options['deliver'] and queued:
+            self._deliver(options['workers'])
+
+    def _skeleton(self, cls):
+        return get_skeleton(TEMPLATE, {
+            'domain': settings.SITE_DOMAIN,
+            'class_title': cls.title,
+            'instructor': cls.instructor,
+            'start_time': dateformat.format(cls.start_time, 'P, jS F'),
+            'join_path': reverse('join_class', args=[cls.id]),
+        }, ('user.first_name',))
+
+    def _queue_chunk(self, pairs, classes, window):
+        users = {
+            user.id: user for user in
+            User.objects.filter(id__in={user_id for _, user_id in pairs}).select_related('profile')
+            .only('id', 'first_name', 'email', 'profile__phone_number')
+        }
+        batch = uuid.uuid4()
+        reminders, messages = [], {}
+        for class_id, user_id in pairs:
+            cls, user = classes[class_id], users[user_id]
+            reminders.append(ClassReminder(scheduled_class_id=class_id, user_id=user_id, window=window, batch=batch))
+            messages[class_id, user_id] = outgoing = []
+            if user.email:
+                text, html = self._skeleton(cls).render([user.first_name])
+                outgoing.append(build_email(f"⏰ Starting soon: {cls.title}", text, [user.email], html=html))
+            phone = getattr(getattr(user, 'profile', None), 'phone_number', None)
+            if phone:
+                outgoing.append(build_whatsapp(phone, f"⏰ {cls.title} starts at {dateformat.format(cls.start_time, 'P')}. Join from your dashboard."))
+
+        # Ledger rows and their messages commit together, so a crash never half-sends a chunk
+        with transaction.atomic():
+            ClassReminder.objects.bulk_create(reminders, ignore_conflicts=True)
+            # Conflicting rows were skipped: someone else already reminded those users
+            inserted = ClassReminder.objects.filter(batch=batch).values_list('scheduled_class_id', 'user_id')
+            queued = [message for pair in inserted for message in messages[pair]]
+            OutboxMessage.objects.bulk_create(queued)
+        return len(queued)
+
+    def _deliver(self, workers):
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='reminders') as executor:
+            while True:
+                sent, dead, retrying = process_batch(executor)
+                if not (sent or dead or retrying):
+                    break
+                self.stdout.write(f"Sent {sent}, dead-lettered {dead}, retrying {retrying}.")
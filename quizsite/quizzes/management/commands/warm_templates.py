@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quizzes.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Compiles every template under quizzes/templates and reports syntax errors. "
+        "Worker processes warm their own cache at boot (TEMPLATE_WARMUP in wsgi.py); "
+        "run this with --strict in CI to catch broken templates before they ship."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--strict', action='store_true', help="Exit non-zero if any template fails to compile")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        compiled, errors = warm_templates()
+        elapsed = time.monotonic() - started
+
+        for name, error in errors.items():
+            self.stderr.write(self.style.WARNING(f"⚠️ {name}: {error}"))
+        self.stdout.write(f"Compiled {len(compiled)} templates in {elapsed:.2f}s.")
+        if errors and options['strict']:
+            raise CommandError(f"{len(errors)} templates failed to compile.")
@@ -0,0 +1,111 @@
+import contextvars
+import heapq
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# In-process timing counters: {(group, name): [count, total_seconds, max_seconds]}
+_lock = threading.Lock()
+_timings = {}
+
+# Per-request totals while a request is being timed: {group: [count, total_seconds]}
+_request_spans = contextvars.ContextVar('request_spans', default=None)
+
+
+def record_timing(group, name, seconds):
+    add_to_request(group, seconds)
+    with _lock:
+        entry = _timings.get((group, name))
+        if entry is None:
+            _timings[(group, name)] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+
+def timing_snapshot(group):
+    """
+    Returns {name: {'count', 'total_ms', 'avg_ms', 'max_ms'}} for one group, slowest total first.
+    """
+    with _lock:
+        rows = [(name, list(entry)) for (g, name), entry in _timings.items() if g == group]
+    rows.sort(key=lambda row: row[1][1], reverse=True)
+    return {
+        name: {
+            'count': count,
+            'total_ms': round(total * 1000, 2),
+            'avg_ms': round(total * 1000 / count, 2),
+            'max_ms': round(peak * 1000, 2),
+        }
+        for name, (count, total, peak) in rows
+    }
+
+
+def reset_timings():
+    with _lock:
+        _timings.clear()
+
+
+@contextmanager
+def timed(group, name):
+    """
+    Times the block into `group` (e.g. an outbound 'razorpay' or 'smtp' call).
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(group, name, time.perf_counter() - started)
+
+
+# -------------------------------------------------------------------
+#  ⏱️ Per-Request Spans (filled while RequestTimingMiddleware runs)
+# -------------------------------------------------------------------
+def start_request():
+    return _request_spans.set({})
+
+
+def end_request(token):
+    spans = _request_spans.get()
+    _request_spans.reset(token)
+    return spans or {}
+
+
+def add_to_request(group, seconds):
+    spans = _request_spans.get()
+    if spans is None:
+        return
+    entry = spans.setdefault(group, [0, 0.0])
+    entry[0] += 1
+    entry[1] += seconds
+
+
+# -------------------------------------------------------------------
+#  🐢 Slow Request Ring Buffer
+# -------------------------------------------------------------------
+_requests_lock = threading.Lock()
+_requests = deque(maxlen=100)
+
+
+def record_request(entry, size):
+    global _requests
+    with _requests_lock:
+        if _requests.maxlen != size:
+            _requests = deque(_requests, maxlen=size)
+        _requests.append(entry)
+
+
+def slowest_requests(limit=None):
+    """
+    Buffered request timings, slowest first.
+    """
+    with _requests_lock:
+        entries = list(_requests)
+    return heapq.nlargest(limit or len(entries), entries, key=lambda entry: entry['total_ms'])
+
+
+def reset_requests():
+    with _requests_lock:
+        _requests.clear()
@@ -0,0 +1,156 @@
+import cProfile
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import empty
+
+from . import metrics
+from .profiling import save_profile
+
+logger = logging.getLogger('quizzes.requests')
+
+
+def _loaded_user(request):
+    """
+    request.user if the view already resolved it, else None (never costs a query).
+    """
+    user = getattr(request, 'user', None)
+    if getattr(user, '_wrapped', None) is empty:
+        return None
+    return user
+
+
+# Span groups reported as Server-Timing metrics, in header order
+SERVER_TIMING_GROUPS = ('sql', 'template', 'razorpay', 'smtp', 'whatsapp')
+
+
+# -------------------------------------------------------------------
+#  ⏱️ Request Timing (SQL / templates / outbound calls)
+# -------------------------------------------------------------------
+class RequestTimingMiddleware:
+    """
+    Times each request and splits it into SQL, template rendering and
+    outbound calls (Razorpay, SMTP, WhatsApp). The breakdown is sent as a
+    Server-Timing header, logged to `quizzes.requests`, and slow or sampled
+    requests are kept for staff at /ops/metrics/requests/.
+
+    Keep it first in MIDDLEWARE so session and auth queries are counted.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = metrics.start_request()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._time_query):
+                response = self.get_response(request)
+        finally:
+            spans = metrics.end_request(token)
+        total = time.perf_counter() - started
+
+        user = _loaded_user(request)
+        entry = self._entry(request, response, spans, total, user)
+        if settings.SERVER_TIMING_PUBLIC or getattr(user, 'is_staff', False):
+            response['Server-Timing'] = self._header(spans, total)
+        logger.info(
+            "%s %s %s %.1fms (%d queries)", request.method, request.path, response.status_code,
+            entry['total_ms'], entry['sql_count'], extra={'timing': entry},
+        )
+        if entry['total_ms'] >= settings.REQUEST_SLOW_MS or random.random() < settings.REQUEST_TIMING_SAMPLE_RATE:
+            metrics.record_request(entry, settings.REQUEST_TIMING_BUFFER_SIZE)
+        return response
+
+    def _time_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            metrics.add_to_request('sql', time.perf_counter() - started)
+
+    def _entry(self, request, response, spans, total, user):
+        match = getattr(request, 'resolver_match', None)
+        sql_count, sql_seconds = spans.get('sql', (0, 0.0))
+        return {
+            'at': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'user_id': getattr(user, 'pk', None),
+            'total_ms': round(total * 1000, 2),
+            'sql_count': sql_count,
+            'sql_ms': round(sql_seconds * 1000, 2),
+            'spans': {
+                group: {'count': count, 'ms': round(seconds * 1000, 2)}
+                for group, (count, seconds) in spans.items() if group != 'sql'
+            },
+        }
+
+    def _header(self, spans, total):
+        parts = []
+        for group in SERVER_TIMING_GROUPS:
+            if group in spans:
+                count, seconds = spans[group]
+                parts.append(f'{group};dur={seconds * 1000:.1f};desc="{count}x"')
+        parts.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(parts)
+
+
+# -------------------------------------------------------------------
+#  🔬 On-Demand Profiling (staff only)
+# -------------------------------------------------------------------
+PROFILE_PARAM = '_profile'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+
+
+class ProfilingMiddleware:
+    """
+    Runs one request under cProfile when a staff user asks for it with
+    `?_profile=1` or an `X-Profile: 1` header. The stats are stored (see
+    quizzes.profiling) and the response carries an `X-Profile-Url` to
+    download them. Other requests only pay for two dict lookups.
+
+    Must come after AuthenticationMiddleware.
+    """
+    # One profiler at a time: cProfile hooks are per-thread, but overlapping
+    # runs would skew each other and pile up on the same worker
+    _busy = threading.Lock()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if PROFILE_PARAM not in request.GET and PROFILE_HEADER not in request.META:
+            return self.get_response(request)
+        if not request.user.is_staff:
+            return self.get_response(request)
+        if not self._busy.acquire(blocking=False):
+            response = self.get_response(request)
+            response['X-Profile'] = 'busy'
+            return response
+
+        try:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            match = getattr(request, 'resolver_match', None)
+            try:
+                key, filename = save_profile(profiler, match.view_name if match else None)
+            except OSError:
+                # The request itself succeeded; losing its profile must not turn it into a 500
+                logger.exception("Could not save profile for %s", request.path)
+                return response
+        finally:
+            self._busy.release()
+        response['X-Profile-Url'] = reverse('profile_download', args=[key, filename])
+        return response
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:18
+
+from django.db import migrations, models
+
+
+def backfill_is_universal(apps, schema_editor):
+    ScheduledClass = apps.get_model('quizzes', 'ScheduledClass')
+    links = ScheduledClass.packages.through.objects.filter(scheduledclass_id=models.OuterRef('pk'))
+    ScheduledClass.objects.update(is_universal=~models.Exists(links))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0012_scheduledclass_packages'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledclass',
+            name='is_universal',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.RunPython(backfill_is_universal, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='scheduledclass',
+            index=models.Index(fields=['is_universal', 'start_time'], name='class_universal_start_idx'),
+        ),
+    ]
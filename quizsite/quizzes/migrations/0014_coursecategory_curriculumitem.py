@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0013_scheduledclass_is_universal'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(unique=True)),
+                ('title', models.CharField(max_length=100)),
+                ('subtitle', models.CharField(blank=True, max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('image', models.CharField(help_text='Static path, e.g. quizzes/images/western_pop_banner.png', max_length=200)),
+                ('color', models.CharField(choices=[('amber', 'Amber'), ('purple', 'Purple'), ('red', 'Red')], default='amber', max_length=10)),
+                ('icon', models.CharField(blank=True, help_text='Emoji shown in the hero badge', max_length=10)),
+                ('mentor', models.CharField(blank=True, max_length=100)),
+                ('quote', models.CharField(blank=True, max_length=255)),
+                ('is_active', models.BooleanField(default=True)),
+                ('curriculum_html', models.TextField(blank=True, editable=False)),
+            ],
+            options={
+                'verbose_name_plural': 'Course Categories',
+                'ordering': ['title'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CurriculumItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='curriculum_items', to='quizzes.coursecategory')),
+            ],
+            options={
+                'ordering': ['order', 'id'],
+            },
+        ),
+    ]
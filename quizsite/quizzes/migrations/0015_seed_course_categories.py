@@ -0,0 +1,88 @@
+from django.db import migrations
+
+
+# The three categories that used to be hard-coded in views.category_detail
+CATEGORIES = [
+    {
+        'slug': 'indian-classical',
+        'title': 'Indian Classical Vocals',
+        'subtitle': 'Master the Ancient Art of Raga & Riyaz',
+        'description': 'Embark on a spiritual journey through the 7 notes (Swara). From basic Alankars to complex Raag improvisations, learn the foundation of all Indian music.',
+        'image': 'quizzes/images/indian_classical_banner.png',
+        'color': 'amber',
+        'icon': '🕉️',
+        'mentor': 'Pt. Ravi Shankar Style',
+        'quote': "Music is not just art, it is yoga for the soul.",
+        'curriculum': [
+            ('Swara & Shruti', 'Perfecting the 22 microtones of Indian music.'),
+            ('Raag Mastery', 'Deep dive into Raag Yaman, Bhairav, and more.'),
+            ('Taal & Rhythm', 'Mastering Tabla beats (Teentaal, Dadra).'),
+            ('Voice Culture', 'Gamma, Meend, and Murki techniques.'),
+        ],
+    },
+    {
+        'slug': 'western-pop',
+        'title': 'Western Pop Vocals',
+        'subtitle': 'Own the Stage with Power & Style',
+        'description': 'Unlock your full vocal range, master breath control, and learn to belt like a star. This course is designed for modern performers.',
+        'image': 'quizzes/images/western_pop_banner.png',
+        'color': 'purple',
+        'icon': '🎤',
+        'mentor': 'Pop Icon Style',
+        'quote': "Don't just sing the song, perform it.",
+        'curriculum': [
+            ('Breath Control', 'Diaphragmatic support for long notes.'),
+            ('Belting & Mix', 'Hitting high notes without strain.'),
+            ('Riffs & Runs', 'Agility exercises for modern pop style.'),
+            ('Stage Presence', 'Mic technique and performance confidence.'),
+        ],
+    },
+    {
+        'slug': 'bollywood-sufi',
+        'title': 'Bollywood & Sufi',
+        'subtitle': 'Sing with Soul, Emotion & Texture',
+        'description': 'Bridging the gap between classical technique and commercial playback singing. Learn the "Harkat" and expressions that define Bollywood hits.',
+        'image': 'quizzes/images/bollywood_sufi_banner.png',
+        'color': 'red',
+        'icon': '🎵',
+        'mentor': 'Sufi Master Style',
+        'quote': "A voice that doesn't touch the heart is just noise.",
+        'curriculum': [
+            ('Playback Techniques', 'Singing for the microphone studio recording.'),
+            ('Urdu Pronunciation', 'Perfecting Talaffuz for Sufi Kalam.'),
+            ('Emotional Expression', 'Acting through your voice.'),
+            ('Versatility', 'Switching between romantic and upbeat tracks.'),
+        ],
+    },
+]
+
+
+def seed_categories(apps, schema_editor):
+    CourseCategory = apps.get_model('quizzes', 'CourseCategory')
+    CurriculumItem = apps.get_model('quizzes', 'CurriculumItem')
+    for data in CATEGORIES:
+        data = dict(data)
+        curriculum = data.pop('curriculum')
+        # curriculum_html is left empty; it is rendered on first lookup or next admin edit
+        category, created = CourseCategory.objects.get_or_create(slug=data['slug'], defaults=data)
+        if created:
+            CurriculumItem.objects.bulk_create([
+                CurriculumItem(category=category, title=title, description=desc, order=i)
+                for i, (title, desc) in enumerate(curriculum)
+            ])
+
+
+def unseed_categories(apps, schema_editor):
+    CourseCategory = apps.get_model('quizzes', 'CourseCategory')
+    CourseCategory.objects.filter(slug__in=[c['slug'] for c in CATEGORIES]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0014_coursecategory_curriculumitem'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_categories, unseed_categories),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0018_classreminder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('changes', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('dispatch_after', models.DateTimeField()),
+                ('dispatched_at', models.DateTimeField(blank=True, null=True)),
+                ('scheduled_class', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='change_events', to='quizzes.scheduledclass')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['dispatched_at', 'dispatch_after'], name='class_change_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0021_job_locks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledclass',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:28
+
+import quizzes.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0022_scheduledclass_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='coursecategory',
+            name='image',
+            field=models.CharField(help_text='Static path, e.g. quizzes/images/western_pop_banner.png', max_length=200, validators=[quizzes.models.validate_static_path]),
+        ),
+    ]
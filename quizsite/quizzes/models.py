@@ -1,5 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import ValidationError
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
@@ -63,13 +66,21 @@ class ScheduledClass(models.Model):
     
     # Link Class to Specific Packages (Empty = Available to All/Universal)
     packages = models.ManyToManyField(ClassPackage, blank=True, related_name="classes")
+    # Denormalized "packages is empty" flag, kept in sync by signals (see sync_universal_flags)
+    is_universal = models.BooleanField(default=True, editable=False)
     
     meeting_link = models.URLField(blank=True, null=True, help_text="Zoom/Meet link for the class")
     description = models.TextField(blank=True)
+    # Also touched when package links change (calendar feed ETags are built from it)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['start_time']
         verbose_name_plural = "Scheduled Classes"
+        indexes = [
+            models.Index(fields=['is_universal', 'start_time'], name='class_universal_start_idx'),
+            models.Index(fields=['start_time'], name='class_start_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.start_time.strftime('%b %d, %H:%M')})"
@@ -78,6 +89,80 @@ class ScheduledClass(models.Model):
     def is_upcoming(self):
         return self.start_time > timezone.now()
 
+    # Fields whose edits students are told about (packages is diffed via m2m_changed)
+    TRACKED_FIELDS = ('start_time', 'meeting_link')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember tracked values as loaded so a later save can be diffed without a query
+        instance._loaded_values = {name: getattr(instance, name) for name in cls.TRACKED_FIELDS if name in field_names}
+        return instance
+
+    @classmethod
+    def sync_universal_flags(cls, class_ids):
+        """
+        Recomputes is_universal for the given classes in one UPDATE.
+        """
+        links = cls.packages.through.objects.filter(scheduledclass_id=models.OuterRef('pk'))
+        cls.objects.filter(id__in=class_ids).update(is_universal=~models.Exists(links), updated_at=timezone.now())
+
+
+# -------------------------------------------------------------------
+#  🎼 Course Catalog (Category landing pages)
+# -------------------------------------------------------------------
+def validate_static_path(path):
+    """
+    Rejects static paths with no file behind them; with the manifest storage
+    {% static %} raises on those and the page would 500.
+    """
+    if not (finders.find(path) or staticfiles_storage.exists(path)):
+        raise ValidationError(f"No static file at '{path}'.")
+
+
+class CourseCategory(models.Model):
+    COLOR_CHOICES = [
+        ('amber', 'Amber'),
+        ('purple', 'Purple'),
+        ('red', 'Red'),
+    ]
+    slug = models.SlugField(unique=True)
+    title = models.CharField(max_length=100)  # e.g. "Indian Classical Vocals"
+    subtitle = models.CharField(max_length=200, blank=True)
+    description = models.TextField(blank=True)
+    image = models.CharField(
+        max_length=200, validators=[validate_static_path],
+        help_text="Static path, e.g. quizzes/images/western_pop_banner.png",
+    )
+    color = models.CharField(max_length=10, choices=COLOR_CHOICES, default='amber')
+    icon = models.CharField(max_length=10, blank=True, help_text="Emoji shown in the hero badge")
+    mentor = models.CharField(max_length=100, blank=True)
+    quote = models.CharField(max_length=255, blank=True)
+    is_active = models.BooleanField(default=True)
+
+    # Prerendered "What You'll Learn" block, refreshed by signals on every edit
+    curriculum_html = models.TextField(blank=True, editable=False)
+
+    class Meta:
+        ordering = ['title']
+        verbose_name_plural = "Course Categories"
+
+    def __str__(self):
+        return self.title
+
+
+class CurriculumItem(models.Model):
+    category = models.ForeignKey(CourseCategory, on_delete=models.CASCADE, related_name='curriculum_items')
+    title = models.CharField(max_length=100)  # e.g. "Swara & Shruti"
+    description = models.CharField(max_length=255, blank=True)
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['order', 'id']
+
+    def __str__(self):
+        return f"{self.category.title}: {self.title}"
+
 
 # -------------------------------------------------------------------
 #  💳 User Subscription & Payments
@@ -112,6 +197,124 @@ class PaymentHistory(models.Model):
     class Meta:
         ordering = ['-payment_date']
         verbose_name_plural = "Payment History"
+        indexes = [
+            models.Index(fields=['user', '-payment_date'], name='payment_user_date_idx'),
+            models.Index(fields=['status', 'payment_date'], name='payment_status_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.amount} ({self.status})"
+
+
+# -------------------------------------------------------------------
+#  📮 Notification Outbox (drained by `manage.py run_outbox_worker`)
+# -------------------------------------------------------------------
+class OutboxMessage(models.Model):
+    CHANNEL_CHOICES = [
+        ('email', 'Email'),
+        ('whatsapp', 'WhatsApp'),
+    ]
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENT', 'Sent'),
+        ('DEAD', 'Dead Letter'),
+    ]
+    channel = models.CharField(max_length=20, choices=CHANNEL_CHOICES)
+    payload = models.JSONField(help_text="Fully rendered message, ready to hand to the channel")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    # Next time a worker may claim the row; also pushed forward as a lease while sending
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='outbox_status_available_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} #{self.id} ({self.status})"
+
+
+# -------------------------------------------------------------------
+#  🪝 Razorpay Webhook Events (applied by `manage.py process_webhooks`)
+# -------------------------------------------------------------------
+class WebhookEvent(models.Model):
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('PROCESSED', 'Processed'),
+        ('IGNORED', 'Ignored'),
+    ]
+    event_id = models.CharField(max_length=100, unique=True)  # X-Razorpay-Event-Id; redeliveries reuse it
+    event = models.CharField(max_length=50)  # e.g. "payment.captured"
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='webhook_status_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event} ({self.event_id})"
+
+
+# -------------------------------------------------------------------
+#  ⏰ Class Reminders (dedup ledger for `manage.py send_class_reminders`)
+# -------------------------------------------------------------------
+class ClassReminder(models.Model):
+    scheduled_class = models.ForeignKey(ScheduledClass, on_delete=models.CASCADE, related_name='reminders')
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    window = models.CharField(max_length=10)  # e.g. "60m"; each window reminds at most once
+    # Shared by the rows of one insert, so a run can read back which ones it actually wrote
+    batch = models.UUIDField(null=True, blank=True, editable=False, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scheduled_class', 'window', 'user'], name='unique_class_reminder'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.scheduled_class.title} ({self.window})"
+
+
+# -------------------------------------------------------------------
+#  🔔 Class Change Events (coalesced; sent by `manage.py dispatch_class_changes`)
+# -------------------------------------------------------------------
+class ClassChangeEvent(models.Model):
+    scheduled_class = models.ForeignKey(ScheduledClass, on_delete=models.CASCADE, related_name='change_events')
+    # {"start_time": [old, new], "meeting_link": [old, new], "packages": [[old ids], [new ids]]}
+    changes = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Pushed forward by every further edit, so quick successive edits go out as one message
+    dispatch_after = models.DateTimeField()
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['dispatched_at', 'dispatch_after'], name='class_change_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.scheduled_class.title}: {', '.join(self.changes)}"
+
+
+# -------------------------------------------------------------------
+#  🔒 Job Locks (one run at a time across processes; see quizzes.locks)
+# -------------------------------------------------------------------
+class JobLock(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    owner = models.CharField(max_length=32, blank=True)  # Token of the current holder
+    # A lease rather than a flag, so a crashed run cannot hold the lock forever
+    locked_until = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} (until {self.locked_until})"
@@ -1,65 +1,64 @@
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+import logging
+
 from django.conf import settings
-from django.utils.html import strip_tags
+from django.utils import dateformat, timezone
+
+from .email_render import render_email
+from .outbox import enqueue_email, enqueue_whatsapp
+from . import whatsapp
+
+logger = logging.getLogger(__name__)
 
 def send_whatsapp_message(phone_number, message_text):
     """
-    Mock WhatsApp sender.
+    Sends one WhatsApp message right away through WHATSAPP_BACKEND.
+    Request code should queue with enqueue_whatsapp instead.
     """
-    print(f"\n==========================================")
-    print(f"📲 [WHATSAPP MOCK] To: {phone_number}")
-    print(f"📩 Message: {message_text}")
-    print(f"==========================================\n")
+    return whatsapp.send_messages([{'to': phone_number, 'text': message_text}])[0]
 
 def send_welcome_notification(user):
     """
-    Sends HTML Welcome Email and WhatsApp.
+    Queues HTML Welcome Email and WhatsApp in the outbox.
     """
     subject = "Welcome into the family of Recgetup Music! 🎤"
     
-    # Render HTML content
-    context = {
-        'user': user,
-        'domain': '127.0.0.1:9999' # Hardcoded for local dev, usually passed dynamically
-    }
-    html_message = render_to_string('quizzes/emails/welcome_email.html', context)
-    plain_message = strip_tags(html_message)
+    # Compiled layout + per-recipient fields (see email_render)
+    plain_message, html_message = render_email(
+        'quizzes/emails/welcome_email',
+        shared={'domain': settings.SITE_DOMAIN},
+        values={'user.first_name': user.first_name},
+    )
     
-    try:
-        send_mail(subject, plain_message, settings.EMAIL_HOST_USER, [user.email], html_message=html_message)
-        print(f"✅ Welcome Email Sent to {user.email}")
-    except Exception as e:
-        print(f"❌ Welcome Email Failed: {e}")
+    enqueue_email(subject, plain_message, [user.email], html=html_message)
 
     # WhatsApp
     if hasattr(user, 'profile') and user.profile.phone_number:
         wa_msg = f"Welcome {user.first_name}! 🎤 Thanks for joining Recgetup Music. Check your dashboard for upcoming classes."
-        send_whatsapp_message(user.profile.phone_number, wa_msg)
+        enqueue_whatsapp(user.profile.phone_number, wa_msg)
+    logger.info("Queued welcome notification", extra={'user_id': user.id})
 
 def send_payment_success_notification(user, package_name, amount, transaction_id):
     """
-    Sends HTML Receipt and WhatsApp.
+    Queues HTML Receipt and WhatsApp in the outbox.
     """
     subject = f"Payment Receipt: {package_name} ✅"
     
-    context = {
-        'user': user,
-        'package_name': package_name,
-        'amount': amount,
-        'transaction_id': transaction_id,
-        'domain': '127.0.0.1:9999'
-    }
-    html_message = render_to_string('quizzes/emails/payment_email.html', context)
-    plain_message = strip_tags(html_message)
+    plain_message, html_message = render_email(
+        'quizzes/emails/payment_email',
+        shared={'domain': settings.SITE_DOMAIN},
+        values={
+            'user.first_name': user.first_name,
+            'package_name': package_name,
+            'amount': amount,
+            'transaction_id': transaction_id,
+            'payment_date': dateformat.format(timezone.now(), 'jS F Y'),
+        },
+    )
     
-    try:
-        send_mail(subject, plain_message, settings.EMAIL_HOST_USER, [user.email], html_message=html_message)
-        print(f"✅ Payment Email Sent to {user.email}")
-    except Exception as e:
-        print(f"❌ Payment Email Failed: {e}")
+    enqueue_email(subject, plain_message, [user.email], html=html_message)
 
     # WhatsApp
     if hasattr(user, 'profile') and user.profile.phone_number:
         wa_msg = f"✅ Payment Received: ₹{amount} for {package_name}. Transaction ID: {transaction_id}"
-        send_whatsapp_message(user.profile.phone_number, wa_msg)
+        enqueue_whatsapp(user.profile.phone_number, wa_msg)
+    logger.info("Queued payment receipt", extra={'user_id': user.id, 'transaction_id': transaction_id})
@@ -0,0 +1,177 @@
+import logging
+import random
+from itertools import groupby
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .mailer import MailDispatcher, build_message
+from .models import OutboxMessage
+from . import whatsapp
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------------------
+#  📝 Enqueueing (call inside the same transaction as the business change)
+# -------------------------------------------------------------------
+def build_email(subject, body, to, html=None, from_email=None):
+    """
+    Unsaved email message, for bulk_create by broadcasters.
+    """
+    return OutboxMessage(channel='email', payload={
+        'subject': subject,
+        'body': body,
+        'html': html,
+        'from_email': from_email or settings.EMAIL_HOST_USER,
+        'to': list(to),
+    })
+
+
+def build_whatsapp(phone_number, text):
+    return OutboxMessage(channel='whatsapp', payload={'to': phone_number, 'text': text})
+
+
+def enqueue_email(subject, body, to, html=None, from_email=None):
+    message = build_email(subject, body, to, html=html, from_email=from_email)
+    message.save()
+    return message
+
+
+def enqueue_whatsapp(phone_number, text):
+    message = build_whatsapp(phone_number, text)
+    message.save()
+    return message
+
+
+# -------------------------------------------------------------------
+#  📤 Channel Senders
+# -------------------------------------------------------------------
+# Each sender takes a list of messages and returns {message_id: error or None}.
+# Senders run on worker threads and must not touch the database.
+def send_email_batch(messages):
+    emails = [
+        build_message(m.payload['subject'], m.payload['body'], m.payload['to'], html=m.payload.get('html'), from_email=m.payload['from_email'])
+        for m in messages
+    ]
+    # One pooled SMTP session for the whole chunk instead of a handshake per mail
+    with MailDispatcher() as dispatcher:
+        errors = dispatcher.send(emails)
+    return {message.id: error for message, error in zip(messages, errors)}
+
+
+def send_whatsapp_batch(messages):
+    # The configured backend sends the whole chunk at once (the HTTP one concurrently)
+    errors = whatsapp.send_messages([message.payload for message in messages])
+    return {message.id: error for message, error in zip(messages, errors)}
+
+
+SENDERS = {
+    'email': send_email_batch,
+    'whatsapp': send_whatsapp_batch,
+}
+
+
+# -------------------------------------------------------------------
+#  ⚙️ Worker Internals
+# -------------------------------------------------------------------
+def retry_delay(attempts):
+    """
+    Exponential backoff with full jitter, capped at OUTBOX_RETRY_MAX_SECONDS.
+    """
+    cap = min(settings.OUTBOX_RETRY_MAX_SECONDS, settings.OUTBOX_RETRY_BASE_SECONDS * (2 ** (attempts - 1)))
+    return random.uniform(cap / 2, cap)
+
+
+def claim_batch(limit):
+    """
+    Leases up to `limit` due messages to this worker. Rows are skipped by other
+    workers until the lease expires, so a crashed worker's rows come back.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboxMessage.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='PENDING', available_at__lte=now)
+            .order_by('id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        lease_until = now + timezone.timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+        OutboxMessage.objects.filter(id__in=ids).update(available_at=lease_until, attempts=F('attempts') + 1)
+    return list(OutboxMessage.objects.filter(id__in=ids).order_by('channel', 'id'))
+
+
+def _chunks(messages, size):
+    for start in range(0, len(messages), size):
+        yield messages[start:start + size]
+
+
+def _record_results(messages, results):
+    now = timezone.now()
+    by_id = {message.id: message for message in messages}
+    sent_ids = [message_id for message_id, error in results.items() if error is None]
+    if sent_ids:
+        OutboxMessage.objects.filter(id__in=sent_ids).update(status='SENT', sent_at=now, last_error='')
+
+    failed = []
+    for message_id, error in results.items():
+        if error is None:
+            continue
+        message = by_id[message_id]
+        message.last_error = error
+        if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            message.status = 'DEAD'
+        else:
+            message.available_at = now + timezone.timedelta(seconds=retry_delay(message.attempts))
+        failed.append(message)
+    if failed:
+        OutboxMessage.objects.bulk_update(failed, ['status', 'available_at', 'last_error'])
+
+    # One line per message: sampled via LOG_SAMPLE_RATES when volume is high
+    for message_id in sent_ids:
+        logger.info("Outbox message sent", extra={'message_id': message_id, 'channel': by_id[message_id].channel})
+    for message in failed:
+        log = logger.error if message.status == 'DEAD' else logger.warning
+        log(
+            "Outbox message %s", 'dead' if message.status == 'DEAD' else 'failed, will retry',
+            extra={'message_id': message.id, 'channel': message.channel, 'attempts': message.attempts, 'error': message.last_error},
+        )
+
+    return len(sent_ids), sum(1 for m in failed if m.status == 'DEAD'), sum(1 for m in failed if m.status != 'DEAD')
+
+
+def process_batch(executor, limit=None):
+    """
+    Claims one batch, fans it out per channel across the thread pool and
+    records the outcome. Returns (sent, dead, retrying) counts.
+    """
+    messages = claim_batch(limit or settings.OUTBOX_BATCH_SIZE)
+    if not messages:
+        return 0, 0, 0
+
+    futures = []
+    for channel, group in groupby(messages, key=lambda m: m.channel):
+        sender = SENDERS.get(channel)
+        group = list(group)
+        if sender is None:
+            futures.append((group, None))
+            continue
+        for chunk in _chunks(group, settings.OUTBOX_CHANNEL_BATCH):
+            futures.append((chunk, executor.submit(sender, chunk)))
+
+    results = {}
+    for chunk, future in futures:
+        try:
+            if future is None:
+                raise LookupError(f"No sender for channel '{chunk[0].channel}'")
+            results.update(future.result())
+        except Exception as e:
+            # A sender blew up as a whole: every message in its chunk failed
+            results.update({message.id: repr(e) for message in chunk})
+
+    return _record_results(messages, results)
@@ -0,0 +1,82 @@
+import os
+import re
+import time
+import uuid
+
+from django.conf import settings
+
+# Profiles live in PROFILE_DIR/<url name>/<timestamp>-<id>.prof (pstats format,
+# open with `python -m pstats` or snakeviz). Only the newest PROFILE_KEEP_PER_URL
+# files are kept per URL name.
+# No leading dot, so '.', '..' and hidden files are never valid names
+_SAFE_NAME = re.compile(r'^\w[\w.-]*$')
+
+
+def url_key(view_name):
+    # 'admin:quizzes_paymenthistory_changelist' -> 'admin.quizzes_paymenthistory_changelist'
+    return re.sub(r'[^\w.-]', '.', view_name or 'unresolved')
+
+
+def profile_path(key, filename):
+    """
+    Absolute path of a stored profile, or None for names that could escape PROFILE_DIR.
+    """
+    if not (_SAFE_NAME.match(key) and _SAFE_NAME.match(filename) and filename.endswith('.prof')):
+        return None
+    root = os.path.realpath(settings.PROFILE_DIR)
+    path = os.path.realpath(os.path.join(root, key, filename))
+    if os.path.dirname(os.path.dirname(path)) != root:
+        return None  # e.g. a symlinked directory pointing elsewhere
+    return path
+
+
+def save_profile(profiler, view_name):
+    """
+    Dumps `profiler` stats for this URL name, prunes old ones and returns (key, filename).
+    """
+    key = url_key(view_name)
+    directory = os.path.join(settings.PROFILE_DIR, key)
+    os.makedirs(directory, exist_ok=True)
+    now = time.time()
+    filename = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}.{int(now * 1e6) % 1000000:06d}-{uuid.uuid4().hex[:6]}.prof"
+    profiler.dump_stats(os.path.join(directory, filename))
+
+    for stale in _stored(directory)[settings.PROFILE_KEEP_PER_URL:]:
+        try:
+            os.remove(os.path.join(directory, stale))
+        except FileNotFoundError:
+            pass  # Pruned by another worker
+    return key, filename
+
+
+def _stored(directory):
+    # Newest first; names start with a sortable timestamp
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith('.prof')]
+    except FileNotFoundError:
+        return []
+    return sorted(names, reverse=True)
+
+
+def list_profiles():
+    """
+    {url key: [{'file', 'bytes', 'created'}...]} newest first.
+    """
+    try:
+        keys = sorted(os.listdir(settings.PROFILE_DIR))
+    except FileNotFoundError:
+        return {}
+    profiles = {}
+    for key in keys:
+        directory = os.path.join(settings.PROFILE_DIR, key)
+        if not os.path.isdir(directory):
+            continue
+        entries = []
+        for name in _stored(directory):
+            try:
+                stat = os.stat(os.path.join(directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append({'file': name, 'bytes': stat.st_size, 'created': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(stat.st_mtime))})
+        profiles[key] = entries
+    return profiles
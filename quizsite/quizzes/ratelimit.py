@@ -0,0 +1,21 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Spaces calls at least 1/rate seconds apart across all threads.
+    A rate of 0 disables the limit.
+    """
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
@@ -0,0 +1,139 @@
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.contrib.auth.models import User
+
+from .models import Profile, ClassPackage, CourseCategory, CurriculumItem, ScheduledClass, UserSubscription
+from . import entitlements
+from .class_changes import class_package_ids, diff_tracked_fields, record_change
+from .caching import purge_page_cache, bump_user_fragments
+from .catalog import bump_catalog_version, refresh_curriculum_html
+
+
+# -------------------------------------------------------------------
+#  🎟️ Entitlement Cache Invalidation
+# -------------------------------------------------------------------
+@receiver(post_save, sender=UserSubscription)
+@receiver(post_delete, sender=UserSubscription)
+def invalidate_subscription_entitlement(sender, instance, **kwargs):
+    entitlements.invalidate_user(instance.user_id)
+
+@receiver(post_save, sender=ScheduledClass)
+@receiver(post_delete, sender=ScheduledClass)
+def invalidate_class_entitlements(sender, instance, **kwargs):
+    entitlements.invalidate_all()
+
+@receiver(post_delete, sender=ClassPackage)
+def invalidate_package_entitlements(sender, instance, **kwargs):
+    # Subscriptions lose their package through SET_NULL, which sends no signal
+    entitlements.invalidate_all()
+
+@receiver(m2m_changed, sender=ScheduledClass.packages.through)
+def invalidate_class_package_entitlements(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        entitlements.invalidate_all()
+
+
+# -------------------------------------------------------------------
+#  🌐 ScheduledClass.is_universal Sync
+# -------------------------------------------------------------------
+@receiver(m2m_changed, sender=ScheduledClass.packages.through)
+def sync_class_universal_flag(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # pk_set is not provided for clear(); remember the classes before the links go
+        instance._cleared_class_ids = list(instance.classes.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        class_ids = [instance.pk]
+    elif action == 'post_clear':
+        class_ids = getattr(instance, '_cleared_class_ids', [])
+    else:
+        class_ids = pk_set or []
+    ScheduledClass.sync_universal_flags(class_ids)
+
+    if not reverse:
+        instance.is_universal = not instance.packages.exists()
+
+@receiver(pre_delete, sender=ClassPackage)
+def remember_package_classes(sender, instance, **kwargs):
+    # Deleting a package drops its M2M rows without an m2m_changed signal
+    instance._linked_class_ids = list(instance.classes.values_list('id', flat=True))
+
+@receiver(post_delete, sender=ClassPackage)
+def sync_package_class_flags(sender, instance, **kwargs):
+    ScheduledClass.sync_universal_flags(getattr(instance, '_linked_class_ids', []))
+
+
+# -------------------------------------------------------------------
+#  🔔 Class Change Capture (start_time / meeting_link / packages)
+# -------------------------------------------------------------------
+@receiver(post_save, sender=ScheduledClass)
+def capture_class_changes(sender, instance, created, **kwargs):
+    if not created:
+        record_change(instance.pk, diff_tracked_fields(instance))
+    # The saved values are the baseline for the next save of this instance
+    instance._loaded_values = {name: getattr(instance, name) for name in ScheduledClass.TRACKED_FIELDS}
+    # Packages attached right after creation (e.g. the admin add form) are not a change
+    instance._just_created = created
+
+@receiver(m2m_changed, sender=ScheduledClass.packages.through)
+def capture_class_package_changes(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse and getattr(instance, '_just_created', False):
+        return
+    if action in ('pre_add', 'pre_remove', 'pre_clear'):
+        if not reverse:
+            class_ids = [instance.pk]
+        elif action == 'pre_clear':
+            class_ids = list(instance.classes.values_list('id', flat=True))
+        else:
+            class_ids = list(pk_set or [])
+        instance._packages_before = class_package_ids(class_ids)
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    before = getattr(instance, '_packages_before', {})
+    after = class_package_ids(list(before))
+    for class_id, old in before.items():
+        record_change(class_id, {'packages': [old, after[class_id]]})
+
+
+# -------------------------------------------------------------------
+#  📄 Anonymous Page Cache Purge
+# -------------------------------------------------------------------
+@receiver(post_save, sender=ClassPackage)
+@receiver(post_delete, sender=ClassPackage)
+def purge_package_pages(sender, instance, **kwargs):
+    purge_page_cache()
+
+
+# -------------------------------------------------------------------
+#  🎼 Course Catalog Refresh
+# -------------------------------------------------------------------
+@receiver(post_save, sender=CourseCategory)
+@receiver(post_save, sender=CurriculumItem)
+@receiver(post_delete, sender=CurriculumItem)
+def refresh_course_category(sender, instance, **kwargs):
+    category_id = instance.pk if sender is CourseCategory else instance.category_id
+    refresh_curriculum_html(category_id)
+    bump_catalog_version()
+    purge_page_cache()
+
+@receiver(post_delete, sender=CourseCategory)
+def drop_course_category(sender, instance, **kwargs):
+    bump_catalog_version()
+    purge_page_cache()
+
+
+# -------------------------------------------------------------------
+#  🧩 Per-User Template Fragments (nav shows name & profile picture)
+# -------------------------------------------------------------------
+@receiver(post_save, sender=User)
+def bump_user_nav_fragments(sender, instance, **kwargs):
+    bump_user_fragments(instance.pk)
+
+@receiver(post_save, sender=Profile)
+def bump_profile_nav_fragments(sender, instance, **kwargs):
+    bump_user_fragments(instance.user_id)
@@ -1,6 +1,14 @@
 from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+import functools
 import hashlib
 
+from quizzes.caching import fragment_cache_key
+
 register = template.Library()
 
 @register.filter
@@ -39,3 +47,61 @@ def category_color(value):
     # Pick a color based on the hash
     index = hash_int % len(colors)
     return colors[index]
+
+
+# -------------------------------------------------------------------
+#  🧩 {% fragment_cache "name" [per_user] %} ... {% endfragment_cache %}
+# -------------------------------------------------------------------
+class FragmentCacheNode(template.Node):
+    def __init__(self, nodelist, name, per_user):
+        self.nodelist = nodelist
+        self.name = name
+        self.per_user = per_user
+
+    def render(self, context):
+        if self.per_user and not settings.CACHE_SHARED:
+            # User/Profile saves bump the stamp in one worker's cache only; the rest would show stale names
+            return self.nodelist.render(context)
+        key = fragment_cache_key(self.name, context.get('user'), self.per_user)
+        content = cache.get(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, settings.FRAGMENT_CACHE_TIMEOUT)
+        return content
+
+
+@register.tag
+def fragment_cache(parser, token):
+    """
+    Caches the enclosed block under a key built by caching.fragment_cache_key,
+    so every template varies on user state and deploy version the same way.
+    """
+    bits = token.split_contents()
+    if len(bits) not in (2, 3) or (len(bits) == 3 and bits[2] != 'per_user'):
+        raise template.TemplateSyntaxError(f"Usage: {{% {bits[0]} \"name\" [per_user] %}}")
+    name = bits[1]
+    if name[0] not in ('"', "'") or name[-1] != name[0]:
+        raise template.TemplateSyntaxError(f"{bits[0]} name must be a quoted string")
+
+    nodelist = parser.parse(('endfragment_cache',))
+    parser.delete_first_token()
+    return FragmentCacheNode(nodelist, name[1:-1], len(bits) == 3)
+
+
+# -------------------------------------------------------------------
+#  🎨 {% tailwind_stylesheet %}
+# -------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
+def _tailwind_bundle_built():
+    return finders.find(settings.TAILWIND_CSS) is not None
+
+
+@register.simple_tag
+def tailwind_stylesheet():
+    """
+    Links the prebuilt Tailwind bundle (see `manage.py build_css`), or the
+    in-browser CDN compiler when the bundle has not been built yet.
+    """
+    if _tailwind_bundle_built():
+        return format_html('<link rel="stylesheet" href="{}">', static(settings.TAILWIND_CSS))
+    return format_html('<script src="https://cdn.tailwindcss.com"></script>')
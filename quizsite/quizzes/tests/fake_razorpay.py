@@ -0,0 +1,123 @@
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeRazorpay:
+    """
+    Minimal local stand-in for the Razorpay orders API.
+
+        with FakeRazorpay() as fake:
+            with override_settings(RAZORPAY_BASE_URL=fake.url): ...
+
+    Failures and latency are scriptable: `fail_next(500, times=2)` answers the
+    next two requests with a server error, `delay` sleeps before every reply.
+    """
+    def __init__(self):
+        self.orders = {}
+        self.payments = {}
+        self.calls = []
+        self.delay = 0
+        self._failures = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Scripting -------------------------------------------------
+    def fail_next(self, status=500, times=1, code='SERVER_ERROR'):
+        with self._lock:
+            self._failures.extend([(status, code)] * times)
+
+    def add_order(self, order_id=None, status='created', amount=100, payments=()):
+        order_id = order_id or f'order_fake{next(self._ids)}'
+        self.orders[order_id] = {'id': order_id, 'entity': 'order', 'amount': amount, 'currency': 'INR', 'status': status}
+        self.payments[order_id] = list(payments)
+        return self.orders[order_id]
+
+    def count(self, method, prefix='/v1/orders'):
+        return sum(1 for m, path in self.calls if m == method and path.startswith(prefix))
+
+    # --- HTTP --------------------------------------------------------
+    def _next_failure(self):
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self, method):
+                length = int(self.headers.get('Content-Length') or 0)
+                data = json.loads(self.rfile.read(length) or b'{}') if length else {}
+                path = self.path.split('?')[0].rstrip('/')
+                fake.calls.append((method, path))
+
+                if fake.delay:
+                    time.sleep(fake.delay)
+
+                failure = fake._next_failure()
+                if failure:
+                    status, code = failure
+                    return self._reply(status, {'error': {'code': code, 'description': 'Scripted failure'}})
+
+                parts = path.strip('/').split('/')  # ['v1', 'orders', <id>, 'payments']
+                if parts[:2] != ['v1', 'orders']:
+                    return self._reply(404, {'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'Not found'}})
+
+                if method == 'POST' and len(parts) == 2:
+                    order = fake.add_order(amount=data.get('amount', 0))
+                    order.update(currency=data.get('currency', 'INR'), notes=data.get('notes', {}))
+                    return self._reply(200, order)
+
+                order_id = parts[2] if len(parts) > 2 else None
+                if method == 'GET' and order_id in fake.orders:
+                    if len(parts) == 4 and parts[3] == 'payments':
+                        items = fake.payments.get(order_id, [])
+                        return self._reply(200, {'entity': 'collection', 'count': len(items), 'items': items})
+                    return self._reply(200, fake.orders[order_id])
+
+                return self._reply(400, {'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'The id provided does not exist'}})
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_POST(self):
+                self._handle('POST')
+
+        return Handler
@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeWhatsApp:
+    """
+    Local stand-in for the WhatsApp Cloud API messages endpoint.
+
+        with FakeWhatsApp() as fake:
+            with override_settings(WHATSAPP_API_URL=fake.url): ...
+
+    `fail_next(429, times=2)` scripts error answers, `delay` adds latency and
+    `max_in_flight` records the highest number of concurrent requests seen.
+    """
+    def __init__(self):
+        self.messages = []
+        self.requests = 0
+        self.delay = 0
+        self.retry_after = '0'  # Sent with scripted 429s
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}/v19.0/123/messages'
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def fail_next(self, status=500, times=1):
+        with self._lock:
+            self._failures.extend([status] * times)
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload, headers=()):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                data = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                with fake._lock:
+                    fake.requests += 1
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                    failure = fake._failures.pop(0) if fake._failures else None
+                try:
+                    if fake.delay:
+                        time.sleep(fake.delay)
+                    if failure:
+                        headers = [('Retry-After', fake.retry_after)] if failure == 429 else []
+                        return self._reply(failure, {'error': {'message': 'Scripted failure', 'code': failure}}, headers)
+                    if self.headers.get('Authorization') != 'Bearer test-token' or data.get('messaging_product') != 'whatsapp':
+                        return self._reply(401, {'error': {'message': 'Invalid OAuth access token'}})
+                    with fake._lock:
+                        fake.messages.append({'to': data['to'], 'text': data['text']['body']})
+                        message_id = f'wamid.{len(fake.messages)}'
+                    return self._reply(200, {'messaging_product': 'whatsapp', 'messages': [{'id': message_id}]})
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+        return Handler
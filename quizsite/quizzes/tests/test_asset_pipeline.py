@@ -0,0 +1,28 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.template import Context, Template
+
+from quizzes.templatetags import quiz_extras
+
+
+class TailwindStylesheetTagTest(TestCase):
+    def setUp(self):
+        quiz_extras._tailwind_bundle_built.cache_clear()
+
+    def tearDown(self):
+        quiz_extras._tailwind_bundle_built.cache_clear()
+
+    def render(self):
+        return Template('{% load quiz_extras %}{% tailwind_stylesheet %}').render(Context())
+
+    def test_falls_back_to_cdn_without_bundle(self):
+        with mock.patch.object(quiz_extras.finders, 'find', return_value=None):
+            self.assertIn('cdn.tailwindcss.com', self.render())
+
+    @override_settings(STATIC_URL='/static/')
+    def test_links_built_bundle(self):
+        with mock.patch.object(quiz_extras.finders, 'find', return_value='/tmp/app.css'):
+            html = self.render()
+        self.assertIn('<link rel="stylesheet" href="/static/quizzes/css/app.css">', html)
+        self.assertNotIn('cdn.tailwindcss.com', html)
@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.urls import reverse
+
+from quizzes.models import CourseCategory, CurriculumItem
+from quizzes import catalog
+from quizzes.catalog import CATALOG_VERSION_KEY, bump_catalog_version, get_category
+
+
+class CourseCatalogTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = CourseCategory.objects.create(
+            slug='carnatic', title='Carnatic Vocals', image='quizzes/images/indian_classical_banner.png'
+        )
+        CurriculumItem.objects.create(category=self.category, title='Sarali Varisai', order=1)
+
+    def test_curriculum_is_prerendered_on_save(self):
+        self.category.refresh_from_db()
+        self.assertIn('Sarali Varisai', self.category.curriculum_html)
+
+    def test_lookup_is_served_from_lru(self):
+        get_category('carnatic')
+        with self.assertNumQueries(0):
+            context = get_category('carnatic')
+        self.assertEqual(context['title'], 'Carnatic Vocals')
+
+    def test_lost_version_stamp_never_revives_old_entries(self):
+        cache.delete(CATALOG_VERSION_KEY)
+        get_category('carnatic')
+        CourseCategory.objects.filter(pk=self.category.pk).update(title='Carnatic Masterclass')
+        bump_catalog_version()
+        self.assertEqual(get_category('carnatic')['title'], 'Carnatic Masterclass')
+
+        # The stamp is culled / the cache restarts: the first entry must not come back
+        cache.delete(CATALOG_VERSION_KEY)
+        self.assertEqual(get_category('carnatic')['title'], 'Carnatic Masterclass')
+
+    def test_edits_invalidate_lookup_and_page(self):
+        self.assertContains(self.client.get(reverse('category_detail', args=['carnatic'])), 'Sarali Varisai')
+        CurriculumItem.objects.create(category=self.category, title='Janta Varisai', order=2)
+        self.assertIn('Janta Varisai', get_category('carnatic')['curriculum_html'])
+        self.assertContains(self.client.get(reverse('category_detail', args=['carnatic'])), 'Janta Varisai')
+
+    def test_image_must_exist_in_static_files(self):
+        self.category.full_clean()
+        self.category.image = 'quizzes/images/typo_banner.png'
+        with self.assertRaises(ValidationError) as caught:
+            self.category.full_clean()
+        self.assertIn('image', caught.exception.message_dict)
+
+    def test_image_missing_from_manifest_falls_back(self):
+        def manifest_static(path):
+            if path != catalog.FALLBACK_IMAGE:
+                raise ValueError(f"Missing staticfiles manifest entry for '{path}'")
+            return f'/static/{path}'
+
+        CourseCategory.objects.filter(pk=self.category.pk).update(image='quizzes/images/typo_banner.png')
+        bump_catalog_version()
+        with mock.patch.object(catalog, 'static', manifest_static), self.assertLogs('quizzes.catalog', 'WARNING'):
+            response = self.client.get(reverse('category_detail', args=['carnatic']))
+        self.assertContains(response, f'src="/static/{catalog.FALLBACK_IMAGE}"')
+
+    def test_unknown_slug_redirects_home(self):
+        response = self.client.get(reverse('category_detail', args=['missing']))
+        self.assertRedirects(response, reverse('home'))
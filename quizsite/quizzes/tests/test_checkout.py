@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from quizzes import checkout, gateway, locks
+from quizzes.models import ClassPackage, JobLock, PaymentHistory
+from quizzes.tests.fake_razorpay import FakeRazorpay
+
+
+class CheckoutOrderReuseTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.fake = FakeRazorpay().start()
+        self.addCleanup(self.fake.stop)
+        overrides = override_settings(
+            RAZORPAY_KEY_ID='rzp_test', RAZORPAY_KEY_SECRET='secret', RAZORPAY_BASE_URL=self.fake.url,
+            PAYMENT_ORDER_RATE_LIMIT=3,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        gateway.reset_client()
+        self.addCleanup(gateway.reset_client)
+
+        self.user = User.objects.create(username='buyer')
+        self.client.force_login(self.user)
+        self.package = ClassPackage.objects.create(name='Gold', price=499)
+        self.url = reverse('payment_initiate', args=[self.package.id])
+
+    def test_refresh_reuses_pending_order(self):
+        first = self.client.get(self.url).context['order']
+        second = self.client.get(self.url).context['order']
+
+        self.assertEqual(first['id'], second['id'])
+        self.assertEqual(second['amount'], 49900)
+        self.assertEqual(self.fake.count('POST'), 1)
+        self.assertEqual(PaymentHistory.objects.filter(user=self.user).count(), 1)
+
+    def test_price_change_creates_new_order(self):
+        first = self.client.get(self.url).context['order']
+        self.package.price = 599
+        self.package.save()
+        second = self.client.get(self.url).context['order']
+
+        self.assertNotEqual(first['id'], second['id'])
+        self.assertEqual(second['amount'], 59900)
+
+    def test_stale_pending_order_is_not_reused(self):
+        self.client.get(self.url)
+        PaymentHistory.objects.update(payment_date=timezone.now() - timezone.timedelta(hours=2))
+        self.client.get(self.url)
+        self.assertEqual(self.fake.count('POST'), 2)
+
+    def test_new_orders_are_rate_limited(self):
+        PaymentHistory.objects.bulk_create([
+            PaymentHistory(user=self.user, package=self.package, amount=1, transaction_id=f'order_old{i}', status='FAILED')
+            for i in range(3)
+        ])
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('packages'), fetch_redirect_response=False)
+        self.assertEqual(self.fake.count('POST'), 0)
+
+    def test_concurrent_checkout_reuses_the_order_it_waited_for(self):
+        attempts = []
+        acquire = locks.acquire
+
+        def held_by_other_worker(name, timeout):
+            attempts.append(name)
+            if len(attempts) == 1:
+                return None
+            # By the retry the other request has saved its order and released the lease
+            PaymentHistory.objects.create(
+                user=self.user, package=self.package, amount=self.package.price,
+                transaction_id='order_other', status='PENDING',
+            )
+            return acquire(name, timeout)
+
+        with mock.patch.object(checkout.locks, 'acquire', side_effect=held_by_other_worker):
+            order = self.client.get(self.url).context['order']
+        self.assertEqual(order['id'], 'order_other')
+        self.assertEqual(attempts, [f'checkout:{self.user.pk}'] * 2)
+        self.assertEqual(self.fake.count('POST'), 0)
+
+    @override_settings(PAYMENT_ORDER_LOCK_WAIT=0)
+    def test_checkout_gives_up_while_lock_is_held(self):
+        locks.acquire(f'checkout:{self.user.pk}', 60)
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('packages'), fetch_redirect_response=False)
+        self.assertEqual(self.fake.count('POST'), 0)
+
+    def test_gateway_is_called_under_the_checkout_lease(self):
+        create_order = gateway.create_order
+        held = []
+
+        def call_gateway(data):
+            held.append(JobLock.objects.get(name=f'checkout:{self.user.pk}').locked_until > timezone.now())
+            return create_order(data)
+
+        with mock.patch.object(checkout.gateway, 'create_order', side_effect=call_gateway):
+            self.client.get(self.url)
+        self.assertEqual(held, [True])
+        # Released once the order is saved, so the next checkout need not wait
+        self.assertLessEqual(JobLock.objects.get(name=f'checkout:{self.user.pk}').locked_until, timezone.now())
@@ -0,0 +1,40 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from quizzes.models import ClassPackage, ScheduledClass
+
+
+class UniversalFlagSyncTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.gold = ClassPackage.objects.create(name='Gold', price=999)
+        self.silver = ClassPackage.objects.create(name='Silver', price=499)
+        self.cls = ScheduledClass.objects.create(
+            title='Riyaz', start_time=now + timezone.timedelta(days=1), end_time=now + timezone.timedelta(days=1, hours=1)
+        )
+
+    def flag(self):
+        return ScheduledClass.objects.values_list('is_universal', flat=True).get(pk=self.cls.pk)
+
+    def test_new_class_is_universal(self):
+        self.assertTrue(self.flag())
+
+    def test_forward_add_remove_and_clear(self):
+        self.cls.packages.add(self.gold, self.silver)
+        self.assertFalse(self.flag())
+        self.assertFalse(self.cls.is_universal)
+        self.cls.packages.remove(self.gold)
+        self.assertFalse(self.flag())
+        self.cls.packages.clear()
+        self.assertTrue(self.flag())
+
+    def test_reverse_add_and_clear(self):
+        self.gold.classes.add(self.cls)
+        self.assertFalse(self.flag())
+        self.gold.classes.clear()
+        self.assertTrue(self.flag())
+
+    def test_deleting_last_package_makes_class_universal(self):
+        self.cls.packages.add(self.gold)
+        self.gold.delete()
+        self.assertTrue(self.flag())
@@ -0,0 +1,107 @@
+from io import StringIO
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+
+from quizzes.class_changes import dispatch_due
+from quizzes.models import ClassChangeEvent, ClassPackage, OutboxMessage, ScheduledClass, UserSubscription
+
+
+@override_settings(CLASS_CHANGE_COALESCE_SECONDS=120)
+class ClassChangeTest(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.gold = ClassPackage.objects.create(name='Gold', price=999)
+        self.silver = ClassPackage.objects.create(name='Silver', price=499)
+
+        def make_class(title, package=None):
+            cls = ScheduledClass.objects.create(
+                title=title, start_time=self.now + timezone.timedelta(days=1),
+                end_time=self.now + timezone.timedelta(days=1, hours=1), meeting_link='https://meet.example.com/a',
+            )
+            if package:
+                cls.packages.add(package)
+            return cls
+
+        self.gold_class = make_class('Gold Masterclass', self.gold)
+        self.gold_lab = make_class('Gold Lab', self.gold)
+        self.silver_class = make_class('Silver Basics', self.silver)
+
+        def subscriber(name, package, days=30, phone=None):
+            user = User.objects.create(username=name, first_name=name.title(), email=f'{name}@example.com')
+            if phone:
+                user.profile.phone_number = phone
+                user.profile.save()
+            UserSubscription.objects.create(user=user, package=package, is_active=True, end_date=self.now + timezone.timedelta(days=days))
+            return user
+
+        self.gold_user = subscriber('goldie', self.gold, phone='9999999999')
+        subscriber('silvie', self.silver)
+        subscriber('lapsed', self.gold, days=-1)
+
+    def reschedule(self, cls, hours):
+        cls = ScheduledClass.objects.get(pk=cls.pk)
+        cls.start_time = cls.start_time + timezone.timedelta(hours=hours)
+        cls.save()
+        return cls
+
+    def dispatch(self):
+        return dispatch_due(timezone.now() + timezone.timedelta(minutes=5))
+
+    def test_burst_of_edits_coalesces_into_one_event(self):
+        original = self.gold_class.start_time
+        cls = self.reschedule(self.gold_class, 1)
+        cls.start_time += timezone.timedelta(hours=1)
+        cls.meeting_link = 'https://meet.example.com/b'
+        cls.save()
+
+        event = ClassChangeEvent.objects.get()
+        self.assertEqual(event.changes['start_time'], [original.isoformat(), cls.start_time.isoformat()])
+        self.assertIn('meeting_link', event.changes)
+
+    def test_untracked_edits_and_reverts_leave_nothing_to_send(self):
+        cls = ScheduledClass.objects.get(pk=self.gold_class.pk)
+        cls.title = 'Renamed'
+        cls.save()
+        self.assertFalse(ClassChangeEvent.objects.exists())
+
+        cls = self.reschedule(self.gold_class, 2)
+        self.reschedule(cls, -2)
+        self.assertFalse(ClassChangeEvent.objects.exists())
+
+    def test_nothing_is_sent_inside_the_coalescing_window(self):
+        self.reschedule(self.gold_class, 1)
+        self.assertEqual(dispatch_due(), (0, 0))
+
+    def test_bulk_reschedule_sends_one_message_per_subscriber(self):
+        for cls in (self.gold_class, self.gold_lab, self.silver_class):
+            self.reschedule(cls, 3)
+
+        self.assertEqual(self.dispatch(), (3, 3))  # goldie: email + whatsapp, silvie: email
+        emails = {m.payload['to'][0]: m.payload for m in OutboxMessage.objects.filter(channel='email')}
+        self.assertEqual(set(emails), {'goldie@example.com', 'silvie@example.com'})
+        self.assertIn('2 of your classes changed', emails['goldie@example.com']['subject'])
+        self.assertIn('Hi Goldie,', emails['goldie@example.com']['body'])
+        self.assertIn('Gold Lab', emails['goldie@example.com']['body'])
+        self.assertNotIn('Silver Basics', emails['goldie@example.com']['body'])
+        self.assertIn('Silver Basics', emails['silvie@example.com']['subject'])
+
+        self.assertEqual(self.dispatch(), (0, 0))
+
+    def test_package_change_reaches_old_and_new_audience(self):
+        ScheduledClass.objects.get(pk=self.silver_class.pk).packages.set([self.gold])
+
+        event = ClassChangeEvent.objects.get()
+        self.assertEqual(event.changes['packages'], [[self.silver.id], [self.gold.id]])
+        self.dispatch()
+        recipients = {m.payload['to'][0] for m in OutboxMessage.objects.filter(channel='email')}
+        self.assertEqual(recipients, {'goldie@example.com', 'silvie@example.com'})
+
+    def test_command_dispatches_due_events(self):
+        self.reschedule(self.gold_class, 1)
+        ClassChangeEvent.objects.update(dispatch_after=self.now)
+        out = StringIO()
+        call_command('dispatch_class_changes', '--once', stdout=out)
+        self.assertIn('Dispatched 1 class changes as 2 messages.', out.getvalue())
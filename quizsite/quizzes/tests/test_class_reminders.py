@@ -0,0 +1,100 @@
+from io import StringIO
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from quizzes import locks
+from quizzes.management.commands import send_class_reminders
+from quizzes.models import ClassPackage, ClassReminder, OutboxMessage, ScheduledClass, UserSubscription
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', MAIL_RATE_LIMIT=0)
+class SendClassRemindersTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.gold = ClassPackage.objects.create(name='Gold', price=999)
+        silver = ClassPackage.objects.create(name='Silver', price=499)
+
+        def make_class(title, minutes, package=None):
+            cls = ScheduledClass.objects.create(
+                title=title, start_time=now + timezone.timedelta(minutes=minutes),
+                end_time=now + timezone.timedelta(minutes=minutes + 60),
+            )
+            if package:
+                cls.packages.add(package)
+            return cls
+
+        self.open_class = make_class('Open Warmup', 30)
+        self.gold_class = make_class('Gold Masterclass', 45, self.gold)
+        make_class('Later Class', 600)
+
+        def subscriber(name, package, days=30, phone=None):
+            user = User.objects.create(username=name, first_name=name.title(), email=f'{name}@example.com')
+            if phone:
+                user.profile.phone_number = phone
+                user.profile.save()
+            UserSubscription.objects.create(user=user, package=package, is_active=True, end_date=now + timezone.timedelta(days=days))
+            return user
+
+        self.gold_user = subscriber('goldie', self.gold, phone='9999999999')
+        self.silver_user = subscriber('silvie', silver)
+        subscriber('lapsed', self.gold, days=-1)
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('send_class_reminders', '--window=60', *args, stdout=out)
+        return out.getvalue()
+
+    def test_reminds_every_entitled_subscriber_once(self):
+        self.run_command()
+
+        reminded = set(ClassReminder.objects.values_list('scheduled_class__title', 'user__username'))
+        self.assertEqual(reminded, {
+            ('Open Warmup', 'goldie'), ('Open Warmup', 'silvie'), ('Gold Masterclass', 'goldie'),
+        })
+        self.assertEqual(OutboxMessage.objects.filter(channel='email').count(), 3)
+        self.assertEqual(OutboxMessage.objects.filter(channel='whatsapp').count(), 2)
+
+    def test_rerun_is_cheap_and_never_double_sends(self):
+        self.run_command()
+        with self.assertNumQueries(4):  # lock, classes in window, the dedup-aware UNION, unlock
+            output = self.run_command()
+        self.assertIn('Queued 0 messages', output)
+        self.assertEqual(OutboxMessage.objects.count(), 5)
+
+    def test_pair_reminded_by_a_concurrent_run_is_not_queued_again(self):
+        real = send_class_reminders.pending_reminders
+
+        def racing(classes, window, now):
+            pairs = real(classes, window, now)
+            # Another process writes this ledger row after we read the pending pairs
+            ClassReminder.objects.create(scheduled_class=self.gold_class, user=self.gold_user, window=window)
+            return pairs
+
+        with mock.patch.object(send_class_reminders, 'pending_reminders', racing):
+            output = self.run_command()
+        self.assertIn('Queued 3 messages', output)
+        self.assertEqual(ClassReminder.objects.filter(scheduled_class=self.gold_class).count(), 1)
+        self.assertFalse(any('Gold Masterclass' in str(m.payload) for m in OutboxMessage.objects.all()))
+
+    def test_overlapping_run_is_refused_until_lock_released(self):
+        token = locks.acquire('reminders:60m', 60)
+        with self.assertRaises(CommandError):
+            self.run_command()
+        self.assertFalse(OutboxMessage.objects.exists())
+
+        locks.release('reminders:60m', token)
+        self.run_command()
+        self.assertEqual(OutboxMessage.objects.count(), 5)
+
+    def test_deliver_sends_through_outbox(self):
+        self.run_command('--deliver', '--workers=2')
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboxMessage.objects.exclude(status='SENT').exists())
+        body = next(m for m in mail.outbox if m.to == ['goldie@example.com'] and 'Gold' in m.subject).body
+        self.assertIn('Hi Goldie,', body)
+        self.assertIn(f'/class/join/{self.gold_class.id}/', body)
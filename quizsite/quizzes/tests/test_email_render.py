@@ -0,0 +1,43 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.template.loader import render_to_string
+
+from quizzes import email_render
+from quizzes.email_render import get_skeleton, render_email
+
+
+class EmailRenderTest(SimpleTestCase):
+    def setUp(self):
+        email_render.clear_cache()
+
+    def test_matches_full_template_render(self):
+        values = {'user.first_name': 'Asha', 'package_name': 'Gold', 'amount': '499.00',
+                  'transaction_id': 'order_1', 'payment_date': '1st May 2026'}
+        text, html = render_email('quizzes/emails/payment_email', {'domain': 'example.com'}, values)
+
+        expected = render_to_string('quizzes/emails/payment_email.html', {
+            'domain': 'example.com', 'user': {'first_name': 'Asha'}, 'package_name': 'Gold',
+            'amount': '499.00', 'transaction_id': 'order_1', 'payment_date': '1st May 2026',
+        })
+        self.assertEqual(html, expected)
+        self.assertIn('Transaction ID: order_1', text)
+        self.assertNotIn('<', text)
+
+    def test_recipient_values_are_escaped_in_html_only(self):
+        text, html = render_email('quizzes/emails/welcome_email', {'domain': 'example.com'}, {'user.first_name': '<Tom & Jerry>'})
+        self.assertIn('Hi &lt;Tom &amp; Jerry&gt;,', html)
+        self.assertIn('Hi <Tom & Jerry>,', text)
+
+    def test_url_fields_are_substituted(self):
+        text, html = render_email('quizzes/acc_active_email', {'domain': 'example.com'},
+                                  {'user.first_name': 'A', 'uid': 'MTI', 'token': 'abc-123'})
+        self.assertIn('http://example.com/activate/MTI/abc-123/', text)
+        self.assertIn('/activate/MTI/abc-123/', html)
+
+    def test_layout_is_rendered_once(self):
+        with mock.patch.object(email_render, 'get_template', wraps=email_render.get_template) as loader:
+            for name in ('Asha', 'Ravi', 'Meera'):
+                render_email('quizzes/emails/welcome_email', {'domain': 'example.com'}, {'user.first_name': name})
+        self.assertEqual(loader.call_count, 2)  # .html + .txt, once
+        self.assertEqual(get_skeleton('quizzes/emails/welcome_email', {'domain': 'example.com'}, ('user.first_name',)).html_parts[1], 0)
@@ -0,0 +1,79 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+
+from quizzes.models import ClassPackage, ScheduledClass, UserSubscription
+from quizzes.entitlements import VERSION_KEY, get_entitlement, invalidate_all
+
+
+class EntitlementCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='student')
+        self.package = ClassPackage.objects.create(name='Gold', price=999)
+        now = timezone.now()
+        self.universal = ScheduledClass.objects.create(
+            title='Open Warmup', start_time=now + timezone.timedelta(days=1), end_time=now + timezone.timedelta(days=1, hours=1)
+        )
+        self.gold_class = ScheduledClass.objects.create(
+            title='Gold Masterclass', start_time=now + timezone.timedelta(days=2), end_time=now + timezone.timedelta(days=2, hours=1)
+        )
+        self.gold_class.packages.add(self.package)
+
+    def subscribe(self, days=30):
+        return UserSubscription.objects.create(
+            user=self.user, package=self.package, is_active=True,
+            end_date=timezone.now() + timezone.timedelta(days=days)
+        )
+
+    def test_guest_record_only_has_universal_classes(self):
+        entitlement = get_entitlement(self.user)
+        self.assertFalse(entitlement.is_active)
+        self.assertTrue(entitlement.can_join(self.universal))
+        self.assertFalse(entitlement.can_join(self.gold_class))
+
+    def test_record_is_served_from_cache(self):
+        self.subscribe()
+        get_entitlement(self.user)
+        with self.assertNumQueries(0):
+            entitlement = get_entitlement(self.user)
+        self.assertEqual(entitlement.package_id, self.package.id)
+        self.assertTrue(entitlement.can_join(self.gold_class))
+
+    def test_subscription_change_invalidates_record(self):
+        self.assertFalse(get_entitlement(self.user).is_active)
+        self.subscribe()
+        self.assertTrue(get_entitlement(self.user).is_active)
+
+    def test_package_link_change_invalidates_record(self):
+        self.subscribe()
+        self.assertTrue(get_entitlement(self.user).can_join(self.gold_class))
+        self.gold_class.packages.clear()
+        other = ClassPackage.objects.create(name='Silver', price=499)
+        self.gold_class.packages.add(other)
+        self.assertFalse(get_entitlement(self.user).can_join(self.gold_class))
+
+    def test_expired_subscription_is_not_active(self):
+        self.subscribe(days=-1)
+        entitlement = get_entitlement(self.user)
+        self.assertFalse(entitlement.is_active)
+        self.assertFalse(entitlement.can_join(self.gold_class))
+
+    @override_settings(CACHE_SHARED=False)
+    def test_per_process_cache_is_not_used(self):
+        self.subscribe()
+        get_entitlement(self.user)
+        with self.assertNumQueries(2):  # Subscription + visible classes, every time
+            self.assertTrue(get_entitlement(self.user).is_active)
+
+    def test_lost_version_stamp_never_revives_old_records(self):
+        cache.delete(VERSION_KEY)
+        self.assertFalse(get_entitlement(self.user).is_active)
+        invalidate_all()
+        self.subscribe()
+        self.assertTrue(get_entitlement(self.user).is_active)
+
+        # The stamp is culled / the cache restarts: the guest record must not come back
+        cache.delete(VERSION_KEY)
+        self.assertTrue(get_entitlement(self.user).is_active)
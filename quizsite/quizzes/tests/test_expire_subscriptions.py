@@ -0,0 +1,37 @@
+from io import StringIO
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+
+from quizzes.models import ClassPackage, UserSubscription
+
+
+class ExpireSubscriptionsCommandTest(TestCase):
+    def setUp(self):
+        package = ClassPackage.objects.create(name='Gold', price=999)
+        now = timezone.now()
+        for i in range(5):
+            user = User.objects.create(username=f'lapsed{i}')
+            UserSubscription.objects.create(user=user, package=package, is_active=True, end_date=now - timezone.timedelta(days=1))
+        self.current = UserSubscription.objects.create(
+            user=User.objects.create(username='current'), package=package, is_active=True,
+            end_date=now + timezone.timedelta(days=10)
+        )
+
+    def test_expires_lapsed_rows_in_chunks(self):
+        out = StringIO()
+        call_command('expire_subscriptions', chunk_size=2, stdout=out)
+
+        self.assertIn('Expired 5 subscriptions in 3 chunks', out.getvalue())
+        self.assertEqual(UserSubscription.objects.filter(is_active=True).count(), 1)
+        self.current.refresh_from_db()
+        self.assertTrue(self.current.is_active)
+
+    def test_dry_run_does_not_write(self):
+        out = StringIO()
+        call_command('expire_subscriptions', dry_run=True, stdout=out)
+
+        self.assertIn('5 subscriptions would be expired', out.getvalue())
+        self.assertEqual(UserSubscription.objects.filter(is_active=True).count(), 6)
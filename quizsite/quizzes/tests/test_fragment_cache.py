@@ -0,0 +1,62 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.template import Context, Template
+
+from quizzes.caching import bump_fragment_version, bump_user_fragments, fragment_cache_key
+
+
+class FragmentCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='student', first_name='Asha')
+        self.staff = User.objects.create(username='coach', is_staff=True)
+
+    def render(self, source, user, **extra):
+        template = Template('{% load quiz_extras %}' + source)
+        return template.render(Context({'user': user, **extra}))
+
+    def test_keys_vary_on_user_state(self):
+        keys = {
+            fragment_cache_key('nav', AnonymousUser()),
+            fragment_cache_key('nav', self.user),
+            fragment_cache_key('nav', self.staff),
+        }
+        self.assertEqual(len(keys), 3)
+        self.assertNotEqual(fragment_cache_key('nav', self.user, per_user=True),
+                            fragment_cache_key('nav', self.staff, per_user=True))
+
+    def test_block_is_cached_until_version_bump(self):
+        source = '{% fragment_cache "greeting" %}{{ word }}{% endfragment_cache %}'
+        self.assertEqual(self.render(source, self.user, word='first'), 'first')
+        self.assertEqual(self.render(source, self.user, word='second'), 'first')
+        bump_fragment_version()
+        self.assertEqual(self.render(source, self.user, word='third'), 'third')
+
+    def test_per_user_block_refreshes_on_user_save(self):
+        source = '{% fragment_cache "nav" per_user %}{{ user.first_name }}{% endfragment_cache %}'
+        self.assertEqual(self.render(source, self.user), 'Asha')
+        self.user.first_name = 'Ayesha'
+        self.user.save()
+        self.assertEqual(self.render(source, self.user), 'Ayesha')
+
+    def test_lost_user_stamp_never_revives_old_fragment(self):
+        source = '{% fragment_cache "nav" per_user %}{{ user.first_name }}{% endfragment_cache %}'
+        stamp = f'fragment:user:{self.user.pk}'
+        cache.delete(stamp)
+        self.assertEqual(self.render(source, self.user), 'Asha')
+        User.objects.filter(pk=self.user.pk).update(first_name='Ayesha')
+        self.user.first_name = 'Ayesha'
+        bump_user_fragments(self.user.pk)
+        self.assertEqual(self.render(source, self.user), 'Ayesha')
+
+        # The stamp is culled / the cache restarts: the first fragment must not come back
+        cache.delete(stamp)
+        self.assertEqual(self.render(source, self.user), 'Ayesha')
+
+    @override_settings(CACHE_SHARED=False)
+    def test_per_user_block_is_not_cached_per_process(self):
+        source = '{% fragment_cache "nav" per_user %}{{ user.first_name }}{% endfragment_cache %}'
+        self.assertEqual(self.render(source, self.user), 'Asha')
+        self.user.first_name = 'Ayesha'  # Saved by another worker: no bump reaches this one
+        self.assertEqual(self.render(source, self.user), 'Ayesha')
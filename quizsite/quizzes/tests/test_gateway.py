@@ -0,0 +1,92 @@
+import razorpay
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from quizzes import gateway
+from quizzes.tests.fake_razorpay import FakeRazorpay
+
+
+class GatewayClientTest(SimpleTestCase):
+    def setUp(self):
+        self.fake = FakeRazorpay().start()
+        self.addCleanup(self.fake.stop)
+        overrides = override_settings(
+            RAZORPAY_KEY_ID='rzp_test', RAZORPAY_KEY_SECRET='secret',
+            RAZORPAY_BASE_URL=self.fake.url,
+            RAZORPAY_RETRY_BASE_DELAY=0, RAZORPAY_MAX_RETRIES=2,
+            RAZORPAY_READ_TIMEOUT=0.5,
+            RAZORPAY_BREAKER_MIN_CALLS=3, RAZORPAY_BREAKER_THRESHOLD=0.5,
+            RAZORPAY_BREAKER_RESET_SECONDS=60,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        gateway.reset_client()
+        self.addCleanup(gateway.reset_client)
+
+    def test_create_order_reuses_one_client(self):
+        order = gateway.create_order({'amount': 49900, 'currency': 'INR'})
+        self.assertEqual(order['amount'], 49900)
+        gateway.create_order({'amount': 100, 'currency': 'INR'})
+        self.assertIs(gateway.get_client(), gateway.get_client())
+        self.assertEqual(self.fake.count('POST'), 2)
+
+    def test_idempotent_fetch_is_retried_on_server_error(self):
+        order = self.fake.add_order(status='paid')
+        self.fake.fail_next(500, times=2)
+        self.assertEqual(gateway.fetch_order(order['id'])['status'], 'paid')
+        self.assertEqual(self.fake.count('GET'), 3)
+
+    def test_create_order_is_never_retried(self):
+        self.fake.fail_next(500)
+        with self.assertRaises(razorpay.errors.ServerError):
+            gateway.create_order({'amount': 100, 'currency': 'INR'})
+        self.assertEqual(self.fake.count('POST'), 1)
+
+    def test_bad_request_is_not_retried(self):
+        with self.assertRaises(razorpay.errors.BadRequestError):
+            gateway.fetch_order('order_missing')
+        self.assertEqual(self.fake.count('GET'), 1)
+
+    def test_slow_gateway_hits_read_timeout(self):
+        self.fake.delay = 1
+        with override_settings(RAZORPAY_MAX_RETRIES=0):
+            with self.assertRaises(requests.exceptions.Timeout):
+                gateway.fetch_order('order_slow')
+
+    def test_breaker_opens_and_fails_fast(self):
+        self.fake.fail_next(500, times=3)
+        for _ in range(3):
+            with self.assertRaises(razorpay.errors.ServerError):
+                gateway.create_order({'amount': 100, 'currency': 'INR'})
+
+        with self.assertRaises(gateway.GatewayUnavailable):
+            gateway.create_order({'amount': 100, 'currency': 'INR'})
+        self.assertEqual(self.fake.count('POST'), 3)
+
+    def test_breaker_half_open_trial_closes_circuit(self):
+        breaker = gateway.get_breaker()
+        breaker.reset_timeout = 0
+        self.fake.fail_next(500, times=3)
+        for _ in range(3):
+            with self.assertRaises(razorpay.errors.ServerError):
+                gateway.create_order({'amount': 100, 'currency': 'INR'})
+        self.assertEqual(breaker.state, breaker.OPEN)
+
+        gateway.create_order({'amount': 100, 'currency': 'INR'})
+        self.assertEqual(breaker.state, breaker.CLOSED)
+
+    def test_breaker_half_open_trial_with_client_error_closes_circuit(self):
+        breaker = gateway.get_breaker()
+        breaker.reset_timeout = 0
+        self.fake.fail_next(500, times=3)
+        for _ in range(3):
+            with self.assertRaises(razorpay.errors.ServerError):
+                gateway.create_order({'amount': 100, 'currency': 'INR'})
+        self.assertEqual(breaker.state, breaker.OPEN)
+
+        # The trial gets a 400: Razorpay is up, so the circuit must not stay half-open
+        with self.assertRaises(razorpay.errors.BadRequestError):
+            gateway.fetch_order('order_missing')
+        self.assertEqual(breaker.state, breaker.CLOSED)
+        order = self.fake.add_order(status='paid')
+        self.assertEqual(gateway.fetch_order(order['id'])['status'], 'paid')
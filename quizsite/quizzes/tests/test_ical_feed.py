@@ -0,0 +1,58 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from quizzes.models import ScheduledClass
+from quizzes.ical import make_feed_token
+
+
+class CalendarFeedTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='student')
+        start = timezone.now() + timezone.timedelta(days=1)
+        ScheduledClass.objects.create(
+            title='Raag Yaman; Evening, Batch', start_time=start, end_time=start + timezone.timedelta(hours=1),
+            meeting_link='https://meet.example.com/x'
+        )
+        self.url = reverse('schedule_feed', args=[make_feed_token(self.user)])
+
+    def test_streams_calendar(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertIn('SUMMARY:Raag Yaman\; Evening\\, Batch\r\n', body)
+        self.assertIn('URL:http://testserver/class/join/', body)
+
+    def test_if_none_match_returns_304_without_streaming_classes(self):
+        etag = self.client.get(self.url)['ETag']
+        # The token's user lookup and the ETag aggregate; the entitlement is already cached
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_class_change_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        ScheduledClass.objects.get().save()
+        self.assertNotEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_etag_follows_database_not_local_cache(self):
+        etag = self.client.get(self.url)['ETag']
+        # Another worker: empty cache, same data, same ETag
+        cache.clear()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # A change this worker's cache never heard about (bulk_create skips the signals)
+        start = timezone.now() + timezone.timedelta(days=2)
+        ScheduledClass.objects.bulk_create([
+            ScheduledClass(title='Extra', start_time=start, end_time=start + timezone.timedelta(hours=1)),
+        ])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_tampered_token_is_rejected(self):
+        response = self.client.get(reverse('schedule_feed', args=[f'{self.user.pk}:forged']))
+        self.assertEqual(response.status_code, 404)
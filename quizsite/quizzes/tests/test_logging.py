@@ -0,0 +1,84 @@
+import json
+import logging
+import sys
+import threading
+from io import StringIO
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from quizzes import gateway
+from quizzes.log import JsonFormatter, QueueListenerHandler, SamplingFilter
+
+
+def make_record(name='quizzes.views', level=logging.INFO, msg='Payment %s', args=('ok',), **extra):
+    record = logging.makeLogRecord({'name': name, 'levelno': level, 'levelname': logging.getLevelName(level), 'msg': msg, 'args': args})
+    record.__dict__.update(extra)
+    return record
+
+
+class JsonFormatterTest(SimpleTestCase):
+    def test_message_and_extra_fields(self):
+        entry = json.loads(JsonFormatter().format(make_record(order_id='order_1')))
+        self.assertEqual(entry['message'], 'Payment ok')
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['logger'], 'quizzes.views')
+        self.assertEqual(entry['order_id'], 'order_1')
+        self.assertNotIn('args', entry)
+
+    def test_exception_is_included(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            record = make_record(level=logging.ERROR, exc_info=sys.exc_info())
+        self.assertIn('ValueError: boom', json.loads(JsonFormatter().format(record))['exc'])
+
+
+class SamplingFilterTest(SimpleTestCase):
+    def test_rates_apply_by_prefix_below_warning(self):
+        sampler = SamplingFilter({'quizzes.requests': 0, 'quizzes': 1})
+        self.assertFalse(sampler.filter(make_record('quizzes.requests')))
+        self.assertTrue(sampler.filter(make_record('quizzes.requests', logging.WARNING)))
+        self.assertTrue(sampler.filter(make_record('quizzes.outbox')))
+        self.assertTrue(sampler.filter(make_record('django.request')))
+
+
+class QueueListenerHandlerTest(SimpleTestCase):
+    def test_records_are_written_by_the_listener_thread(self):
+        handler = QueueListenerHandler()
+        handler.setFormatter(JsonFormatter())
+        stream = handler.target.stream = StringIO()
+        writers = []
+        emit = handler.target.emit
+        handler.target.emit = lambda record: (writers.append(threading.current_thread()), emit(record))
+
+        handler.handle(make_record(order_id='order_1'))
+        handler.close()
+
+        self.assertEqual(json.loads(stream.getvalue())['order_id'], 'order_1')
+        self.assertNotEqual(writers, [threading.current_thread()])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = QueueListenerHandler(maxsize=1)
+        handler.listener.stop()  # Nothing drains the queue
+        handler.listener = None
+        handler.handle(make_record())
+        handler.handle(make_record())
+        self.assertEqual(handler.dropped, 1)
+        handler.dropped = 0
+        handler.close()
+
+
+@override_settings(RAZORPAY_KEY_ID='rzp_test', RAZORPAY_KEY_SECRET='secret')
+class PaymentVerifyLoggingTest(TestCase):
+    def setUp(self):
+        gateway.reset_client()
+        self.addCleanup(gateway.reset_client)
+
+    def test_bad_signature_is_logged_not_printed(self):
+        with self.assertLogs('quizzes.views', 'INFO') as logs:
+            self.client.post(reverse('payment_verify'), {
+                'razorpay_order_id': 'order_9', 'razorpay_payment_id': 'pay_9', 'razorpay_signature': 'forged',
+            })
+        self.assertEqual([r.levelname for r in logs.records], ['INFO', 'WARNING'])
+        self.assertEqual(logs.records[1].order_id, 'order_9')
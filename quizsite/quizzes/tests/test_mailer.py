@@ -0,0 +1,77 @@
+import smtplib
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+
+from quizzes import mailer
+
+
+class CountingBackend(EmailBackend):
+    """
+    locmem backend that counts sessions and can drop the connection or
+    refuse a recipient, like a real SMTP server would.
+    """
+    opens = 0
+    drop_on_send = set()
+    refused = set()
+    sends = 0
+
+    def open(self):
+        CountingBackend.opens += 1
+        return True
+
+    def send_messages(self, messages):
+        CountingBackend.sends += 1
+        if CountingBackend.sends in CountingBackend.drop_on_send:
+            CountingBackend.drop_on_send.discard(CountingBackend.sends)
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        for message in messages:
+            if set(message.to) & CountingBackend.refused:
+                raise smtplib.SMTPRecipientsRefused({message.to[0]: (550, b'No such user')})
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='quizzes.tests.test_mailer.CountingBackend', EMAIL_HOST_USER='team@example.com',
+    MAIL_RATE_LIMIT=0, MAIL_MESSAGES_PER_CONNECTION=100,
+)
+class MailDispatcherTest(TestCase):
+    def setUp(self):
+        mailer.reset_limiter()
+        self.addCleanup(mailer.reset_limiter)
+        CountingBackend.opens = CountingBackend.sends = 0
+        CountingBackend.drop_on_send = set()
+        CountingBackend.refused = set()
+
+    def test_bulk_send_uses_one_session(self):
+        users = [User(username=f'fan{i}', first_name=f'Fan{i}', email=f'fan{i}@example.com') for i in range(50)]
+        sent, failed = mailer.send_bulk(users, 'Welcome!', 'quizzes/emails/welcome_email')
+
+        self.assertEqual((sent, failed), (50, 0))
+        self.assertEqual(CountingBackend.opens, 1)
+        self.assertEqual(len(mail.outbox), 50)
+        self.assertIn('Fan7', mail.outbox[7].alternatives[0][0])
+
+    def test_reconnects_after_dropped_session(self):
+        CountingBackend.drop_on_send = {3}
+        sent, failed = mailer.send_bulk([f'fan{i}@example.com' for i in range(5)], 'Hi', 'quizzes/emails/welcome_email')
+
+        self.assertEqual((sent, failed), (5, 0))
+        self.assertEqual(CountingBackend.opens, 2)
+
+    @override_settings(MAIL_MESSAGES_PER_CONNECTION=2)
+    def test_session_is_recycled(self):
+        mailer.send_bulk([f'fan{i}@example.com' for i in range(5)], 'Hi', 'quizzes/emails/welcome_email')
+        self.assertEqual(CountingBackend.opens, 3)
+
+    def test_refused_recipient_does_not_stop_batch(self):
+        CountingBackend.refused = {'fan1@example.com'}
+        with mailer.MailDispatcher() as dispatcher:
+            results = dispatcher.send([mailer.build_message('Hi', 'text', [f'fan{i}@example.com']) for i in range(3)])
+
+        self.assertIsNone(results[0])
+        self.assertIn('SMTPRecipientsRefused', results[1])
+        self.assertIsNone(results[2])
+        self.assertEqual(len(mail.outbox), 2)
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from quizzes import outbox
+from quizzes.models import OutboxMessage
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', EMAIL_HOST_USER='team@example.com')
+class OutboxTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='singer', email='singer@example.com', is_active=False)
+        self.user.profile.phone_number = '9999999999'
+        self.user.profile.save()
+
+    def activate(self):
+        uid = urlsafe_base64_encode(force_bytes(self.user.pk))
+        token = default_token_generator.make_token(self.user)
+        return self.client.get(reverse('activate', args=[uid, token]))
+
+    def test_activation_queues_instead_of_sending(self):
+        self.activate()
+        self.assertEqual(len(mail.outbox), 0)
+        channels = sorted(OutboxMessage.objects.values_list('channel', flat=True))
+        self.assertEqual(channels, ['email', 'whatsapp'])
+
+    def test_worker_delivers_and_marks_sent(self):
+        self.activate()
+        call_command('run_outbox_worker', '--once', '--threads=2', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['singer@example.com'])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        self.assertFalse(OutboxMessage.objects.exclude(status='SENT').exists())
+
+    def test_failures_back_off_then_dead_letter(self):
+        message = outbox.enqueue_whatsapp('123', 'hi')
+        failing = mock.Mock(side_effect=RuntimeError('provider down'))
+
+        with mock.patch.dict(outbox.SENDERS, {'whatsapp': failing}), override_settings(OUTBOX_MAX_ATTEMPTS=2):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                self.assertEqual(outbox.process_batch(executor), (0, 0, 1))
+                message.refresh_from_db()
+                self.assertEqual(message.attempts, 1)
+                self.assertGreater(message.available_at, timezone.now())
+                self.assertIn('provider down', message.last_error)
+
+                # Not due yet
+                self.assertEqual(outbox.process_batch(executor), (0, 0, 0))
+
+                OutboxMessage.objects.update(available_at=timezone.now())
+                self.assertEqual(outbox.process_batch(executor), (0, 1, 0))
+
+        message.refresh_from_db()
+        self.assertEqual(message.status, 'DEAD')
+
+    def test_claimed_rows_are_leased(self):
+        outbox.enqueue_whatsapp('123', 'hi')
+        self.assertEqual(len(outbox.claim_batch(10)), 1)
+        self.assertEqual(outbox.claim_batch(10), [])
@@ -0,0 +1,65 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+
+from quizzes.models import ClassPackage
+
+
+class AnonymousPageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.package = ClassPackage.objects.create(name='Gold', price=999)
+
+    def test_second_anonymous_hit_skips_the_database(self):
+        first = self.client.get(reverse('packages'))
+        self.assertContains(first, 'Gold')
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('packages'))
+        self.assertEqual(second.content, first.content)
+        self.assertIn('public', second['Cache-Control'])
+        self.assertIn('Cookie', second['Vary'])
+
+    def test_package_change_purges_cache(self):
+        self.client.get(reverse('packages'))
+        self.package.name = 'Platinum'
+        self.package.save()
+        self.assertContains(self.client.get(reverse('packages')), 'Platinum')
+
+    def test_signed_in_users_are_never_served_cached_pages(self):
+        self.client.get(reverse('home'))
+        user = User.objects.create(username='student')
+        self.client.force_login(user)
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Welcome Back')
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_ad_click_ids_share_one_entry(self):
+        first = self.client.get(reverse('packages') + '?utm_source=ads&gclid=abc123')
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('packages') + '?fbclid=xyz789&utm_campaign=spring')
+            plain = self.client.get(reverse('packages'))
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(plain.content, first.content)
+
+    def test_unknown_query_params_bypass_the_cache(self):
+        self.client.get(reverse('packages') + '?sort=price')
+        ClassPackage.objects.filter(pk=self.package.pk).update(name='Platinum')  # No purge
+        response = self.client.get(reverse('packages') + '?sort=price')
+        self.assertContains(response, 'Platinum')
+        self.assertIn('private', response['Cache-Control'])
+
+    @override_settings(PAGE_CACHE_QUERY_PARAMS=('page',))
+    def test_allowlisted_params_get_their_own_entry(self):
+        self.client.get(reverse('packages') + '?page=2')
+        ClassPackage.objects.filter(pk=self.package.pk).update(name='Platinum')  # No purge
+        self.assertContains(self.client.get(reverse('packages') + '?page=2&utm_source=ads'), 'Gold')
+        self.assertContains(self.client.get(reverse('packages') + '?page=3'), 'Platinum')
+
+    @override_settings(CACHE_SHARED=False)
+    def test_per_process_cache_is_not_used(self):
+        self.client.get(reverse('packages'))
+        ClassPackage.objects.filter(pk=self.package.pk).update(name='Platinum')  # No purge
+        response = self.client.get(reverse('packages'))
+        self.assertContains(response, 'Platinum')
+        self.assertIn('private', response['Cache-Control'])
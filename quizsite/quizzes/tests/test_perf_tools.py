@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from quizzes.models import ClassPackage, PaymentHistory, Profile, ScheduledClass, UserSubscription
+
+
+def seed(*args):
+    call_command(
+        'seed_perf_data', '--users=40', '--payments=300', '--classes=50', '--batch-size=64', *args,
+        stdout=StringIO(),
+    )
+
+
+class SeedPerfDataTest(TestCase):
+    def test_seeds_requested_volumes(self):
+        seed()
+
+        self.assertEqual(User.objects.filter(username__startswith='perf_').count(), 40)
+        self.assertEqual(Profile.objects.filter(user__username__startswith='perf_').count(), 40)
+        self.assertEqual(PaymentHistory.objects.count(), 300)
+        self.assertEqual(ScheduledClass.objects.count(), 50)
+        self.assertEqual(ClassPackage.objects.count(), 6)
+        self.assertEqual(UserSubscription.objects.count(), 24)
+
+        # Gated classes are linked to packages, and payments span a realistic date range
+        gated = ScheduledClass.objects.filter(is_universal=False)
+        self.assertFalse(gated.filter(packages__isnull=True).exists())
+        dates = PaymentHistory.objects.values_list('payment_date', flat=True)
+        self.assertGreater((max(dates) - min(dates)).days, 300)
+
+    def test_refuses_to_seed_twice_without_clear(self):
+        seed()
+        with self.assertRaises(CommandError):
+            seed()
+        seed('--clear')
+        self.assertEqual(User.objects.count(), 40)
+        self.assertEqual(PaymentHistory.objects.count(), 300)
+
+
+class BenchmarkViewsTest(TransactionTestCase):
+    # Workers run on their own threads and connections, so seeded rows must be committed
+    def test_reports_latency_throughput_and_queries(self):
+        seed()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.json')
+            out = StringIO()
+            call_command(
+                'benchmark_views', '--targets=packages,payment_history', '--requests=12', '--warmup=4',
+                '--concurrency=4', f'--output={path}', stdout=out, stderr=StringIO(),
+            )
+            with open(path, encoding='utf-8') as handle:
+                report = json.load(handle)
+
+        self.assertEqual(json.loads(out.getvalue()), report)
+        self.assertEqual(report['meta']['concurrency'], 4)
+        history = report['results']['payment_history']
+        self.assertEqual(history['requests'], 12)
+        self.assertEqual(history['errors'], 0)
+        self.assertGreater(history['rps'], 0)
+        self.assertLessEqual(history['latency_ms']['p50'], history['latency_ms']['p99'])
+        self.assertGreater(history['queries_per_request']['mean'], 0)
+        # Anonymous packages page is served from the page cache after warmup
+        self.assertEqual(report['results']['packages']['queries_per_request']['max'], 0)
+
+    def test_unknown_target_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_views', '--targets=nope', stdout=StringIO())
@@ -0,0 +1,89 @@
+import os
+import pstats
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+
+from quizzes.profiling import profile_path
+
+
+class ProfilingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        directory = os.path.join(self.root, 'profiles')
+        os.makedirs(directory)
+        overrides = override_settings(PROFILE_DIR=directory, PROFILE_KEEP_PER_URL=2)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.directory = directory
+        self.staff = User.objects.create(username='admin', is_staff=True, is_superuser=True)
+
+    def profile(self, url, **headers):
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_staff_request_is_profiled_and_downloadable(self):
+        self.client.force_login(self.staff)
+        response = self.profile(reverse('schedule') + '?_profile=1')
+
+        download = self.client.get(response['X-Profile-Url'])
+        self.assertEqual(download.status_code, 200)
+        self.assertIn('attachment', download['Content-Disposition'])
+        path = os.path.join(self.directory, 'bundle.prof')
+        with open(path, 'wb') as handle:
+            handle.write(b''.join(download.streaming_content))
+        functions = {name for _, _, name in pstats.Stats(path).stats}
+        self.assertIn('schedule_view', functions)
+
+    def test_header_flag_and_admin_changelist(self):
+        self.client.force_login(self.staff)
+        response = self.profile(reverse('admin:quizzes_paymenthistory_changelist'), HTTP_X_PROFILE='1')
+        self.assertIn('/admin.quizzes_paymenthistory_changelist/', response['X-Profile-Url'])
+
+    def test_only_the_newest_profiles_are_kept_per_url(self):
+        self.client.force_login(self.staff)
+        urls = [self.profile(reverse('packages') + '?_profile=1')['X-Profile-Url'] for _ in range(3)]
+        self.profile(reverse('schedule') + '?_profile=1')
+
+        listing = self.client.get(reverse('profile_list')).json()['profiles']
+        self.assertEqual([entry['url'] for entry in listing['packages']], urls[:0:-1])
+        self.assertEqual(len(listing['schedule']), 1)
+        self.assertEqual(self.client.get(urls[0]).status_code, 404)
+
+    def test_non_staff_flag_is_ignored(self):
+        user = User.objects.create(username='student')
+        self.client.force_login(user)
+        response = self.profile(reverse('schedule') + '?_profile=1')
+        self.assertNotIn('X-Profile-Url', response)
+        self.assertFalse(os.listdir(self.directory))
+        self.assertEqual(self.client.get(reverse('profile_list')).status_code, 302)
+
+    def test_download_rejects_path_tricks(self):
+        # A real file right outside PROFILE_DIR, so a 404 proves the check and not a missing file
+        with open(os.path.join(self.root, 'secret.prof'), 'wb') as handle:
+            handle.write(b'secret')
+        os.symlink(self.root, os.path.join(self.directory, 'escape'))
+
+        self.assertIsNone(profile_path('..', 'secret.prof'))
+        self.assertIsNone(profile_path('escape', 'secret.prof'))
+        self.client.force_login(self.staff)
+        with self.assertLogs('django.request', 'WARNING'):
+            for key in ('..', '.', 'escape'):
+                url = reverse('profile_download', args=[key, 'secret.prof'])
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_unwritable_profile_dir_still_serves_the_request(self):
+        blocker = os.path.join(self.root, 'not-a-directory')
+        open(blocker, 'w').close()
+        self.client.force_login(self.staff)
+        with override_settings(PROFILE_DIR=os.path.join(blocker, 'profiles')):
+            with self.assertLogs('quizzes.requests', 'ERROR'):
+                response = self.profile(reverse('schedule') + '?_profile=1')
+        self.assertNotIn('X-Profile-Url', response)
@@ -0,0 +1,110 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from quizzes.models import ClassPackage, PaymentHistory, ScheduledClass, UserSubscription
+
+
+class QueryBudgetTest(TestCase):
+    """
+    Hot views must issue a fixed number of queries however much data there is,
+    and read their main table through an index rather than a full scan.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        packages = ClassPackage.objects.bulk_create(
+            ClassPackage(name=f'Plan {i}', price=499 + i * 100, is_active=i % 4 != 0) for i in range(12)
+        )
+        classes = ScheduledClass.objects.bulk_create(
+            ScheduledClass(
+                title=f'Class {i}', is_universal=i % 3 == 0,
+                start_time=now + timezone.timedelta(hours=i - 100), end_time=now + timezone.timedelta(hours=i - 99),
+            )
+            for i in range(400)
+        )
+        links = ScheduledClass.packages.through
+        links.objects.bulk_create(
+            links(scheduledclass_id=c.id, classpackage_id=packages[c.id % len(packages)].id)
+            for c in classes if not c.is_universal
+        )
+
+        users = User.objects.bulk_create(User(username=f'student{i}', email=f's{i}@example.com') for i in range(60))
+        cls.user = users[0]
+        UserSubscription.objects.bulk_create(
+            UserSubscription(user=u, package=packages[i % len(packages)], is_active=i % 2 == 0, end_date=now + timezone.timedelta(days=30))
+            for i, u in enumerate(users)
+        )
+        PaymentHistory.objects.bulk_create(
+            PaymentHistory(
+                user=users[i % len(users)], package=packages[i % len(packages)], amount=999,
+                transaction_id=f'order_{i}', status=('SUCCESS', 'PENDING', 'FAILED')[i % 3],
+            )
+            for i in range(1200)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, name, login=True):
+        if login:
+            self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return ctx.captured_queries
+
+    def plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}')
+            return '\n'.join(' '.join(str(col) for col in row) for row in cursor.fetchall())
+
+    def assertUsesIndex(self, queries, table, index):
+        """
+        Every captured query that reads `table` must be planned through `index`.
+        """
+        reads = [q['sql'] for q in queries if f'FROM "{table}"' in q['sql'] or f'FROM `{table}`' in q['sql']]
+        self.assertTrue(reads, f"no query read {table}")
+        for sql in reads:
+            self.assertIn(index, self.plan(sql), sql)
+
+    def assertBudget(self, name, cold, warm, login=True):
+        """
+        Fixed query counts for a first (cold cache) and repeat request.
+        """
+        self.assertEqual(len(self.get(name, login)), cold, f"{name} cold")
+        queries = self.get(name, login)
+        self.assertEqual(len(queries), warm, f"{name} warm")
+        return queries
+
+    # Counts cover session + user lookups; a new query per row (N+1) breaks them
+    def test_home(self):
+        queries = self.assertBudget('home', cold=6, warm=4)
+        upcoming = [q for q in queries if 'quizzes_scheduledclass"."title"' in q['sql'] or 'quizzes_scheduledclass`.`title`' in q['sql']]
+        self.assertEqual(len(upcoming), 1)
+        self.assertIn('class_start_idx', self.plan(upcoming[0]['sql']))
+
+    def test_schedule_view(self):
+        queries = self.assertBudget('schedule', cold=6, warm=4)
+        self.assertUsesIndex(queries, 'quizzes_scheduledclass', 'class_start_idx')
+
+    def test_packages_view(self):
+        self.client.logout()
+        queries = self.get('packages', login=False)
+        self.assertEqual(len(queries), 1)
+        # The catalog is a handful of rows, so one plain read of it is the expected plan
+        self.assertNotIn('JOIN', queries[0]['sql'])
+        with self.assertNumQueries(0):  # served from the anonymous page cache
+            self.client.get(reverse('packages'))
+
+    def test_payment_history(self):
+        queries = self.assertBudget('payment_history', cold=4, warm=4)
+        self.assertUsesIndex(queries, 'quizzes_paymenthistory', 'payment_user_date_idx')
+
+    def test_stale_payment_scan_is_indexed(self):
+        stale = PaymentHistory.objects.filter(status='PENDING', payment_date__lt=timezone.now()).values_list('id', flat=True)
+        self.assertIn('payment_status_date_idx', stale.explain())
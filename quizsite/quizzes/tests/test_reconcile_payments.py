@@ -0,0 +1,71 @@
+from io import StringIO
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+
+from quizzes import gateway
+from quizzes.models import ClassPackage, PaymentHistory, UserSubscription
+from quizzes.tests.fake_razorpay import FakeRazorpay
+
+
+class ReconcilePaymentsTest(TestCase):
+    def setUp(self):
+        self.fake = FakeRazorpay().start()
+        self.addCleanup(self.fake.stop)
+        overrides = override_settings(
+            RAZORPAY_KEY_ID='rzp_test', RAZORPAY_KEY_SECRET='secret', RAZORPAY_BASE_URL=self.fake.url,
+            RAZORPAY_RETRY_BASE_DELAY=0,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        gateway.reset_client()
+        self.addCleanup(gateway.reset_client)
+
+        package = ClassPackage.objects.create(name='Gold', price=499)
+        for i, status in enumerate(['paid', 'created', 'paid', 'attempted']):
+            self.fake.add_order(f'order_{i}', status=status)
+            user = User.objects.create(username=f'buyer{i}')
+            PaymentHistory.objects.create(user=user, package=package, amount=499, transaction_id=f'order_{i}')
+        PaymentHistory.objects.create(user=user, package=package, amount=499, transaction_id='order_fresh')
+        PaymentHistory.objects.exclude(transaction_id='order_fresh').update(payment_date=timezone.now() - timezone.timedelta(hours=2))
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('reconcile_payments', '--rate=0', '--chunk-size=2', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def statuses(self):
+        return dict(PaymentHistory.objects.values_list('transaction_id', 'status'))
+
+    def test_paid_orders_are_activated(self):
+        output = self.run_command()
+        self.assertIn('Scanned 4: 2 paid, 0 failed, 2 still pending', output)
+        self.assertEqual(self.statuses(), {
+            'order_0': 'SUCCESS', 'order_1': 'PENDING', 'order_2': 'SUCCESS', 'order_3': 'PENDING', 'order_fresh': 'PENDING',
+        })
+        self.assertEqual(UserSubscription.objects.filter(is_active=True).count(), 2)
+
+    def test_unpaid_orders_fail_after_cutoff(self):
+        self.run_command('--fail-after=60')
+        self.assertEqual(self.statuses()['order_1'], 'FAILED')
+        self.assertEqual(self.statuses()['order_3'], 'FAILED')
+
+    def test_dry_run_writes_nothing(self):
+        output = self.run_command('--dry-run')
+        self.assertIn('[dry run] Scanned 4: 2 paid', output)
+        self.assertEqual(set(self.statuses().values()), {'PENDING'})
+
+    def test_resume_from_cursor(self):
+        second = PaymentHistory.objects.get(transaction_id='order_1')
+        self.run_command(f'--after-id={second.id}')
+        self.assertEqual(self.statuses()['order_0'], 'PENDING')
+        self.assertEqual(self.statuses()['order_2'], 'SUCCESS')
+        self.assertEqual(self.fake.count('GET'), 2)
+
+    def test_lookup_errors_are_counted_not_fatal(self):
+        del self.fake.orders['order_0']
+        output = self.run_command()
+        self.assertIn('1 paid', output)
+        self.assertIn('1 errors', output)
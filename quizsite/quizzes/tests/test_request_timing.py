@@ -0,0 +1,67 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+
+from quizzes import gateway
+from quizzes.metrics import reset_requests, slowest_requests
+from quizzes.models import ClassPackage
+from quizzes.tests.fake_razorpay import FakeRazorpay
+
+
+@override_settings(SERVER_TIMING_PUBLIC=True, REQUEST_SLOW_MS=10000, REQUEST_TIMING_SAMPLE_RATE=0)
+class RequestTimingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_requests()
+        self.user = User.objects.create(username='student')
+        self.client.force_login(self.user)
+
+    def test_server_timing_splits_sql_and_templates(self):
+        with self.assertLogs('quizzes.requests', 'INFO') as logs:
+            response = self.client.get(reverse('schedule'))
+
+        header = response['Server-Timing']
+        self.assertRegex(header, r'sql;dur=[\d.]+;desc="\d+x"')
+        self.assertIn('template;dur=', header)
+        self.assertIn('total;dur=', header)
+
+        timing = logs.records[0].timing
+        self.assertEqual(timing['view'], 'schedule')
+        self.assertEqual(timing['user_id'], self.user.id)
+        self.assertGreater(timing['sql_count'], 0)
+        self.assertEqual(timing['spans']['template']['count'], 1)
+
+    @override_settings(SERVER_TIMING_PUBLIC=False)
+    def test_header_is_staff_only_outside_development(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('schedule')))
+        self.user.is_staff = True
+        self.user.save()
+        self.assertIn('Server-Timing', self.client.get(reverse('schedule')))
+
+    def test_slow_requests_are_buffered_for_staff(self):
+        self.client.get(reverse('schedule'))
+        self.assertEqual(slowest_requests(), [])
+
+        with override_settings(REQUEST_SLOW_MS=0):
+            self.client.get(reverse('schedule'))
+            self.client.get(reverse('packages'))
+        self.assertEqual({entry['view'] for entry in slowest_requests()}, {'schedule', 'packages'})
+
+        self.assertEqual(self.client.get(reverse('request_metrics')).status_code, 302)
+        self.user.is_staff = True
+        self.user.save()
+        data = self.client.get(reverse('request_metrics')).json()
+        totals = [entry['total_ms'] for entry in data['requests']]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+
+    def test_outbound_gateway_time_is_attributed(self):
+        with FakeRazorpay() as fake, override_settings(
+            RAZORPAY_KEY_ID='rzp_test', RAZORPAY_KEY_SECRET='secret', RAZORPAY_BASE_URL=fake.url,
+        ):
+            gateway.reset_client()
+            self.addCleanup(gateway.reset_client)
+            package = ClassPackage.objects.create(name='Gold', price=499)
+            response = self.client.get(reverse('payment_initiate', args=[package.id]))
+
+        self.assertRegex(response['Server-Timing'], r'razorpay;dur=[\d.]+;desc="1x"')
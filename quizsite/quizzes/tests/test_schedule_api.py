@@ -0,0 +1,65 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from quizzes.models import ClassPackage, ScheduledClass, UserSubscription
+
+
+class ScheduleApiTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='student', password='pass12345')
+        self.client.force_login(self.user)
+        self.gold = ClassPackage.objects.create(name='Gold', price=999)
+        UserSubscription.objects.create(
+            user=self.user, package=self.gold, is_active=True, end_date=timezone.now() + timezone.timedelta(days=30)
+        )
+        base = timezone.now() + timezone.timedelta(days=1)
+        self.classes = []
+        for i in range(5):
+            # Two classes share each start time so the id tie-breaker is exercised
+            start = base + timezone.timedelta(hours=i // 2)
+            cls = ScheduledClass.objects.create(
+                title=f'Class {i}', start_time=start, end_time=start + timezone.timedelta(hours=1),
+                instructor='Jamal' if i % 2 else 'Najish', meeting_link='https://meet.example.com/x'
+            )
+            self.classes.append(cls)
+        self.classes[4].packages.add(self.gold)
+        silver_only = ScheduledClass.objects.create(
+            title='Silver Only', start_time=base, end_time=base + timezone.timedelta(hours=1)
+        )
+        silver_only.packages.add(ClassPackage.objects.create(name='Silver', price=499))
+
+    def fetch(self, **params):
+        response = self.client.get(reverse('schedule_api'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_walks_all_entitled_classes_by_cursor(self):
+        seen = []
+        params = {'limit': 2}
+        while True:
+            data = self.fetch(**params)
+            seen += [row['id'] for row in data['results']]
+            if not data['next_cursor']:
+                break
+            params['cursor'] = data['next_cursor']
+        self.assertEqual(seen, [c.id for c in self.classes])
+
+    def test_filters(self):
+        data = self.fetch(instructor='Jamal')
+        self.assertEqual([row['id'] for row in data['results']], [self.classes[1].id, self.classes[3].id])
+        data = self.fetch(package=self.gold.id)
+        self.assertEqual([row['id'] for row in data['results']], [self.classes[4].id])
+
+    def test_bad_cursor_is_rejected(self):
+        response = self.client.get(reverse('schedule_api'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_schedule_page_renders_first_page(self):
+        response = self.client.get(reverse('schedule'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['classes']), 5)
+        self.assertIsNone(response.context['next_cursor'])
@@ -0,0 +1,33 @@
+from io import StringIO
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+
+from quizzes.metrics import reset_timings
+
+
+class TemplateMetricsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_timings()
+
+    def test_renders_are_counted_per_template(self):
+        self.client.get(reverse('packages'))
+        staff = User.objects.create(username='admin', is_staff=True)
+        self.client.force_login(staff)
+
+        data = self.client.get(reverse('template_metrics')).json()['templates']
+        self.assertEqual(data['quizzes/packages.html']['count'], 1)
+        self.assertGreaterEqual(data['quizzes/packages.html']['max_ms'], 0)
+
+    def test_metrics_are_staff_only(self):
+        self.client.force_login(User.objects.create(username='student'))
+        self.assertEqual(self.client.get(reverse('template_metrics')).status_code, 302)
+
+    def test_warm_templates_compiles_app_templates(self):
+        out = StringIO()
+        call_command('warm_templates', stdout=out, stderr=StringIO())
+        self.assertIn('Compiled', out.getvalue())
@@ -0,0 +1,90 @@
+import hashlib
+import hmac
+import json
+from io import StringIO
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+
+from quizzes import gateway
+from quizzes.models import ClassPackage, OutboxMessage, PaymentHistory, UserSubscription, WebhookEvent
+
+SECRET = 'whsec_test'
+
+
+@override_settings(RAZORPAY_KEY_ID='rzp_test', RAZORPAY_KEY_SECRET='secret', RAZORPAY_WEBHOOK_SECRET=SECRET)
+class RazorpayWebhookTest(TestCase):
+    def setUp(self):
+        gateway.reset_client()
+        self.addCleanup(gateway.reset_client)
+        self.package = ClassPackage.objects.create(name='Gold', price=499, duration_months=1)
+        self.users = [User.objects.create(username=f'buyer{i}', email=f'buyer{i}@example.com') for i in range(3)]
+        self.payments = [
+            PaymentHistory.objects.create(user=user, package=self.package, amount=499, transaction_id=f'order_{i}')
+            for i, user in enumerate(self.users)
+        ]
+
+    def post(self, event, order_id, event_id, signature=None):
+        body = json.dumps({
+            'event': event,
+            'payload': {'payment': {'entity': {'id': f'pay_{event_id}', 'order_id': order_id}}},
+        })
+        signature = signature or hmac.new(SECRET.encode(), body.encode(), hashlib.sha256).hexdigest()
+        return self.client.post(
+            reverse('razorpay_webhook'), body, content_type='application/json',
+            HTTP_X_RAZORPAY_SIGNATURE=signature, HTTP_X_RAZORPAY_EVENT_ID=event_id,
+        )
+
+    def test_rejects_bad_signature(self):
+        response = self.post('payment.captured', 'order_0', 'evt_1', signature='forged')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_endpoint_only_persists_and_dedupes(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.post('payment.captured', 'order_0', 'evt_1').status_code, 200)
+        self.assertEqual(self.post('payment.captured', 'order_0', 'evt_1').status_code, 200)
+
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+        self.assertEqual(PaymentHistory.objects.get(transaction_id='order_0').status, 'PENDING')
+
+    def test_processor_applies_events_in_one_batch(self):
+        self.post('payment.captured', 'order_0', 'evt_1')
+        self.post('order.paid', 'order_1', 'evt_2')
+        self.post('payment.failed', 'order_2', 'evt_3')
+        self.post('refund.created', 'order_0', 'evt_4')
+        UserSubscription.objects.create(user=self.users[1], package=None, end_date=self.payments[1].payment_date)
+
+        call_command('process_webhooks', '--once', stdout=StringIO())
+
+        statuses = dict(PaymentHistory.objects.values_list('transaction_id', 'status'))
+        self.assertEqual(statuses, {'order_0': 'SUCCESS', 'order_1': 'SUCCESS', 'order_2': 'FAILED'})
+        subs = UserSubscription.objects.filter(is_active=True, package=self.package)
+        self.assertEqual(set(subs.values_list('user_id', flat=True)), {self.users[0].id, self.users[1].id})
+        self.assertEqual(WebhookEvent.objects.filter(status='PENDING').count(), 0)
+        self.assertEqual(WebhookEvent.objects.get(event_id='evt_4').status, 'IGNORED')
+
+    def test_already_verified_payment_is_not_activated_twice(self):
+        self.payments[0].status = 'SUCCESS'
+        self.payments[0].save()
+        self.post('payment.captured', 'order_0', 'evt_1')
+
+        call_command('process_webhooks', '--once', stdout=StringIO())
+
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertFalse(UserSubscription.objects.exists())
+
+    def test_browser_callback_then_webhook_activates_once(self):
+        signature = hmac.new(b'secret', b'order_0|pay_1', hashlib.sha256).hexdigest()
+        self.client.post(reverse('payment_verify'), {
+            'razorpay_order_id': 'order_0', 'razorpay_payment_id': 'pay_1', 'razorpay_signature': signature,
+        })
+        self.assertEqual(PaymentHistory.objects.get(transaction_id='order_0').status, 'SUCCESS')
+        queued = OutboxMessage.objects.count()
+
+        self.post('payment.captured', 'order_0', 'evt_1')
+        call_command('process_webhooks', '--once', stdout=StringIO())
+        self.assertEqual(OutboxMessage.objects.count(), queued)
+        self.assertEqual(UserSubscription.objects.count(), 1)
@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import time
+from io import StringIO
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.core.management import call_command
+
+from quizzes import whatsapp
+from quizzes.models import OutboxMessage
+from quizzes.outbox import enqueue_whatsapp
+from quizzes.tests.fake_whatsapp import FakeWhatsApp
+
+
+class HttpBackendTest(SimpleTestCase):
+    def setUp(self):
+        self.fake = FakeWhatsApp().start()
+        self.addCleanup(self.fake.stop)
+        overrides = override_settings(
+            WHATSAPP_API_URL=self.fake.url, WHATSAPP_API_TOKEN='test-token',
+            WHATSAPP_CONCURRENCY=5, WHATSAPP_MAX_RETRIES=2, WHATSAPP_RETRY_BASE_DELAY=0,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.backend = whatsapp.HttpBackend()
+
+    def messages(self, count):
+        return [{'to': f'91999000{i:04d}', 'text': f'Reminder {i}'} for i in range(count)]
+
+    def test_batch_is_sent_concurrently_within_limit(self):
+        self.fake.delay = 0.2
+        started = time.monotonic()
+        results = self.backend.send_messages(self.messages(20))
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(results, [None] * 20)
+        self.assertEqual(len(self.fake.messages), 20)
+        self.assertLessEqual(self.fake.max_in_flight, 5)
+        self.assertGreater(self.fake.max_in_flight, 1)
+        self.assertLess(elapsed, 20 * 0.2)
+
+    def test_rate_limited_and_server_errors_are_retried(self):
+        self.fake.fail_next(429)
+        self.fake.fail_next(503)
+        self.assertEqual(self.backend.send_messages(self.messages(1)), [None])
+        self.assertEqual(self.fake.requests, 3)
+
+    def test_retry_after_is_a_floor_for_the_jittered_wait(self):
+        with override_settings(WHATSAPP_RETRY_BASE_DELAY=1):
+            for attempt in range(3):
+                self.assertGreaterEqual(whatsapp.HttpBackend.retry_wait(attempt, retry_after=5), 5)
+                self.assertLessEqual(whatsapp.HttpBackend.retry_wait(attempt, retry_after=5), 5 + 2 ** attempt)
+                self.assertLessEqual(whatsapp.HttpBackend.retry_wait(attempt), 2 ** attempt)
+
+    def test_long_retry_after_is_left_to_the_outbox(self):
+        self.fake.retry_after = '3600'
+        self.fake.fail_next(429)
+        started = time.monotonic()
+        results = self.backend.send_messages(self.messages(1))
+
+        self.assertIn('HTTP 429', results[0])
+        self.assertEqual(self.fake.requests, 1)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_client_errors_are_not_retried(self):
+        with override_settings(WHATSAPP_API_TOKEN='wrong'):
+            results = self.backend.send_messages(self.messages(1))
+        self.assertIn('HTTP 401', results[0])
+        self.assertEqual(self.fake.requests, 1)
+
+    def test_gives_up_after_max_retries(self):
+        self.fake.fail_next(500, times=3)
+        results = self.backend.send_messages(self.messages(1))
+        self.assertIn('HTTP 500', results[0])
+        self.assertEqual(self.fake.requests, 3)
+
+
+class LocalBackendsTest(SimpleTestCase):
+    def test_file_backend_appends_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'wa.log')
+            with override_settings(WHATSAPP_FILE_PATH=path):
+                whatsapp.FileBackend().send_messages([{'to': '1', 'text': 'hi'}, {'to': '2', 'text': 'hey'}])
+            with open(path, encoding='utf-8') as handle:
+                self.assertEqual([json.loads(line)['to'] for line in handle], ['1', '2'])
+
+    def test_console_backend_writes_stream(self):
+        stream = StringIO()
+        whatsapp.ConsoleBackend(stream).send_messages([{'to': '1', 'text': 'hi'}])
+        self.assertIn('To: 1', stream.getvalue())
+
+
+@override_settings(WHATSAPP_BACKEND='quizzes.whatsapp.LocmemBackend')
+class OutboxWhatsAppTest(TestCase):
+    def setUp(self):
+        whatsapp.outbox.clear()
+
+    def test_outbox_worker_uses_configured_backend(self):
+        enqueue_whatsapp('919999999999', 'Payment received')
+        call_command('run_outbox_worker', '--once', stdout=StringIO())
+
+        self.assertEqual(whatsapp.outbox, [{'to': '919999999999', 'text': 'Payment received'}])
+        self.assertEqual(OutboxMessage.objects.get().status, 'SENT')
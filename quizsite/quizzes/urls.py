@@ -13,12 +13,21 @@ urlpatterns = [
     
     # 📅 Singing Classes Layout
     path('schedule/', views.schedule_view, name='schedule'),
+    path('api/schedule/', views.schedule_api, name='schedule_api'),
+    path('schedule/feed/<str:token>.ics', views.schedule_feed, name='schedule_feed'),
     path('category/<slug:slug>/', views.category_detail, name='category_detail'),
     path('class/join/<int:class_id>/', views.join_class, name='join_class'),
     path('packages/', views.packages_view, name='packages'),
     path('payment/initiate/<int:package_id>/', views.payment_initiate, name='payment_initiate'),
     path('payment/verify/', views.payment_verify, name='payment_verify'),
     path('payment/history/', views.payment_history, name='payment_history'),
+    path('webhooks/razorpay/', views.razorpay_webhook, name='razorpay_webhook'),
+
+    # 📊 Ops
+    path('ops/metrics/templates/', views.template_metrics, name='template_metrics'),
+    path('ops/metrics/requests/', views.request_metrics, name='request_metrics'),
+    path('ops/profiles/', views.profile_list, name='profile_list'),
+    path('ops/profiles/<str:key>/<str:filename>', views.profile_download, name='profile_download'),
 
     # 🔐 Password Reset
     path('password-reset/', auth_views.PasswordResetView.as_view(
@@ -1,57 +1,63 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from django.utils import timezone
-from django.core.paginator import Paginator
+import datetime
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import FileResponse, HttpResponse, HttpResponseBadRequest, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse, HttpResponseNotModified, Http404
+from django.utils.http import parse_etags
+from django.utils.dateparse import parse_date, parse_datetime
 from django.views.decorators.csrf import csrf_exempt
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q
 
 # Import Updated Models
-from .models import ScheduledClass, ClassPackage, UserSubscription, PaymentHistory
+from .models import ScheduledClass, ClassPackage, PaymentHistory
 from .forms import UserRegistrationForm, UserLoginForm, EmailValidationPasswordResetForm, CustomSetPasswordForm, UserUpdateForm, ProfileUpdateForm
-from .notifications import send_welcome_notification, send_payment_success_notification
+from .notifications import send_welcome_notification
+from .outbox import enqueue_email
+from .email_render import render_email
+from .entitlements import get_entitlement
+from .caching import anonymous_page_cache
+from .catalog import get_category
+from .metrics import slowest_requests, timing_snapshot
+from .profiling import list_profiles, profile_path
+from . import checkout, gateway
+from .checkout import activate_payments
+from .webhooks import record_event
+from .ical import make_feed_token, read_feed_token, feed_etag, iter_calendar
 
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.sites.shortcuts import get_current_site
 from django.contrib.auth.models import User
 from django.contrib.auth import views as auth_views
-from django.utils.html import strip_tags
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views.decorators.clickjacking import xframe_options_sameorigin
+import logging
+
+logger = logging.getLogger(__name__)
 
 # 🏠 Home page (Public Access / Dashboard)
+@anonymous_page_cache
 def home(request):
     if request.user.is_authenticated:
         user = request.user
         
-        # 1. 💳 Active Subscription
-        active_sub = UserSubscription.objects.filter(user=user, is_active=True).first()
-        if active_sub and active_sub.is_expired:
-            active_sub.is_active = False
-            active_sub.save()
-            active_sub = None
+        # 1. 💳 Active Subscription (cached entitlement record)
+        # Read-only: lapsed rows are flipped by `manage.py expire_subscriptions`
+        entitlement = get_entitlement(user)
             
         # 2. 📅 Upcoming Classes (Filtered by Package)
-        # Default: Show only Universal classes (packages=None)
-        access_filter = Q(packages=None)
-        
-        # If user has an active package, include classes for that package
-        if active_sub and active_sub.package:
-            access_filter |= Q(packages=active_sub.package)
-            
-        upcoming_classes = ScheduledClass.objects.filter(access_filter, start_time__gte=timezone.now()).distinct().order_by('start_time')[:1]
+        # Universal classes (is_universal) plus the user's active package, if any
+        upcoming_classes = ScheduledClass.objects.filter(entitlement.access_filter(), start_time__gte=timezone.now()).order_by('start_time')[:1]
 
         context = {
             'upcoming_classes': upcoming_classes,
-            'active_sub': active_sub,
+            'active_sub': entitlement if entitlement.is_active else None,
         }
         return render(request, 'quizzes/home.html', context)
     
@@ -59,69 +65,163 @@ def home(request):
     return render(request, 'quizzes/home.html')
 
 # 📅 Schedule View
+SCHEDULE_PAGE_SIZE = 20
+SCHEDULE_MAX_PAGE_SIZE = 100
+
+
+def _encode_schedule_cursor(scheduled_class):
+    raw = f"{scheduled_class.start_time.isoformat()}|{scheduled_class.id}"
+    return urlsafe_base64_encode(force_bytes(raw))
+
+
+def _decode_schedule_cursor(cursor):
+    """
+    Returns (start_time, id) or raises ValueError for a malformed cursor.
+    """
+    try:
+        start_raw, id_raw = force_str(urlsafe_base64_decode(cursor)).split('|', 1)
+        start_time = parse_datetime(start_raw)
+        class_id = int(id_raw)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if start_time is None:
+        raise ValueError("Invalid cursor")
+    return start_time, class_id
+
+
+def _day_bound(day, end=False):
+    bound = datetime.datetime.combine(day, datetime.time.max if end else datetime.time.min)
+    if settings.USE_TZ:
+        bound = timezone.make_aware(bound)
+    return bound
+
+
+def _schedule_page(user, params, limit):
+    """
+    One keyset page of the user's entitled upcoming classes, ordered by (start_time, id).
+    Returns (classes, next_cursor). Raises ValueError on bad filters.
+    """
+    classes = ScheduledClass.objects.filter(get_entitlement(user).access_filter(), start_time__gte=timezone.now())
+
+    if params.get('package'):
+        if not params['package'].isdigit():
+            raise ValueError("Invalid 'package', expected a package id")
+        package_links = ScheduledClass.packages.through.objects.filter(classpackage_id=params['package'])
+        classes = classes.filter(id__in=package_links.values('scheduledclass_id'))
+    if params.get('instructor'):
+        classes = classes.filter(instructor=params['instructor'])
+    for param, lookup, end in (('from', 'start_time__gte', False), ('to', 'start_time__lte', True)):
+        if params.get(param):
+            day = parse_date(params[param])
+            if day is None:
+                raise ValueError(f"Invalid '{param}' date, expected YYYY-MM-DD")
+            classes = classes.filter(**{lookup: _day_bound(day, end)})
+
+    if params.get('cursor'):
+        start_time, class_id = _decode_schedule_cursor(params['cursor'])
+        classes = classes.filter(Q(start_time__gt=start_time) | Q(start_time=start_time, id__gt=class_id))
+
+    # Fetch one extra row to learn whether another page exists
+    page = list(classes.order_by('start_time', 'id')[:limit + 1])
+    next_cursor = _encode_schedule_cursor(page[limit - 1]) if len(page) > limit else None
+    return page[:limit], next_cursor
+
+
 @login_required
 def schedule_view(request):
-    # 1. Get User's Package
-    active_sub = UserSubscription.objects.filter(user=request.user, is_active=True).first()
-    
-    # 2. Define Access Filter
-    # Show Universal Layouts (packages is Empty)
-    access_filter = Q(packages=None)
-    
-    if active_sub and not active_sub.is_expired and active_sub.package:
-        # OR Show classes for their specific package
-        access_filter |= Q(packages=active_sub.package)
-    
-    # 3. Filter Classes
-    all_classes = ScheduledClass.objects.filter(access_filter, start_time__gte=timezone.now()).distinct().order_by('start_time')
-    return render(request, 'quizzes/schedule.html', {'classes': all_classes})
+    # First page only; the template pulls later pages from schedule_api
+    classes, next_cursor = _schedule_page(request.user, {}, SCHEDULE_PAGE_SIZE)
+    context = {
+        'classes': classes,
+        'next_cursor': next_cursor,
+        'feed_url': request.build_absolute_uri(reverse('schedule_feed', args=[make_feed_token(request.user)])),
+    }
+    return render(request, 'quizzes/schedule.html', context)
+
+
+# 📆 Calendar Feed (.ics, token-authenticated for calendar clients)
+def schedule_feed(request, token):
+    user_id = read_feed_token(token)
+    user = User.objects.filter(pk=user_id, is_active=True).first() if user_id else None
+    if user is None:
+        raise Http404("Unknown calendar feed")
+
+    # Answer polling clients with one aggregate query, before streaming any classes
+    entitlement = get_entitlement(user)
+    now = timezone.now()
+    etag = feed_etag(user.pk, entitlement, now)
+    if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+    if etag in if_none_match or '*' in if_none_match:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    classes = (
+        ScheduledClass.objects
+        .filter(entitlement.access_filter(), start_time__gte=now)
+        .order_by('start_time', 'id')
+        .iterator(chunk_size=500)
+    )
+    domain = request.get_host().split(':')[0]
+
+    def join_url(cls):
+        return request.build_absolute_uri(reverse('join_class', args=[cls.id]))
+
+    response = StreamingHttpResponse(iter_calendar(classes, domain, join_url), content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=300'
+    response['Content-Disposition'] = 'inline; filename="recgetup-classes.ics"'
+    return response
+
+
+# 📅 Schedule API (JSON, keyset-paginated)
+@login_required
+def schedule_api(request):
+    try:
+        limit = int(request.GET.get('limit', SCHEDULE_PAGE_SIZE))
+        if not 1 <= limit <= SCHEDULE_MAX_PAGE_SIZE:
+            raise ValueError(f"'limit' must be between 1 and {SCHEDULE_MAX_PAGE_SIZE}")
+        classes, next_cursor = _schedule_page(request.user, request.GET, limit)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    results = [
+        {
+            'id': c.id,
+            'title': c.title,
+            'instructor': c.instructor,
+            'start_time': c.start_time.isoformat(),
+            'end_time': c.end_time.isoformat(),
+            'description': c.description,
+            'join_url': reverse('join_class', args=[c.id]) if c.meeting_link else None,
+        }
+        for c in classes
+    ]
+    return JsonResponse({'results': results, 'next_cursor': next_cursor})
 
 # 💳 Plan / Packages View
+@anonymous_page_cache
 def packages_view(request):
     packages = ClassPackage.objects.filter(is_active=True)
     return render(request, 'quizzes/packages.html', {'packages': packages})
 
 import razorpay
-from django.urls import reverse
 
 # 💸 Pay for Package (Razorpay)
 @login_required
 def payment_initiate(request, package_id):
     package = get_object_or_404(ClassPackage, id=package_id)
-    
-    # Initialize Razorpay Client
-    client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-    
-    # Create Razorpay Order
-    payment_amount = int(package.price * 100) # Amount in paise
-    payment_currency = 'INR'
-    
-    order_data = {
-        'amount': payment_amount,
-        'currency': payment_currency,
-        'payment_capture': '1', # Auto capture
-        'notes': {
-            'package_id': package.id,
-            'user_id': request.user.id
-        }
-    }
-    
+
+    # Reuses a pending order on refresh / double-click instead of creating another
     try:
-        order = client.order.create(data=order_data)
-        
-        # Create Pending Payment Record
-        PaymentHistory.objects.create(
-            user=request.user,
-            package=package,
-            amount=package.price,
-            transaction_id=order['id'], # Save Order ID here
-            status='PENDING'
-        )
-        
+        order = checkout.get_or_create_order(request.user, package)
+    except (gateway.GatewayUnavailable, checkout.OrderRateLimited) as e:
+        messages.error(request, str(e))
+        return redirect('packages')
     except Exception as e:
         messages.error(request, f"Payment Gateway Error: {str(e)}")
         return redirect('packages')
-        
+
     context = {
         'package': package,
         'order': order,
@@ -135,15 +235,12 @@ def payment_initiate(request, package_id):
 @csrf_exempt
 def payment_verify(request):
     if request.method == "POST":
+        payment_id = request.POST.get('razorpay_payment_id', '')
+        order_id = request.POST.get('razorpay_order_id', '')
+        signature = request.POST.get('razorpay_signature', '')
         try:
-            payment_id = request.POST.get('razorpay_payment_id', '')
-            order_id = request.POST.get('razorpay_order_id', '')
-            signature = request.POST.get('razorpay_signature', '')
-            
-            print(f"DEBUG: Verifying Payment - Order: {order_id}, Payment: {payment_id}")
+            logger.info("Verifying payment", extra={'order_id': order_id, 'payment_id': payment_id})
 
-            client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-            
             # Verify Signature
             params_dict = {
                 'razorpay_order_id': order_id,
@@ -152,122 +249,74 @@ def payment_verify(request):
             }
             
             # This raises Error if verification fails
-            client.utility.verify_payment_signature(params_dict)
+            gateway.verify_payment_signature(params_dict)
             
             # --- SUCCESS ---
-            # 1. Update Payment History
-            # Use filter().first() to avoid crash if not found immediately (though it should exist)
-            payment = PaymentHistory.objects.filter(transaction_id=order_id).first()
-            
-            if not payment:
-                print("DEBUG: Payment Record Not Found in DB")
-                messages.error(request, f"System Error: Payment record for Order {order_id} not found.")
-                return redirect('packages')
-
-            payment.status = 'SUCCESS'
-            payment.save()
-            print(f"DEBUG: Payment {payment.id} marked SUCCESS")
-            
-            # 2. Activate/Update Subscription
-            duration_days = payment.package.duration_months * 30
-            end_date = timezone.now() + timezone.timedelta(days=duration_days)
-            
-            # Use update_or_create to handle the OneToOneField constraint
-            # This fixes the "Duplicate entry" error
-            UserSubscription.objects.update_or_create(
-                user=payment.user,
-                defaults={
-                    'package': payment.package,
-                    'end_date': end_date,
-                    'is_active': True
-                }
-            )
-            print(f"DEBUG: Subscription Activated for {payment.user.username}")
-            
-            # 💸 Send Payment Notifications
-            send_payment_success_notification(
-                user=payment.user,
-                package_name=payment.package.name,
-                amount=payment.amount,
-                transaction_id=order_id
-            )
-            
+            # Lock the row so this callback and the webhook processor never both activate it
+            with transaction.atomic():
+                payment = (
+                    PaymentHistory.objects
+                    .select_for_update(of=('self',))
+                    .select_related('user', 'package')
+                    .filter(transaction_id=order_id)
+                    .first()
+                )
+
+                if not payment:
+                    logger.warning("Payment record not found", extra={'order_id': order_id, 'payment_id': payment_id})
+                    messages.error(request, f"System Error: Payment record for Order {order_id} not found.")
+                    return redirect('packages')
+
+                # Marks SUCCESS, activates the subscription, queues notifications
+                if payment.status != 'SUCCESS':
+                    activate_payments([payment])
+                    logger.info(
+                        "Payment marked SUCCESS, subscription activated",
+                        extra={'order_id': order_id, 'payment_pk': payment.id, 'user_id': payment.user_id},
+                    )
+
             messages.success(request, f"Payment Successful! You are subscribed to {payment.package.name}.")
             return redirect('home')
 
-        except razorpay.errors.SignatureVerificationError as e:
-            print(f"DEBUG: Signature Error: {e}")
+        except razorpay.errors.SignatureVerificationError:
+            logger.warning("Payment signature verification failed", extra={'order_id': order_id, 'payment_id': payment_id})
             messages.error(request, "Payment Failed: Signature Verification Failed.")
             return redirect('packages')
         except Exception as e:
-            print(f"DEBUG: General Error: {e}")
+            logger.exception("Payment verification error", extra={'order_id': order_id, 'payment_id': payment_id})
             messages.error(request, f"An error occurred during verification: {str(e)}")
             return redirect('packages')
     
     return redirect('packages')
 
+# 🪝 Razorpay Webhook (validate, dedupe, persist; `process_webhooks` applies events)
+@csrf_exempt
+def razorpay_webhook(request):
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    body = request.body.decode('utf-8', errors='replace')
+    try:
+        gateway.verify_webhook_signature(body, request.headers.get('X-Razorpay-Signature', ''))
+    except razorpay.errors.SignatureVerificationError:
+        return HttpResponseBadRequest("Invalid signature")
+
+    if not record_event(body, request.headers.get('X-Razorpay-Event-Id')):
+        return HttpResponseBadRequest("Invalid payload")
+    return HttpResponse(status=200)
+
 # 🧾 Payment History
 @login_required
 def payment_history(request):
-    history = PaymentHistory.objects.filter(user=request.user).order_by('-payment_date')
+    history = PaymentHistory.objects.filter(user=request.user).select_related('package').order_by('-payment_date')
     return render(request, 'quizzes/payment_history.html', {'history': history})
 
 
 # 👤 User Registration
 
+@anonymous_page_cache
 def category_detail(request, slug):
-    content = {
-        'indian-classical': {
-            'title': 'Indian Classical Vocals',
-            'subtitle': 'Master the Ancient Art of Raga & Riyaz',
-            'description': 'Embark on a spiritual journey through the 7 notes (Swara). From basic Alankars to complex Raag improvisations, learn the foundation of all Indian music.',
-            'image': 'quizzes/images/indian_classical_banner.png',
-            'color': 'amber',
-            'icon': '🕉️',
-            'curriculum': [
-                {'title': 'Swara & Shruti', 'desc': 'Perfecting the 22 microtones of Indian music.'},
-                {'title': 'Raag Mastery', 'desc': 'Deep dive into Raag Yaman, Bhairav, and more.'},
-                {'title': 'Taal & Rhythm', 'desc': 'Mastering Tabla beats (Teentaal, Dadra).'},
-                {'title': 'Voice Culture', 'desc': 'Gamma, Meend, and Murki techniques.'}
-            ],
-            'mentor': 'Pt. Ravi Shankar Style',
-            'quote': "Music is not just art, it is yoga for the soul."
-        },
-        'western-pop': {
-            'title': 'Western Pop Vocals',
-            'subtitle': 'Own the Stage with Power & Style',
-            'description': 'Unlock your full vocal range, master breath control, and learn to belt like a star. This course is designed for modern performers.',
-            'image': 'quizzes/images/western_pop_banner.png',
-            'color': 'purple',
-            'icon': '🎤',
-            'curriculum': [
-                {'title': 'Breath Control', 'desc': 'Diaphragmatic support for long notes.'},
-                {'title': 'Belting & Mix', 'desc': 'Hitting high notes without strain.'},
-                {'title': 'Riffs & Runs', 'desc': 'Agility exercises for modern pop style.'},
-                {'title': 'Stage Presence', 'desc': 'Mic technique and performance confidence.'}
-            ],
-            'mentor': 'Pop Icon Style',
-            'quote': "Don't just sing the song, perform it."
-        },
-        'bollywood-sufi': {
-            'title': 'Bollywood & Sufi',
-            'subtitle': 'Sing with Soul, Emotion & Texture',
-            'description': 'Bridging the gap between classical technique and commercial playback singing. Learn the "Harkat" and expressions that define Bollywood hits.',
-            'image': 'quizzes/images/bollywood_sufi_banner.png',
-            'color': 'red',
-            'icon': '🎵',
-            'curriculum': [
-                {'title': 'Playback Techniques', 'desc': 'Singing for the microphone studio recording.'},
-                {'title': 'Urdu Pronunciation', 'desc': 'Perfecting Talaffuz for Sufi Kalam.'},
-                {'title': 'Emotional Expression', 'desc': 'Acting through your voice.'},
-                {'title': 'Versatility', 'desc': 'Switching between romantic and upbeat tracks.'}
-            ],
-            'mentor': 'Sufi Master Style',
-            'quote': "A voice that doesn't touch the heart is just noise."
-        }
-    }
-    
-    context = content.get(slug)
+    context = get_category(slug)
     if not context:
         return redirect('home')
         
@@ -280,37 +329,33 @@ def register(request):
     if request.method == 'POST':
         form = UserRegistrationForm(request.POST)
         if form.is_valid():
-            user = form.save(commit=False)
-            user.is_active = False  # Deactivate until verified
-            user.set_password(form.cleaned_data['password'])
-            user.save()
-            
-            # Explicitly save phone number to profile
-            # (since form.save(commit=False) skips the custom save method logic)
-            if hasattr(user, 'profile'):
-                user.profile.phone_number = form.cleaned_data.get('phone_number')
-                user.profile.save()
-
-            # Send Verification Email
-            current_site = get_current_site(request)
-            mail_subject = 'Activate your account.'
-            html_message = render_to_string('quizzes/acc_active_email.html', {
-                'user': user,
-                'domain': current_site.domain,
-                'uid': urlsafe_base64_encode(force_bytes(user.pk)),
-                'token': default_token_generator.make_token(user),
-            })
-            plain_message = strip_tags(html_message)
-            to_email = form.cleaned_data.get('email')
-            
-            # Use fail_silently=False to surface errors during dev, but True in prod usually
-            send_mail(
-                subject=mail_subject,
-                message=plain_message,
-                from_email=settings.EMAIL_HOST_USER,
-                recipient_list=[to_email],
-                html_message=html_message
-            )
+            with transaction.atomic():
+                user = form.save(commit=False)
+                user.is_active = False  # Deactivate until verified
+                user.set_password(form.cleaned_data['password'])
+                user.save()
+
+                # Explicitly save phone number to profile
+                # (since form.save(commit=False) skips the custom save method logic)
+                if hasattr(user, 'profile'):
+                    user.profile.phone_number = form.cleaned_data.get('phone_number')
+                    user.profile.save()
+
+                # Queue Verification Email (delivered by run_outbox_worker)
+                current_site = get_current_site(request)
+                mail_subject = 'Activate your account.'
+                plain_message, html_message = render_email(
+                    'quizzes/acc_active_email',
+                    shared={'domain': current_site.domain},
+                    values={
+                        'user.first_name': user.first_name,
+                        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+                        'token': default_token_generator.make_token(user),
+                    },
+                )
+                to_email = form.cleaned_data.get('email')
+
+                enqueue_email(mail_subject, plain_message, [to_email], html=html_message)
             
             messages.success(request, "Please check your email to verify your account.")
             return redirect('login')
@@ -328,11 +373,12 @@ def activate(request, uidb64, token):
         user = None
 
     if user is not None and default_token_generator.check_token(user, token):
-        user.is_active = True
-        user.save()
-        
-        # 🎉 Send Welcome Notifications
-        send_welcome_notification(user)
+        with transaction.atomic():
+            user.is_active = True
+            user.save()
+
+            # 🎉 Queue Welcome Notifications
+            send_welcome_notification(user)
         
         messages.success(request, "✅ Email verified successfully! You can now login.")
         return redirect('login')
@@ -398,6 +444,11 @@ class CustomLoginView(auth_views.LoginView):
 def join_class(request, class_id):
     scheduled_class = get_object_or_404(ScheduledClass, id=class_id)
     
+    # Check package access
+    if not get_entitlement(request.user).can_join(scheduled_class):
+        messages.error(request, "This class is not included in your current package.")
+        return redirect('packages')
+    
     # Check time
     time_diff = scheduled_class.start_time - timezone.now()
     
@@ -410,3 +461,41 @@ def join_class(request, class_id):
          return redirect('home')
         
     return redirect(scheduled_class.meeting_link)
+
+
+# 📊 Template Render Metrics (for monitoring)
+@staff_member_required
+def template_metrics(request):
+    return JsonResponse({'templates': timing_snapshot('template')})
+
+
+@staff_member_required
+def request_metrics(request):
+    # Slow and sampled requests from this worker process, slowest first
+    return JsonResponse({
+        'requests': slowest_requests(),
+        'outbound': {group: timing_snapshot(group) for group in ('razorpay', 'smtp', 'whatsapp')},
+    })
+
+
+@staff_member_required
+def profile_list(request):
+    # Stored ?_profile=1 runs per URL name, newest first
+    profiles = list_profiles()
+    return JsonResponse({
+        'profiles': {
+            key: [dict(entry, url=reverse('profile_download', args=[key, entry['file']])) for entry in entries]
+            for key, entries in profiles.items()
+        },
+    })
+
+
+@staff_member_required
+def profile_download(request, key, filename):
+    path = profile_path(key, filename)
+    if path is None:
+        raise Http404("Unknown profile")
+    try:
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{key}-{filename}')
+    except FileNotFoundError:
+        raise Http404("Profile was pruned")
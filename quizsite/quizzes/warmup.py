@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from django.apps import apps
+from django.template import TemplateSyntaxError
+from django.template.loader import get_template
+
+
+def iter_app_template_names(app_label='quizzes'):
+    template_dir = Path(apps.get_app_config(app_label).path) / 'templates'
+    for path in sorted(template_dir.rglob('*.html')):
+        yield path.relative_to(template_dir).as_posix()
+
+
+def warm_templates(app_label='quizzes'):
+    """
+    Compiles every template of the app so the cached loader holds them before
+    the first request. Returns (compiled_names, {name: error}).
+    """
+    compiled, errors = [], {}
+    for name in iter_app_template_names(app_label):
+        try:
+            get_template(name)
+            compiled.append(name)
+        except TemplateSyntaxError as e:
+            errors[name] = str(e)
+    return compiled, errors
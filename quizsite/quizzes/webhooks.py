@@ -0,0 +1,94 @@
+import hashlib
+import json
+
+from django.db import transaction
+from django.utils import timezone
+
+from .checkout import activate_payments
+from .models import PaymentHistory, WebhookEvent
+
+# Events that mean the order's money has arrived
+PAID_EVENTS = {'payment.captured', 'order.paid'}
+FAILED_EVENTS = {'payment.failed'}
+
+
+# -------------------------------------------------------------------
+#  📥 Ingestion (the only work done inside the webhook request)
+# -------------------------------------------------------------------
+def record_event(body, event_id=None):
+    """
+    Persists a verified webhook body. Redeliveries share the event id and are
+    dropped by the unique index (INSERT IGNORE), so this is one statement.
+    Returns False for a body that is not valid JSON.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return False
+    event_id = event_id or hashlib.sha256(body.encode()).hexdigest()
+    WebhookEvent.objects.bulk_create(
+        [WebhookEvent(event_id=event_id, event=str(data.get('event', ''))[:50], payload=data)],
+        ignore_conflicts=True,
+    )
+    return True
+
+
+def _order_id(event):
+    payload = event.payload.get('payload', {})
+    for entity in ('order', 'payment'):
+        data = payload.get(entity, {}).get('entity', {})
+        order_id = data.get('id') if entity == 'order' else data.get('order_id')
+        if order_id:
+            return order_id
+    return None
+
+
+# -------------------------------------------------------------------
+#  ⚙️ Batch Processing (`manage.py process_webhooks`)
+# -------------------------------------------------------------------
+def process_pending(limit):
+    """
+    Applies up to `limit` unprocessed events with a handful of set-based
+    queries. Returns the number of events handled.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            WebhookEvent.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='PENDING')
+            .order_by('id')[:limit]
+        )
+        if not events:
+            return 0
+
+        paid_orders, failed_orders = set(), set()
+        for event in events:
+            order_id = _order_id(event)
+            if event.event in PAID_EVENTS and order_id:
+                paid_orders.add(order_id)
+                event.status = 'PROCESSED'
+            elif event.event in FAILED_EVENTS and order_id:
+                failed_orders.add(order_id)
+                event.status = 'PROCESSED'
+            else:
+                event.status = 'IGNORED'
+            event.processed_at = now
+
+        # A later capture beats an earlier failed attempt on the same order
+        failed_orders -= paid_orders
+
+        if paid_orders:
+            payments = list(
+                PaymentHistory.objects
+                .select_for_update(of=('self',))
+                .filter(transaction_id__in=paid_orders)
+                .exclude(status='SUCCESS')
+                .select_related('user', 'package')
+            )
+            activate_payments(payments)
+        if failed_orders:
+            PaymentHistory.objects.filter(transaction_id__in=failed_orders, status='PENDING').update(status='FAILED')
+
+        WebhookEvent.objects.bulk_update(events, ['status', 'processed_at'])
+    return len(events)
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import random
+import sys
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .metrics import timed
+
+# Messages are dicts: {'to': '<phone>', 'text': '<body>'}.
+# send_messages() returns one entry per message: None when sent, else the error.
+
+
+# -------------------------------------------------------------------
+#  🖥️ Console / File / Memory Backends (development & tests)
+# -------------------------------------------------------------------
+class ConsoleBackend:
+    """
+    Writes messages to stdout, like the old print() mock.
+    """
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def send_messages(self, messages):
+        with self._lock:
+            for message in messages:
+                self.stream.write(
+                    "\n==========================================\n"
+                    f"📲 [WHATSAPP] To: {message['to']}\n"
+                    f"📩 Message: {message['text']}\n"
+                    "==========================================\n"
+                )
+            self.stream.flush()
+        return [None] * len(messages)
+
+
+class FileBackend:
+    """
+    Appends one JSON line per message to WHATSAPP_FILE_PATH.
+    """
+    _lock = threading.Lock()
+
+    def send_messages(self, messages):
+        lines = ''.join(json.dumps(message, ensure_ascii=False) + '\n' for message in messages)
+        with self._lock, open(settings.WHATSAPP_FILE_PATH, 'a', encoding='utf-8') as handle:
+            handle.write(lines)
+        return [None] * len(messages)
+
+
+outbox = []  # Filled by LocmemBackend, like django.core.mail.outbox
+
+
+class LocmemBackend:
+    def send_messages(self, messages):
+        outbox.extend(dict(message) for message in messages)
+        return [None] * len(messages)
+
+
+# -------------------------------------------------------------------
+#  🌐 HTTP Backend (WhatsApp Cloud API)
+# -------------------------------------------------------------------
+class HttpBackend:
+    """
+    Sends a batch concurrently from one asyncio event loop over a pooled
+    httpx.AsyncClient. At most WHATSAPP_CONCURRENCY requests are in flight;
+    429 and 5xx answers are retried with backoff, honouring Retry-After
+    up to WHATSAPP_MAX_RETRY_WAIT seconds (longer waits are left to the outbox).
+
+    The payload follows the WhatsApp Cloud API:
+    POST WHATSAPP_API_URL {"messaging_product": "whatsapp", "to": ..., "type": "text", ...}
+    """
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def send_messages(self, messages):
+        if not messages:
+            return []
+        with timed('whatsapp', 'send_batch'):
+            return asyncio.run(self._send_all(messages))
+
+    async def _send_all(self, messages):
+        import httpx
+
+        limits = httpx.Limits(
+            max_connections=settings.WHATSAPP_CONCURRENCY,
+            max_keepalive_connections=settings.WHATSAPP_CONCURRENCY,
+        )
+        headers = {'Authorization': f'Bearer {settings.WHATSAPP_API_TOKEN}'}
+        semaphore = asyncio.Semaphore(settings.WHATSAPP_CONCURRENCY)
+        async with httpx.AsyncClient(limits=limits, headers=headers, timeout=settings.WHATSAPP_TIMEOUT) as client:
+            return await asyncio.gather(*(self._send(client, semaphore, message) for message in messages))
+
+    async def _send(self, client, semaphore, message):
+        import httpx
+
+        payload = {
+            'messaging_product': 'whatsapp',
+            'to': message['to'],
+            'type': 'text',
+            'text': {'body': message['text']},
+        }
+        error = None
+        for attempt in range(settings.WHATSAPP_MAX_RETRIES + 1):
+            retry_after = None
+            try:
+                async with semaphore:
+                    response = await client.post(settings.WHATSAPP_API_URL, json=payload)
+            except httpx.TransportError as e:
+                error = repr(e)
+            else:
+                if response.status_code < 300:
+                    return None
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code not in self.RETRY_STATUSES:
+                    return error
+                header = response.headers.get('Retry-After', '')
+                if header.isdigit():
+                    retry_after = int(header)
+                    if retry_after > settings.WHATSAPP_MAX_RETRY_WAIT:
+                        return error  # Too long to hold the batch; the outbox reschedules the message
+            if attempt < settings.WHATSAPP_MAX_RETRIES:
+                await asyncio.sleep(self.retry_wait(attempt, retry_after))
+        return error
+
+    @staticmethod
+    def retry_wait(attempt, retry_after=None):
+        """
+        Seconds to wait before retry `attempt + 1`: jittered exponential
+        backoff, added on top of Retry-After so we never come back earlier
+        than the server asked.
+        """
+        delay = settings.WHATSAPP_RETRY_BASE_DELAY * (2 ** attempt)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, delay)
+        return random.uniform(delay / 2, delay)
+
+
+# -------------------------------------------------------------------
+#  🔌 Backend Selection
+# -------------------------------------------------------------------
+def get_backend(path=None):
+    return import_string(path or settings.WHATSAPP_BACKEND)()
+
+
+def send_messages(messages):
+    return get_backend().send_messages(messages)
@@ -0,0 +1,14 @@
+// Used by `python manage.py build_css`. Tailwind only emits classes found in `content`,
+// so keep every place that spells out class names listed here (templates, forms, template tags).
+module.exports = {
+  content: [
+    './templates/**/*.html',
+    './quizzes/templates/**/*.html',
+    './quizzes/forms.py',
+    './quizzes/templatetags/*.py',
+  ],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};